@@ -0,0 +1,301 @@
+'''Contract ABIs, cached locally, and packing of action data with them.
+
+The ABI of a contract is fetched once with the *get_abi* endpoint, and cached
+for the node and the account, together with the hashes of the contract code
+and of the ABI. The cache entry is replaced whenever a contract is set to the
+account, see :class:`.cleos_set.SetContract`: then the ABI is read from the
+*.abi* file, as :func:`.teos.ABI` writes it, with no round-trip to the node.
+
+As the contract may be changed otherwise, for example, by another process, a
+cached ABI older than :attr:`CHECK_INTERVAL_SEC` is checked against the
+hashes on the node, with the *get_raw_abi* endpoint, before it is used, and
+fetched again if they differ.
+
+With the ABI, action data is packed in-process, see :meth:`Abi.pack_action`,
+instead of by the *abi_json_to_bin* endpoint of the node.
+'''
+
+import json
+import time
+import threading
+
+import eosfactory.core.errors as errors
+import eosfactory.core.setup as setup
+import eosfactory.core.serializer as serializer
+import eosfactory.core.http_api as http_api
+
+
+CHECK_INTERVAL_SEC = 3
+'''How long a cached ABI is used without being checked against the node.
+'''
+
+__abis = {}
+__lock = threading.Lock()
+
+
+class Abi():
+    '''The ABI of a contract.
+
+    Args:
+        abi_json (json): The ABI, as the *.abi* file, or the *get_abi*
+            endpoint, has it.
+        account_name (str): The EOSIO name of the contract's account.
+        code_hash (str): The hash of the contract code, if known.
+        abi_hash (str): The hash of the ABI, as the node has it, if known.
+
+    Attributes:
+        abi_json (json): The ABI.
+        account_name (str): The EOSIO name of the contract's account.
+        code_hash (str): The hash of the contract code, if known.
+        abi_hash (str): The hash of the ABI, if known.
+        time (float): When the ABI has been fetched, or checked, last.
+    '''
+    def __init__(
+            self, abi_json, account_name=None, code_hash=None, abi_hash=None):
+        self.abi_json = abi_json
+        self.account_name = account_name
+        self.code_hash = code_hash
+        self.abi_hash = abi_hash
+        self.time = time.time()
+        self.typedefs = {
+            type_["new_type_name"]: type_["type"]
+                for type_ in abi_json.get("types", [])}
+        self.structs = {
+            struct["name"]: struct for struct in abi_json.get("structs", [])}
+        self.variants = {
+            variant["name"]: variant["types"]
+                for variant in abi_json.get("variants", [])}
+        self.actions = {
+            action["name"]: action["type"]
+                for action in abi_json.get("actions", [])}
+
+    def resolve(self, type_):
+        '''Follow the typedefs of the ABI to the type they alias.
+        '''
+        seen = set()
+        while type_ in self.typedefs:
+            if type_ in seen:
+                raise errors.Error('''
+                Circular typedef ``{}`` in the ABI of ``{}``.
+                '''.format(type_, self.account_name), translate=False)
+            seen.add(type_)
+            type_ = self.typedefs[type_]
+        return type_
+
+    def pack(self, type_, value):
+        '''Pack a value of an ABI type.
+
+        Args:
+            type_ (str): The type, a built-in one, see
+                :attr:`.serializer.BUILT_IN_TYPES`, or defined in the ABI. It
+                may be suffixed with *[]*, for a vector, with *?*, for an
+                optional value, or with *$*, for a binary extension.
+            value: The value, as JSON.
+
+        Returns:
+            bytes: The packed value.
+
+        Raises:
+            .core.errors.Error: If the type is not known, or the value does
+                not match it.
+        '''
+        if type_.endswith("$"):
+            return self.pack(type_[:-1], value)
+        if type_.endswith("?"):
+            if value is None:
+                return serializer.pack_uint8(0)
+            return serializer.pack_uint8(1) + self.pack(type_[:-1], value)
+        if type_.endswith("[]"):
+            return serializer.pack_vector(
+                value, lambda item: self.pack(type_[:-2], item))
+
+        resolved = self.resolve(type_)
+        if resolved != type_:
+            return self.pack(resolved, value)
+
+        if type_ in self.structs:
+            return self.pack_struct(self.structs[type_], value)
+        if type_ in self.variants:
+            return self.pack_variant(type_, value)
+        if type_ in serializer.BUILT_IN_TYPES:
+            try:
+                return serializer.BUILT_IN_TYPES[type_](value)
+            except errors.Error:
+                raise
+            except Exception as e:
+                raise errors.Error('''
+                Cannot pack ``{}`` as ``{}``:
+                {}
+                '''.format(value, type_, str(e)), translate=False)
+
+        raise errors.Error('''
+        Unknown type ``{}`` in the ABI of ``{}``.
+        '''.format(type_, self.account_name), translate=False)
+
+    def pack_struct(self, struct, value):
+        retval = b""
+        if struct.get("base"):
+            retval = self.pack(struct["base"], value)
+
+        for field in struct["fields"]:
+            if not field["name"] in value:
+                # Only binary extensions may be missing, at the end.
+                if field["type"].endswith("$"):
+                    break
+                raise errors.Error('''
+                Missing field ``{}`` of ``{}``.
+                '''.format(field["name"], struct["name"]), translate=False)
+            retval = retval + self.pack(field["type"], value[field["name"]])
+        return retval
+
+    def pack_variant(self, type_, value):
+        '''Pack a variant, given like *["uint64", 42]*.
+        '''
+        types = self.variants[type_]
+        if not isinstance(value, list) or len(value) != 2 \
+                or not value[0] in types:
+            raise errors.Error('''
+            The value ``{}`` does not match the variant ``{}``.
+            '''.format(value, type_), translate=False)
+        return serializer.pack_varuint32(types.index(value[0])) \
+            + self.pack(value[0], value[1])
+
+    def pack_action(self, action, data):
+        '''Pack the data of an action.
+
+        Args:
+            action (str): The name of the action.
+            data (json): The arguments to the contract.
+
+        Returns:
+            bytes: The packed data.
+
+        Raises:
+            .core.errors.Error: If the action is not in the ABI, or the data
+                does not match it.
+        '''
+        if not action in self.actions:
+            raise errors.Error('''
+            The ABI of ``{}`` has no action ``{}``.
+            '''.format(self.account_name, action), translate=False)
+        return self.pack(self.actions[action], data)
+
+
+def register(account_name, abi_json, code_hash=None, abi_hash=None):
+    '''Cache the ABI of a contract.
+
+    Args:
+        account_name (str): The EOSIO name of the contract's account.
+        abi_json (json): The ABI.
+        code_hash (str): The hash of the contract code, if known.
+        abi_hash (str): The hash of the ABI, as the node has it, if known.
+
+    Returns:
+        :class:`Abi` object.
+    '''
+    abi = Abi(abi_json, account_name, code_hash, abi_hash)
+    with __lock:
+        __abis[(setup.nodeos_address(), account_name)] = abi
+    return abi
+
+
+def load_file(account_name, abi_file):
+    '''Cache the ABI of a contract, reading it from an *.abi* file.
+
+    Args:
+        account_name (str): The EOSIO name of the contract's account.
+        abi_file (str): The path to the ABI file.
+
+    Returns:
+        :class:`Abi` object.
+
+    Raises:
+        .core.errors.Error: If the file cannot be read.
+    '''
+    try:
+        with open(abi_file, "r") as f:
+            abi_json = json.load(f)
+    except Exception as e:
+        raise errors.Error('''
+        Cannot read the ABI file
+            {}
+        The error message is:
+        {}
+        '''.format(abi_file, str(e)), translate=False)
+    return register(account_name, abi_json)
+
+
+def invalidate(account_name=None):
+    '''Forget the cached ABI of the given account, or all of them if *None*.
+    '''
+    with __lock:
+        if account_name is None:
+            __abis.clear()
+        else:
+            __abis.pop((setup.nodeos_address(), account_name), None)
+
+
+def hashes(account_name, abi_hash=None):
+    '''The hashes of the code and of the ABI of a contract, on the node.
+
+    Args:
+        account_name (str): The EOSIO name of the contract's account.
+        abi_hash (str): The hash of the ABI, as known: if the node has it,
+            it does not send the ABI.
+
+    Returns:
+        tuple: (<code hash>, <ABI hash>).
+
+    Raises:
+        .core.errors.Error: If the node cannot be reached.
+    '''
+    params = {"account_name": account_name}
+    if abi_hash:
+        params["abi_hash"] = abi_hash
+    raw_abi = http_api.ChainApi(
+        "get_raw_abi", params, is_verbose=False, is_cached=False).json
+    return (raw_abi["code_hash"], raw_abi["abi_hash"])
+
+
+def get(account_name, code_hash=None):
+    '''The ABI of a contract, fetched from the node unless cached.
+
+    A cached ABI older than :attr:`CHECK_INTERVAL_SEC` is checked against
+    the hash of the ABI on the node, see :func:`hashes`.
+
+    Args:
+        account_name (str): The EOSIO name of the contract's account.
+        code_hash (str): If set, and the cached ABI has been fetched for
+            another code, the ABI is fetched again.
+
+    Returns:
+        :class:`Abi` object. If the account has no contract, the ABI is
+        empty, and cached as well.
+
+    Raises:
+        .core.errors.Error: If the node cannot be reached.
+    '''
+    with __lock:
+        abi = __abis.get((setup.nodeos_address(), account_name))
+    if abi and not (code_hash is None or abi.code_hash is None
+                                            or abi.code_hash == code_hash):
+        abi = None
+
+    if abi and time.time() - abi.time > CHECK_INTERVAL_SEC:
+        code_hash_, abi_hash = hashes(account_name, abi.abi_hash)
+        if abi.abi_hash and abi.abi_hash == abi_hash:
+            abi.code_hash = code_hash_
+            abi.time = time.time()
+        else:
+            abi = None
+    if abi:
+        return abi
+
+    # The hashes first: if the ABI changes meanwhile, the next check fails.
+    code_hash, abi_hash = hashes(account_name)
+    abi_json = http_api.ChainApi(
+        "get_abi", {"account_name": account_name}, is_verbose=False,
+        is_cached=False).json
+
+    return register(
+        account_name, abi_json.get("abi") or {}, code_hash, abi_hash)
@@ -0,0 +1,411 @@
+'''Local store of irreversible blocks.
+
+Blocks at, or below, the last irreversible block never change. If
+:attr:`.core.setup.is_block_store` is set, see :func:`enable`, the
+irreversible blocks retrieved with :class:`.cleos_get.GetBlock`, hence with
+:func:`.cleos_get.iter_blocks`, are stored on disk, and read from there
+afterwards, with no round-trip to the node.
+
+The store is kept under the directory of application data, see
+:func:`.core.config.get_app_data_dir`, per node address and chain ID, as
+local nodes, started from the same genesis, have the same chain ID, in
+segments of
+:attr:`SEGMENT_BLOCKS` consecutive blocks. A segment is a data file of
+zlib-compressed JSON blocks, and an index file of fixed-width
+*<offset, size>* records, one per block number, hence a block is found with
+one seek. If the store exceeds its size limit, see :func:`configure`, the
+least recently used segments are deleted.
+
+The chain IDs of the nodes are remembered in the store. Hence, the blocks of
+the local node, having the same chain ID whenever restarted clean, are
+cleared by :func:`.core.manager.reset`, see :func:`clear`.
+
+The store may be shared by processes, for example, the workers of
+:class:`.node_pool.NodePool`: its files are modified under a file lock.
+'''
+
+import os
+import json
+import time
+import zlib
+import shutil
+import struct
+import threading
+import contextlib
+
+import eosfactory.core.errors as errors
+import eosfactory.core.config as config
+import eosfactory.core.setup as setup
+import eosfactory.core.cassette as cassette
+import eosfactory.core.http_api as http_api
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+BLOCKS_DIR = "blocks"
+CHAINS_JSON = "chains.json"
+LOCK_FILE = ".lock"
+SEGMENT_BLOCKS = 1000
+'''The number of consecutive blocks in a segment.
+'''
+INDEX_FORMAT = "<QI"
+INDEX_SIZE = struct.calcsize(INDEX_FORMAT)
+LIB_MAX_AGE_SEC = 0.5
+'''How long the last irreversible block number, as known, is valid for.
+'''
+
+__directory = None
+__max_size = 256 * 1024 * 1024
+__size = None
+__chains = {}
+__counters = {"hits": 0, "misses": 0, "stored": 0, "evicted": 0}
+__lock = threading.RLock()
+__lock_depth = 0
+
+
+def enable(is_enabled=True):
+    '''Start, or stop, storing the irreversible blocks.
+
+    Equivalent to setting :attr:`.core.setup.is_block_store`.
+    '''
+    setup.is_block_store = is_enabled
+
+
+def is_enabled():
+    '''Whether the blocks are to be stored and read from the store.
+
+    That is, if :attr:`.core.setup.is_block_store` is set, and no cassette,
+    see :mod:`.cassette`, is recorded or replayed.
+    '''
+    return setup.is_block_store \
+        and not cassette.is_recording() and not cassette.is_replaying()
+
+
+def configure(directory=None, max_size_mb=256):
+    '''Set where the store is, and how big it may grow.
+
+    Args:
+        directory (str): The directory of the store. Default is the *blocks*
+            subdirectory of the directory of application data.
+        max_size_mb (float): The maximum size of the store, in megabytes.
+            Default is 256.
+    '''
+    global __directory, __max_size, __size
+    with __lock:
+        __directory = directory
+        __max_size = int(max_size_mb * 1024 * 1024)
+        __size = None
+
+
+def directory():
+    '''The directory of the store.
+    '''
+    if __directory:
+        return __directory
+    return os.path.join(config.get_app_data_dir(), BLOCKS_DIR)
+
+
+@contextlib.contextmanager
+def locked(is_creating=True):
+    '''Lock the store, against the threads and the other processes.
+
+    Args:
+        is_creating (bool): If *False*, and the store does not exist, it is
+            not created for the file lock: only the threads are locked out.
+            Default is *True*.
+    '''
+    global __lock_depth
+    with __lock:
+        # The file is locked once, by the outermost call of the thread.
+        if fcntl is None or __lock_depth \
+                or not is_creating and not os.path.exists(directory()):
+            __lock_depth = __lock_depth + 1
+            try:
+                yield
+            finally:
+                __lock_depth = __lock_depth - 1
+            return
+        os.makedirs(directory(), exist_ok=True)
+        with open(os.path.join(directory(), LOCK_FILE), "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            __lock_depth = 1
+            try:
+                yield
+            finally:
+                __lock_depth = 0
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def chain_key(address, chain_id):
+    '''The name of the directory of the blocks of a node.
+    '''
+    return setup.url_prefix(address) + chain_id
+
+
+def read_chains():
+    path = os.path.join(directory(), CHAINS_JSON)
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def write_chains(chains):
+    os.makedirs(directory(), exist_ok=True)
+    with open(os.path.join(directory(), CHAINS_JSON), "w") as f:
+        json.dump(chains, f, indent=4)
+
+
+def chain(block_num=None):
+    '''The chain ID and the last irreversible block of the current node.
+
+    The node is asked with *get_info* if it has not been yet, or if the
+    given block is above the last irreversible one, as known, and the
+    knowledge is older than :attr:`LIB_MAX_AGE_SEC`.
+
+    Args:
+        block_num (int): The number of a block that is to be stored.
+
+    Returns:
+        dict: With the *chain_id* and *last_irreversible_block_num* fields,
+        and the *key* one, see :func:`chain_key`.
+    '''
+    address = setup.nodeos_address()
+    with __lock:
+        chain_ = __chains.get(address)
+    if chain_ and (block_num is None
+            or block_num <= chain_["last_irreversible_block_num"]
+            or time.time() - chain_["time"] < LIB_MAX_AGE_SEC):
+        return chain_
+
+    info = http_api.ChainApi("get_info", is_verbose=False, is_cached=False).json
+    chain_ = {
+        "chain_id": info["chain_id"],
+        "key": chain_key(address, info["chain_id"]),
+        "last_irreversible_block_num": int(info["last_irreversible_block_num"]),
+        "time": time.time()
+    }
+    with locked():
+        __chains[address] = chain_
+        chains = read_chains()
+        if chains.get(address) != chain_["chain_id"]:
+            chains[address] = chain_["chain_id"]
+            write_chains(chains)
+    return chain_
+
+
+def segment_files(key, block_num):
+    path = os.path.join(
+        directory(), key, "{:08d}".format(block_num // SEGMENT_BLOCKS))
+    return path + ".dat", path + ".idx"
+
+
+def is_block_id(block_num_or_id):
+    return isinstance(block_num_or_id, str) and len(block_num_or_id) == 64
+
+
+def block_number(block_num_or_id):
+    '''The block number, given either the number or the ID of a block.
+
+    The first four bytes of a block ID are the block number.
+    '''
+    if is_block_id(block_num_or_id):
+        return int(block_num_or_id[0:8], 16)
+    return int(block_num_or_id)
+
+
+def get(block_num_or_id):
+    '''The stored block, if any.
+
+    Args:
+        block_num_or_id (int or str): The number or the ID of the block.
+
+    Returns:
+        json: The block, as the *get_block* endpoint responds it, or *None*
+        if it is not stored, or the store is not enabled.
+    '''
+    if not is_enabled():
+        return None
+
+    block_num = block_number(block_num_or_id)
+    data_file, index_file = segment_files(chain()["key"], block_num)
+    block = None
+    with locked(is_creating=False):
+        if os.path.exists(index_file):
+            with open(index_file, "rb") as f:
+                f.seek((block_num % SEGMENT_BLOCKS) * INDEX_SIZE)
+                record = f.read(INDEX_SIZE)
+            offset, size = struct.unpack(INDEX_FORMAT, record) \
+                if len(record) == INDEX_SIZE else (0, 0)
+            if size:
+                with open(data_file, "rb") as f:
+                    f.seek(offset)
+                    block = json.loads(zlib.decompress(f.read(size)).decode())
+                # The time of modification of the index orders the eviction.
+                os.utime(index_file)
+
+        if block and is_block_id(block_num_or_id) \
+                and block["id"] != block_num_or_id:
+            block = None
+        __counters["hits" if block else "misses"] += 1
+    return block
+
+
+def put(block):
+    '''Store a block if it is irreversible.
+
+    Args:
+        block (json): The block, as the *get_block* endpoint responds it.
+
+    Returns:
+        bool: Whether the block has been stored.
+    '''
+    if not is_enabled():
+        return False
+
+    block_num = int(block["block_num"])
+    chain_ = chain(block_num)
+    if block_num > chain_["last_irreversible_block_num"]:
+        return False
+
+    data = zlib.compress(json.dumps(block, separators=(",", ":")).encode())
+    data_file, index_file = segment_files(chain_["key"], block_num)
+    with locked():
+        os.makedirs(os.path.dirname(data_file), exist_ok=True)
+        if not os.path.exists(index_file):
+            with open(index_file, "wb") as f:
+                f.write(bytes(SEGMENT_BLOCKS * INDEX_SIZE))
+            add_size(SEGMENT_BLOCKS * INDEX_SIZE)
+
+        with open(data_file, "ab") as f:
+            offset = f.tell()
+            f.write(data)
+        with open(index_file, "r+b") as f:
+            f.seek((block_num % SEGMENT_BLOCKS) * INDEX_SIZE)
+            f.write(struct.pack(INDEX_FORMAT, offset, len(data)))
+        __counters["stored"] += 1
+        add_size(len(data))
+        evict(keep=index_file)
+    return True
+
+
+def segments():
+    '''The segments of the store, the least recently used first.
+
+    Returns:
+        list: List of (<time of use>, <data file>, <index file>) tuples.
+    '''
+    retval = []
+    if not os.path.exists(directory()):
+        return retval
+    for key in os.listdir(directory()):
+        chain_dir = os.path.join(directory(), key)
+        if not os.path.isdir(chain_dir):
+            continue
+        for file in os.listdir(chain_dir):
+            if file.endswith(".idx"):
+                index_file = os.path.join(chain_dir, file)
+                retval.append((
+                    os.path.getmtime(index_file),
+                    index_file[:-len(".idx")] + ".dat", index_file))
+    retval.sort()
+    return retval
+
+
+def file_size(path):
+    return os.path.getsize(path) if os.path.exists(path) else 0
+
+
+def add_size(size):
+    global __size
+    if __size is None:
+        __size = sum([
+            file_size(data_file) + file_size(index_file)
+                for _, data_file, index_file in segments()])
+    else:
+        __size = __size + size
+
+
+def evict(keep=None):
+    '''Delete the least recently used segments while the store is too big.
+
+    Args:
+        keep (str): The index file of a segment not to be deleted.
+    '''
+    global __size
+    with locked(is_creating=False):
+        if __size is None or __size <= __max_size:
+            return
+        for _, data_file, index_file in segments():
+            if __size <= __max_size:
+                break
+            if index_file == keep:
+                continue
+            __size = __size - file_size(data_file) - file_size(index_file)
+            for file in [data_file, index_file]:
+                if os.path.exists(file):
+                    os.remove(file)
+            __counters["evicted"] += 1
+
+
+def clear(address=None):
+    '''Delete the stored blocks of a node, or all of them.
+
+    Args:
+        address (str): The address of the node. If *None*, the store is
+            emptied.
+    '''
+    global __size
+    with __lock:
+        if address is None:
+            __chains.clear()
+        else:
+            __chains.pop(address, None)
+    # Whether the store is enabled or not, it is not created to be cleared.
+    if not os.path.exists(directory()):
+        return
+
+    with locked(is_creating=False):
+        chains = read_chains()
+        if address is None:
+            keys = set([
+                key for key in os.listdir(directory())
+                    if os.path.isdir(os.path.join(directory(), key))]) \
+                if os.path.exists(directory()) else set()
+            chains = {}
+        else:
+            chain_id = chains.pop(address, None)
+            keys = set([chain_key(address, chain_id)]) if chain_id else set()
+
+        try:
+            for key in keys:
+                chain_dir = os.path.join(directory(), key)
+                if os.path.exists(chain_dir):
+                    shutil.rmtree(chain_dir)
+            if os.path.exists(directory()):
+                write_chains(chains)
+        except OSError as e:
+            raise errors.Error('''
+            Cannot clear the block store
+                {}
+            The error message is:
+            {}
+            '''.format(directory(), str(e)), translate=False)
+        __size = None
+
+
+def stats():
+    '''The hit, miss, store and eviction counters.
+
+    Returns:
+        dict: Dictionary {"hits": <int>, "misses": <int>, "stored": <int>,
+        "evicted": <int>}, where *evicted* counts segments.
+    '''
+    with __lock:
+        return dict(__counters)
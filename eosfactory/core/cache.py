@@ -0,0 +1,260 @@
+'''Read-through cache of the responces to read-only chain queries.
+
+If :attr:`.core.setup.is_cache` is set, see :func:`enable`, the responces to
+the queries like *get info*, *get account*, *get table* or *get code* are
+cached, keyed by the command and its arguments, whether they are issued with
+*EOSIO cleos* or natively, see :class:`.http_api.ChainApi`.
+
+A cached responce depends on the accounts it regards: for example, the
+responce to *get table eosio.token alice accounts* depends on the
+*eosio.token* account. It is invalidated whenever a transaction executes an
+action of, notifies, is authorized by, or names in the data of an action, any
+of these accounts. If a transaction does not report what it has executed, all
+the cache is invalidated. Besides, the responces expire, see
+:func:`configure`, and responces to *get info* expire with each block.
+
+The queries take the *is_cached* argument: if *False*, the cache is bypassed,
+for example, if a test needs fresh state.
+'''
+
+import re
+import time
+import threading
+
+import eosfactory.core.setup as setup
+
+
+BLOCK_INTERVAL_SEC = 0.5
+'''The interval of block production, in seconds.
+'''
+WRITE_COMMAND_GROUPS = ["push", "set", "system"]
+WRITE_COMMANDS = ["create account", "chain push_transaction"]
+NAME_PATTERN = re.compile(r"^[a-z1-5.]{1,12}[a-j1-5]?$")
+
+__ttl_sec = 60
+__max_blocks = None
+__head_block = None
+__entries = {}
+__counters = {}
+__lock = threading.Lock()
+
+
+def enable(is_enabled=True):
+    '''Start, or stop, caching the responces to chain queries.
+
+    Equivalent to setting :attr:`.core.setup.is_cache`.
+    '''
+    setup.is_cache = is_enabled
+    if not is_enabled:
+        clear()
+
+
+def configure(ttl_sec=60, max_blocks=None):
+    '''Set when cached responces expire.
+
+    Args:
+        ttl_sec (float): The time a responce is valid for, in seconds.
+            Default is 60.
+        max_blocks (int): If set, the number of blocks, produced since a
+            responce is cached, that it is valid for. The head block is
+            tracked with the responces to *get info*.
+    '''
+    global __ttl_sec, __max_blocks
+    __ttl_sec = ttl_sec
+    __max_blocks = max_blocks
+
+
+def account_names(*names):
+    return set([str(name) for name in names])
+
+
+def dependencies(command, args):
+    '''The accounts that the responce to a query depends on.
+
+    Args:
+        command (str): The command, for example *get account*, or
+            *chain get_account*.
+        args (list or dict): The positionals and options of *EOSIO cleos*, or
+            the request body of the *nodeos* endpoint.
+
+    Returns:
+        set: The account names, or *None* if the responce is not to be
+        cached.
+    '''
+    if command in ["get info", "chain get_info"]:
+        return set()
+    if command in ["get account", "get code", "get abi"] \
+            and not "--code" in args and not "--abi" in args:
+        return account_names(args[0])
+    if command in ["get table", "get currency balance"]:
+        return account_names(args[0])
+    if command in [
+            "chain get_account", "chain get_code_hash", "chain get_abi",
+            "chain get_raw_abi"]:
+        return account_names(args["account_name"])
+    if command in ["chain get_table_rows", "chain get_currency_balance"]:
+        return account_names(args["code"])
+    return None
+
+
+def is_write(command):
+    '''Whether the given command may change the state of the chain.
+    '''
+    return command in WRITE_COMMANDS \
+        or command.split(" ")[0] in WRITE_COMMAND_GROUPS
+
+
+def head_block():
+    '''The head block, estimated with the last responce to *get info*.
+
+    Returns:
+        int: The block number, or *None* if not known.
+    '''
+    if __head_block is None:
+        return None
+    block_num, time_ = __head_block
+    return block_num + int((time.time() - time_) / BLOCK_INTERVAL_SEC)
+
+
+def key(command, args):
+    return (setup.nodeos_address(), command, repr(args))
+
+
+def count(command, counter):
+    counters = __counters.setdefault(
+        command, {"hits": 0, "misses": 0, "invalidations": 0})
+    counters[counter] = counters[counter] + 1
+
+
+def get(command, args):
+    '''The cached responce to a query, if any, and valid.
+
+    Args:
+        command (str): The command, see :func:`dependencies`.
+        args (list or dict): The arguments, see :func:`dependencies`.
+
+    Returns:
+        The responce, as cached with :func:`put`, or *None*.
+    '''
+    if not setup.is_cache or dependencies(command, args) is None:
+        return None
+
+    with __lock:
+        entry = __entries.get(key(command, args))
+        if entry:
+            age = time.time() - entry["time"]
+            head_block_ = head_block()
+            if age > __ttl_sec \
+                    or not entry["accounts"] and age > BLOCK_INTERVAL_SEC \
+                    or __max_blocks and not entry["block"] is None \
+                        and head_block_ - entry["block"] >= __max_blocks:
+                del __entries[key(command, args)]
+                entry = None
+
+        count(command, "hits" if entry else "misses")
+        return entry["response"] if entry else None
+
+
+def put(command, args, response, json_=None):
+    '''Cache the responce to a query.
+
+    Args:
+        command (str): The command, see :func:`dependencies`.
+        args (list or dict): The arguments, see :func:`dependencies`.
+        response: The responce.
+        json_ (json): The responce, as JSON. If it is the responce to
+            *get info*, the head block is tracked with it.
+    '''
+    global __head_block
+    if not setup.is_cache:
+        return
+    accounts = dependencies(command, args)
+    if accounts is None:
+        return
+
+    with __lock:
+        if isinstance(json_, dict) and "head_block_num" in json_:
+            __head_block = (int(json_["head_block_num"]), time.time())
+        __entries[key(command, args)] = {
+            "response": response,
+            "accounts": accounts,
+            "time": time.time(),
+            "block": head_block()
+        }
+
+
+def invalidate(accounts=None):
+    '''Discard the cached responces that depend on the given accounts.
+
+    Args:
+        accounts (set): The account names. If *None*, all the cache is
+            discarded.
+    '''
+    with __lock:
+        for key_, entry in list(__entries.items()):
+            if accounts is None or entry["accounts"] & accounts:
+                count(key_[1], "invalidations")
+                del __entries[key_]
+
+
+def action_accounts(action_traces):
+    '''The accounts that the given action traces regard.
+
+    That is, the receivers, the contracts, the authorizing actors, and the
+    names given in the action data.
+    '''
+    accounts = set()
+    for trace in action_traces:
+        act = trace["act"]
+        accounts.add(trace["receiver"] if "receiver" in trace \
+            else trace["receipt"]["receiver"])
+        accounts.add(act["account"])
+        for permission in act["authorization"]:
+            accounts.add(permission["actor"])
+        if isinstance(act["data"], dict):
+            for value in act["data"].values():
+                if isinstance(value, str) and NAME_PATTERN.match(value):
+                    accounts.add(value)
+        # Before EOSIO v1.8, inline traces are nested.
+        accounts.update(action_accounts(trace.get("inline_traces", [])))
+    return accounts
+
+
+def after_write(command, result):
+    '''Invalidate the responces that a command may have made stale.
+
+    Args:
+        command (str): The command, for example *push action*.
+        result (.cleos.Cleos): The command object.
+    '''
+    if not setup.is_cache or not is_write(command):
+        return
+
+    try:
+        accounts = action_accounts(result.json["processed"]["action_traces"])
+    except (KeyError, TypeError):
+        accounts = None
+    invalidate(accounts)
+
+
+def stats():
+    '''The hit, miss and invalidation counters.
+
+    Returns:
+        dict: Dictionary {<command>: {"hits": <int>, "misses": <int>,
+        "invalidations": <int>}}.
+    '''
+    with __lock:
+        return {
+            command: dict(counters)
+                for command, counters in __counters.items()}
+
+
+def clear():
+    '''Discard all the cached responces, and reset the counters.
+    '''
+    global __head_block
+    with __lock:
+        __entries.clear()
+        __counters.clear()
+        __head_block = None
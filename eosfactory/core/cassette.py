@@ -0,0 +1,203 @@
+'''Record and replay the responces of *EOSIO cleos* and *nodeos*.
+
+While recording, each command issued is stored, together with its responce,
+in a cassette file. While replaying, the responces are served from the
+cassette, with neither *EOSIO cleos* spawned nor a node running. Hence, a
+test script can be re-run in seconds, if only its Python logic has changed.
+
+Recording and replaying are started with the :func:`start_recording` and
+:func:`start_replaying` functions, or with the environment variables
+*EOSFACTORY_RECORD* and *EOSFACTORY_REPLAY*, set to the path of the cassette
+file, for example::
+
+    EOSFACTORY_RECORD=tic_tac_toe.json python3 tests/tic_tac_toe.py
+    EOSFACTORY_REPLAY=tic_tac_toe.json python3 tests/tic_tac_toe.py
+
+Random account names, see :func:`.cleos.account_name`, are drawn from a
+generator seeded with the cassette, so that they match while replaying.
+'''
+
+import os
+import json
+import atexit
+import random as random_
+import threading
+
+import eosfactory.core.errors as errors
+
+
+RECORD_ENV = "EOSFACTORY_RECORD"
+REPLAY_ENV = "EOSFACTORY_REPLAY"
+IGNORED_OPTIONS = ["--url", "--wallet-url"]
+IGNORED_FLAGS = ["--print-request", "--print-response"]
+
+__path = None
+__is_recording = False
+__is_replaying = False
+__interactions = {}
+__random = None
+__lock = threading.Lock()
+
+
+def is_recording():
+    return __is_recording
+
+
+def is_replaying():
+    return __is_replaying
+
+
+def random():
+    '''The generator of random values that have to be repeatable.
+
+    Returns:
+        A generator seeded with the cassette, if recording or replaying, the
+        *random* module otherwise.
+    '''
+    if __random:
+        return __random
+    return random_
+
+
+def start_recording(path, seed=None):
+    '''Start recording the responces to a cassette file.
+
+    The file is written when the recording is stopped, see :func:`stop`,
+    or at exit.
+
+    Args:
+        path (str): The cassette file.
+        seed (int): The seed of random values. If not set, it is random.
+    '''
+    global __path, __is_recording, __is_replaying, __interactions, __random
+    stop()
+    if seed is None:
+        seed = random_.randint(0, 2**31)
+
+    __path = path
+    __interactions = {"seed": seed, "interactions": {}}
+    __random = random_.Random(seed)
+    __is_replaying = False
+    __is_recording = True
+
+
+def start_replaying(path):
+    '''Start serving the responces from a cassette file.
+
+    Args:
+        path (str): The cassette file.
+
+    Raises:
+        .core.errors.Error: If the file cannot be read.
+    '''
+    global __path, __is_recording, __is_replaying, __interactions, __random
+    stop()
+    try:
+        with open(path, "r") as f:
+            interactions = json.load(f)
+    except Exception as e:
+        raise errors.Error('''
+        Cannot read the cassette file
+            {}
+        The error message is:
+        {}
+        '''.format(path, str(e)), translate=False)
+
+    __path = path
+    __interactions = interactions
+    __random = random_.Random(interactions["seed"])
+    __is_recording = False
+    __is_replaying = True
+
+
+def stop():
+    '''Stop recording or replaying. If recording, write the cassette file.
+    '''
+    global __is_recording, __is_replaying, __random
+    if __is_recording:
+        with open(__path, "w") as f:
+            json.dump(__interactions, f, indent=4)
+    __is_recording = False
+    __is_replaying = False
+    __random = None
+
+
+def key(command_line):
+    '''Normalize a command line, so that it does not depend on the node used.
+
+    Args:
+        command_line (list): The command line, its first item is the
+            executable.
+
+    Returns:
+        str: The key of the command in the cassette.
+    '''
+    normalized = []
+    args = iter(command_line[1:])
+    for arg in args:
+        if arg in IGNORED_OPTIONS:
+            next(args, None)
+        elif not arg in IGNORED_FLAGS:
+            normalized.append(arg)
+    return " ".join(normalized)
+
+
+def add(key, stdout, stderr):
+    '''Record a responce.
+
+    Args:
+        key (str): The key of the command, see :func:`key`.
+        stdout (str): The responce received via the stdout stream.
+        stderr (str): The responce received via the stderr stream.
+    '''
+    json_ = None
+    for stream in [stdout, stderr]:
+        try:
+            json_ = json.loads(stream)
+            break
+        except:
+            pass
+
+    with __lock:
+        responses = __interactions["interactions"].setdefault(key, [])
+        responses.append({"stdout": stdout, "stderr": stderr, "json": json_})
+
+
+def response(key):
+    '''Serve the next responce recorded for a command.
+
+    Responces to the same command are served in the order of recording. If
+    they are used up, the last one is repeated, as for commands issued while
+    polling.
+
+    Args:
+        key (str): The key of the command, see :func:`key`.
+
+    Returns:
+        (str, str): The stdout and stderr streams.
+
+    Raises:
+        .core.errors.Error: If the command has not been recorded.
+    '''
+    with __lock:
+        responses = __interactions["interactions"].get(key)
+        if not responses:
+            raise errors.Error('''
+            The command is not recorded in the cassette
+                {}
+            The command is:
+            {}
+            '''.format(__path, key), translate=False)
+
+        response = responses[0]
+        if len(responses) > 1:
+            responses.pop(0)
+        return (response["stdout"], response["stderr"])
+
+
+atexit.register(stop)
+
+if os.environ.get(RECORD_ENV):
+    start_recording(os.environ[RECORD_ENV])
+elif os.environ.get(REPLAY_ENV):
+    start_replaying(os.environ[REPLAY_ENV])
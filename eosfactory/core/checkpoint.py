@@ -0,0 +1,238 @@
+'''Named checkpoints of the local node, for instant resets.
+
+A checkpoint is captured after a bootstrap, for example, after the master
+account, the accounts and the contracts of tests are created::
+
+    reset()
+    create_master_account("MASTER")
+    ...
+    save_checkpoint("bootstrapped")
+
+and restored with :func:`.core.manager.reset`::
+
+    reset(checkpoint="bootstrapped")
+
+The node is stopped, and its data directory, see
+:func:`.core.config.data_dir`, that is, the blocks and the state, is copied
+to the checkpoint, together with the wallet, password map and account map
+files of the node, see :func:`.core.setup.file_prefix`. The copies are
+reflinks, where the file system supports them, and sparse, hence the state
+file of the node, huge as allocated, is copied in no time.
+'''
+
+import os
+import sys
+import json
+import time
+import shutil
+import subprocess
+
+import eosfactory.core.errors as errors
+import eosfactory.core.logger as logger
+import eosfactory.core.config as config
+import eosfactory.core.setup as setup
+
+
+CHECKPOINTS_DIR = "checkpoints"
+CHECKPOINT_JSON = "checkpoint.json"
+DATA_DIR = "data"
+WALLET_DIR = "wallet"
+
+
+def directory(name=None):
+    '''The directory of a checkpoint, or of all of them if *None*.
+
+    The checkpoints of a node are kept apart from those of other nodes, see
+    :func:`.core.setup.file_prefix`.
+    '''
+    root = os.path.join(
+        config.get_app_data_dir(), CHECKPOINTS_DIR, setup.file_prefix() or "")
+    return os.path.join(root, name) if name else root
+
+
+def exists(name):
+    '''Whether the named checkpoint exists.
+    '''
+    return os.path.exists(os.path.join(directory(name), CHECKPOINT_JSON))
+
+
+def checkpoints():
+    '''The checkpoints.
+
+    Returns:
+        dict: Dictionary {<name>: <description>}, see :func:`save`.
+    '''
+    retval = {}
+    if not os.path.exists(directory()):
+        return retval
+    for name in sorted(os.listdir(directory())):
+        if exists(name):
+            with open(os.path.join(directory(name), CHECKPOINT_JSON)) as f:
+                retval[name] = json.load(f)
+    return retval
+
+
+def copy_tree(source, target):
+    '''Copy a directory, with reflinks and sparse files if possible.
+
+    *GNU cp* is used, if available, otherwise *shutil.copytree*.
+    '''
+    if os.path.exists(target):
+        shutil.rmtree(target)
+    if sys.platform.startswith("linux") and shutil.which("cp"):
+        result = subprocess.run(
+            ["cp", "-a", "--reflink=auto", "--sparse=always", source, target],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        if result.returncode == 0:
+            return
+        if os.path.exists(target):
+            shutil.rmtree(target)
+    shutil.copytree(source, target)
+
+
+def wallet_files():
+    '''The wallet, password map and account map files of the current node.
+    '''
+    wallet_dir = config.keosd_wallet_dir()
+    return [
+        os.path.join(wallet_dir, file) for file in os.listdir(wallet_dir)
+            if file.startswith(setup.file_prefix())]
+
+
+def save(name):
+    '''Capture a checkpoint of the local node.
+
+    The node is stopped for copying, and resumed.
+
+    Args:
+        name (str): The name of the checkpoint. If it exists, it is
+            replaced.
+
+    Raises:
+        .core.errors.Error: If the node is not local, or the copying fails.
+    '''
+    import eosfactory.core.manager as manager
+    import eosfactory.core.teos as teos
+    import eosfactory.core.cleos_get as cleos_get
+
+    if not manager.is_local_testnet():
+        raise errors.Error('''
+        Checkpoints are captured of the local node only.
+        ''', translate=False)
+
+    head_block = cleos_get.GetInfo(
+        is_verbose=False, is_cached=False).head_block
+    teos.node_stop()
+    try:
+        if os.path.exists(directory(name)):
+            shutil.rmtree(directory(name))
+        os.makedirs(os.path.join(directory(name), WALLET_DIR))
+        copy_tree(
+            config.data_dir().rstrip(os.sep),
+            os.path.join(directory(name), DATA_DIR))
+        for file in wallet_files():
+            shutil.copy2(file, os.path.join(directory(name), WALLET_DIR))
+        with open(os.path.join(directory(name), CHECKPOINT_JSON), "w") as f:
+            json.dump({
+                "nodeos_address": setup.nodeos_address(),
+                "file_prefix": setup.file_prefix(),
+                "head_block": head_block,
+                "time": time.time()
+            }, f, indent=4)
+    except OSError as e:
+        raise errors.Error('''
+        Cannot capture the checkpoint ``{}``. The error message is:
+        {}
+        '''.format(name, str(e)), translate=False)
+    finally:
+        manager.node_start()
+
+    logger.INFO('''
+    ######### Checkpoint ``{}`` captured at the block {}.
+    '''.format(name, head_block))
+
+
+def restore(name):
+    '''Restore a checkpoint of the local node.
+
+    The node is expected stopped, and *keosd* killed, as
+    :func:`.core.manager.reset` does: the data directory, and the wallet
+    files of the node, are replaced with the copies of the checkpoint.
+
+    Args:
+        name (str): The name of the checkpoint.
+
+    Raises:
+        .core.errors.Error: If the checkpoint does not exist, or the copying
+            fails.
+    '''
+    restore_files(name, is_wallet=True)
+
+
+def rollback(name):
+    '''Roll the local node back to a checkpoint, quickly.
+
+    Meant to be called between tests, see :mod:`.shell.rollback`. Unlike
+    :func:`.core.manager.reset`, *keosd* is kept running, with its wallet
+    as it is, possibly with more keys than the checkpoint has: only the
+    password and account maps are restored. The node is stopped, its data
+    directory is restored, and it is ready as soon as it responds.
+
+    Args:
+        name (str): The name of the checkpoint.
+
+    Raises:
+        .core.errors.Error: If the checkpoint does not exist, or the copying
+            fails, or the node does not start.
+    '''
+    import eosfactory.core.teos as teos
+    import eosfactory.core.transaction as transaction
+    import eosfactory.core.abi as abi
+    import eosfactory.core.cache as cache
+    import eosfactory.core.block_store as block_store
+
+    teos.node_stop()
+    restore_files(name, is_wallet=False)
+    transaction.clear_cache()
+    abi.invalidate()
+    cache.clear()
+    # Blocks above the checkpoint are forked out.
+    block_store.clear(setup.nodeos_address())
+    teos.node_start()
+    teos.node_probe(blocks=0)
+
+
+def restore_files(name, is_wallet):
+    if not exists(name):
+        raise errors.Error('''
+        There is no checkpoint ``{}``. The checkpoints are:
+        {}
+        '''.format(name, ", ".join(checkpoints().keys())), translate=False)
+
+    def is_restored(file):
+        return is_wallet or not file.endswith(".wallet")
+
+    try:
+        for file in wallet_files():
+            if is_restored(file):
+                os.remove(file)
+        wallet_dir = os.path.join(directory(name), WALLET_DIR)
+        for file in os.listdir(wallet_dir):
+            if is_restored(file):
+                shutil.copy2(
+                    os.path.join(wallet_dir, file), config.keosd_wallet_dir())
+        copy_tree(
+            os.path.join(directory(name), DATA_DIR),
+            config.data_dir().rstrip(os.sep))
+    except OSError as e:
+        raise errors.Error('''
+        Cannot restore the checkpoint ``{}``. The error message is:
+        {}
+        '''.format(name, str(e)), translate=False)
+
+
+def delete(name):
+    '''Delete a checkpoint.
+    '''
+    if os.path.exists(directory(name)):
+        shutil.rmtree(directory(name))
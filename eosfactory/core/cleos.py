@@ -4,23 +4,233 @@ import pathlib
 import random
 import os
 import re
+import time
+import threading
 
 import eosfactory.core.errors as errors
 import eosfactory.core.logger as logger
 import eosfactory.core.config as config
 import eosfactory.core.setup as setup
 import eosfactory.core.interface as interface
+import eosfactory.core.metrics as metrics
+import eosfactory.core.cassette as cassette
+import eosfactory.core.cache as cache
 
 
 def set_local_nodeos_address_if_none():
     if not setup.nodeos_address():
         setup.set_nodeos_address(
-            "http://" + config.http_server_address())
+            "http://" + config.http_server_address(),
+            prefix=config.node_file_prefix())
         setup.is_local_address = True
 
     return setup.is_local_address
 
 
+KEOSD_COMMAND_GROUPS = ["wallet", "push", "set", "system", "transfer"]
+KEOSD_COMMANDS = ["create account"]
+'''The commands of *EOSIO cleos* that call *keosd*, see :func:`command_line`.
+'''
+
+
+def is_keosd_command(command_group, command):
+    '''Whether the command of *EOSIO cleos* calls *keosd*.
+    '''
+    return command_group in KEOSD_COMMAND_GROUPS \
+        or command_group + " " + command.strip() in KEOSD_COMMANDS
+
+
+def command_line(args, command_group, command):
+    '''Compose the command line for *EOSIO cleos*.
+
+    Args:
+        args (list): List of *EOSIO cleos* positionals and options.
+        command_group (str): Command group name.
+        command (str): Command name.
+    '''
+    # While replaying a cassette, EOSIO cleos is not needed.
+    cl = ["cleos" if cassette.is_replaying() else config.cli_exe()]
+    set_local_nodeos_address_if_none()
+    cl.extend(["--url", setup.nodeos_address()])
+    # Hence, EOSIO cleos does not launch keosd with the default wallet
+    # directory. The other commands do not need keosd to be started.
+    if not cassette.is_replaying() \
+            and is_keosd_command(command_group, command):
+        import eosfactory.core.teos as teos
+        cl.extend(["--wallet-url", teos.keosd_start()])
+
+    if setup.is_print_request:
+        cl.append("--print-request")
+    if setup.is_print_response:
+        cl.append("--print-response")
+
+    cl.append(command_group)
+    cl.extend(re.sub(re.compile(r'\s+'), ' ', command.strip()).split(" "))
+    cl.extend(args)
+
+    if setup.is_print_command_line:
+        print("######## command line sent to cleos:")
+        print(" ".join(cl))
+        print("")
+
+    return cl
+
+
+def spawn(command_line):
+    '''Execute *EOSIO cleos*, or replay its responce, see :mod:`.cassette`.
+
+    Args:
+        command_line (list): The command line.
+
+    Returns:
+        (bytes, bytes): The stdout and stderr streams.
+    '''
+    key = cassette.key(command_line)
+    if cassette.is_replaying():
+        stdout, stderr = cassette.response(key)
+        return (stdout.encode("ISO-8859-1"), stderr.encode("ISO-8859-1"))
+
+    process = subprocess.run(
+        command_line,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        cwd=str(pathlib.Path(config.cli_exe()).parent)) 
+
+    if cassette.is_recording():
+        cassette.add(
+            key, process.stdout.decode("ISO-8859-1"), 
+            process.stderr.decode("ISO-8859-1"))
+    return (process.stdout, process.stderr)
+
+
+class RetryPolicy():
+    '''How to repeat commands failing for transient reasons.
+
+    The delay before a repetition grows exponentially, and it is randomized
+    in order to spread repetitions of concurrent commands.
+
+    Args:
+        max_attempts (int): The maximum number of attempts, including the 
+            first one. Default is 5.
+        backoff_sec (float): The delay before the first repetition. Default is
+            0.1.
+        max_backoff_sec (float): The maximum delay. Default is 3.
+        jitter (float): The fraction of the delay that is random. Default is 
+            0.5.
+        deadline_sec (float): No repetition is started later than this time 
+            after the first attempt. Default is 60.
+        transient_errors (list): Fragments of error messages that make a 
+            command be repeated. Default is :attr:`TRANSIENT_ERRORS`.
+    '''
+    TRANSIENT_ERRORS = [
+        "Transaction took too long",
+        "Connection reset",
+        ]
+
+    def __init__(
+            self, max_attempts=5, backoff_sec=0.1, max_backoff_sec=3, 
+            jitter=0.5, deadline_sec=60, transient_errors=None):
+        self.max_attempts = max_attempts
+        self.backoff_sec = backoff_sec
+        self.max_backoff_sec = max_backoff_sec
+        self.jitter = jitter
+        self.deadline_sec = deadline_sec
+        self.transient_errors = transient_errors \
+            if not transient_errors is None else self.TRANSIENT_ERRORS
+
+    def is_transient(self, err_msg):
+        '''Whether the given error message calls for repeating the command.
+
+        Args:
+            err_msg (str): Error message received.
+        '''
+        if not err_msg:
+            return False
+        for error in self.transient_errors:
+            if error in err_msg:
+                return True
+        return False
+
+    def delay(self, attempt, start_time):
+        '''The delay before the next attempt, if any.
+
+        Args:
+            attempt (int): The number of attempts made, less one.
+            start_time (float): The time of the first attempt.
+
+        Returns:
+            float: The delay in seconds, or *None* if the command is not to be
+            repeated.
+        '''
+        if attempt + 1 >= self.max_attempts:
+            return None
+        delay = min(self.max_backoff_sec, self.backoff_sec * 2 ** attempt)
+        delay = delay * (1 - self.jitter * random.random())
+        if time.time() + delay - start_time > self.deadline_sec:
+            return None
+        return delay
+
+
+__retry_policy = RetryPolicy()
+__retry_counts = {}
+__retry_lock = threading.Lock()
+
+
+def retry_policy():
+    '''The retry policy in force, see :class:`RetryPolicy`.
+    '''
+    return __retry_policy
+
+
+def set_retry_policy(policy):
+    '''Set the retry policy.
+
+    Args:
+        policy (RetryPolicy): The policy. If *None*, commands are never
+            repeated.
+    '''
+    global __retry_policy
+    __retry_policy = policy if policy else RetryPolicy(max_attempts=1)
+
+
+def is_transient_error(err_msg):
+    '''Whether the given error message calls for repeating the command.
+
+    Args:
+        err_msg (str): Error message received from *EOSIO cleos*.
+    '''
+    return __retry_policy.is_transient(err_msg)
+
+
+def count_retry(command):
+    '''Count a repetition of the given command.
+
+    Args:
+        command (str): The command, for example *push action*.
+    '''
+    with __retry_lock:
+        __retry_counts[command] = __retry_counts.get(command, 0) + 1
+    if setup.is_metrics:
+        metrics.record_retry(command)
+
+
+def retry_counts():
+    '''The number of repetitions, per command.
+
+    Returns:
+        dict: Dictionary {<command>: <count>}.
+    '''
+    with __retry_lock:
+        return dict(__retry_counts)
+
+
+def clear_retry_counts():
+    '''Reset the number of repetitions.
+    '''
+    with __retry_lock:
+        __retry_counts.clear()
+
+
 # http://www.sphinx-doc.org/domains.html#info-field-lists
 class Cleos():
     '''A prototype for *EOSIO cleos* commands.
@@ -30,6 +240,9 @@ class Cleos():
         args (list): List of *EOSIO cleos* positionals and options.
         command_group (str): Command group name.
         command (str): Command name.
+        is_verbose (bool): If *False* do not print. Default is *True*.
+        is_cached (bool): If *False*, the responce is not taken from the
+            cache, see :mod:`.cache`. Default is *True*.
 
     Attributes:
         out_msg (str): Responce received via the stdout stream.
@@ -37,58 +250,109 @@ class Cleos():
         err_msg (str): Error message received via the stderr stream.
         json (json): Responce received as JSON, if any.
         is_verbose (bool): If set, a message is printed.
+        is_duplicate (bool): If set, the command has been repeated, and the
+            transaction sent has been executed by a failed attempt. Then, 
+            there is no responce.
         args (list): Value of the *args* argument.
 
     Raises:
         .core.errors.Error: If err_msg.
     '''    
-    def __init__(self, args, command_group, command, is_verbose=True):
+    def __init__(
+            self, args, command_group, command, is_verbose=True, 
+            is_cached=True):
         self.out_msg = None
         self.out_msg_details = None
         self.err_msg = None
         self.json = {}
         self.is_verbose = is_verbose
+        self.is_duplicate = False
         self.args = args
 
-        cl = [config.cli_exe()]
-        set_local_nodeos_address_if_none()
-        cl.extend(["--url", setup.nodeos_address()])
+        cl = command_line(args, command_group, command)
+        command = command_group + " " + command
 
-        if setup.is_print_request:
-            cl.append("--print-request")
-        if setup.is_print_response:
-            cl.append("--print-response")
+        start_time = time.time()
+        spawn_time = 0
+        stdout_bytes = 0
+        stderr_bytes = 0
+        attempt = 0
+        cached = cache.get(command, args) if is_cached else None
+        while True:
+            spawn_start_time = time.time()
+            stdout, stderr = cached if cached else spawn(cl)
+            spawn_time = spawn_time + time.time() - spawn_start_time
+            stdout_bytes = stdout_bytes + len(stdout)
+            stderr_bytes = stderr_bytes + len(stderr)
+
+            self.set_streams(stdout, stderr)
+            delay = self.retry_delay(attempt, start_time)
+            if delay is None:
+                break
+            count_retry(command)
+            time.sleep(delay)
+            attempt = attempt + 1
 
-        cl.append(command_group)
-        cl.extend(re.sub(re.compile(r'\s+'), ' ', command.strip()).split(" "))
-        cl.extend(args)
+        parse_start_time = time.time()
+        try:
+            self.process_response()
+            if not cached and not self.err_msg:
+                cache.put(command, args, (stdout, stderr), self.json)
+            cache.after_write(command, self)
+        finally:
+            if setup.is_metrics:
+                metrics.record(
+                    command, time.time() - start_time, spawn_time, 
+                    time.time() - parse_start_time, 
+                    stdout_bytes, stderr_bytes, bool(self.err_msg))
+
+    def retry_delay(self, attempt, start_time):
+        '''The delay before repeating the failed command, if any.
+
+        If a transaction is reported duplicate after a transient failure, 
+        the failed attempt has been actually executed, hence the error is 
+        dismissed, and the *is_duplicate* attribute is set.
 
-        if setup.is_print_command_line:
-            print("######## command line sent to cleos:")
-            print(" ".join(cl))
-            print("")
+        Args:
+            attempt (int): The number of attempts made, less one.
+            start_time (float): The time of the first attempt.
 
-        while True:
-            process = subprocess.run(
-                cl,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                cwd=str(pathlib.Path(config.cli_exe()).parent)) 
-
-            self.out_msg = process.stdout.decode("ISO-8859-1")
-            self.out_msg_details = process.stderr.decode("ISO-8859-1")
+        Returns:
+            float: The delay in seconds, or *None* if the command is not to be
+            repeated.
+        '''
+        if attempt and self.err_msg and "Duplicate transaction" in self.err_msg:
             self.err_msg = None
-            error_key_words = ["ERROR", "Error", "error", "Failed"]
-            for word in error_key_words:
-                if word in self.out_msg_details:
-                    self.err_msg = self.out_msg_details
-                    self.out_msg_details = None
-                    break
-
-            if not self.err_msg or self.err_msg and \
-                    not "Transaction took too long" in self.err_msg:
+            self.is_duplicate = True
+            return None
+
+        if not is_transient_error(self.err_msg):
+            return None
+        return retry_policy().delay(attempt, start_time)
+
+    def set_streams(self, stdout, stderr):
+        '''Set the *out_msg*, *out_msg_details* and *err_msg* attributes.
+
+        Args:
+            stdout (bytes): The stdout stream of *EOSIO cleos*.
+            stderr (bytes): The stderr stream of *EOSIO cleos*.
+        '''
+        self.out_msg = stdout.decode("ISO-8859-1")
+        self.out_msg_details = stderr.decode("ISO-8859-1")
+        self.err_msg = None
+        error_key_words = ["ERROR", "Error", "error", "Failed"]
+        for word in error_key_words:
+            if word in self.out_msg_details:
+                self.err_msg = self.out_msg_details
+                self.out_msg_details = None
                 break
 
+    def process_response(self):
+        '''Validate the responce, and set the *json* attribute.
+
+        Raises:
+            .core.errors.Error: If err_msg.
+        '''
         errors.validate(self)
         
         if not self.err_msg \
@@ -185,23 +449,33 @@ class GetAccount(interface.Account, Cleos):
     Args:
         account (str or .interface.Account): The account to retrieve.
         is_verbose (bool): If *False* do not print. Default is *True*.
+        is_cached (bool): If *False*, the responce is not taken from the
+            cache, see :mod:`.cache`. Default is *True*.
 
     Attributes:
         name (str): The EOSIO name of the account.
         owner_key (str) The *owner* public key.
         active_key (str) The *active* public key.
     '''
-    def __init__(self, account, is_info=True, is_verbose=True):
+    def __init__(self, account, is_info=True, is_verbose=True, is_cached=True):
         interface.Account.__init__(self, interface.account_arg(account))
-        Cleos.__init__(
-            self, 
-            [self.name] if is_info else [self.name, "--json"], 
-            "get", "account", is_verbose)
+        if setup.is_native_http:
+            import eosfactory.core.http_api as http_api
+            http_api.ChainApi.__init__(
+                self, "get_account", {"account_name": self.name}, is_verbose,
+                is_cached=is_cached)
+            if is_info:
+                self.out_msg = http_api.account_info(self.json)
+        else:
+            Cleos.__init__(
+                self, 
+                [self.name] if is_info else [self.name, "--json"], 
+                "get", "account", is_verbose, is_cached)
 
         self.owner_key = None
         self.active_key = None
         try:
-            if not is_info:
+            if not is_info or setup.is_native_http:
                 permissions = self.json["permissions"]
                 for permission in permissions:
                     if permission["required_auth"]["keys"]:
@@ -271,9 +545,17 @@ class WalletCreate(interface.Wallet, Cleos):
         self.password = None
         
         if not password: # try to create a wallet
-            Cleos.__init__(
-                self, ["--name", self.name, "--to-console"], 
-                "wallet", "create", is_verbose)
+            import eosfactory.core.wallet_api as wallet_api
+            if wallet_api.is_native():
+                wallet_api.WalletApi.__init__(
+                    self, "create", self.name, is_verbose=is_verbose)
+                self.out_msg = wallet_api.CREATE_MESSAGE.format(
+                    self.name, self.json) if not self.err_msg else ""
+                self.json = {}
+            else:
+                Cleos.__init__(
+                    self, ["--name", self.name, "--to-console"], 
+                    "wallet", "create", is_verbose)
             self.json["name"] = name
             msg = self.out_msg
 
@@ -298,11 +580,24 @@ class WalletCreate(interface.Wallet, Cleos):
 class WalletStop(Cleos):
     '''Stop keosd, the EOSIO wallet manager.
 
+    The *keosd* serving the wallet directory is stopped, see
+    :func:`.teos.keosd_stop`. Neither *EOSIO cleos*, nor the native client,
+    is called, as either would start *keosd* only to stop it.
+
     Args:
         is_verbose (bool): If *False* do not print. Default is *True*.    
     '''
     def __init__(self, is_verbose=True):
-        Cleos.__init__(self, [], "wallet", "stop", is_verbose)
+        import eosfactory.core.teos as teos
+        if not cassette.is_replaying():
+            teos.keosd_stop()
+        self.out_msg = "OK"
+        self.out_msg_details = None
+        self.err_msg = None
+        self.json = {}
+        self.is_verbose = is_verbose
+        self.is_duplicate = False
+        self.args = []
 
         self.printself()
 
@@ -317,8 +612,14 @@ class WalletList(Cleos):
         json: The list of the open wallets.
     '''
     def __init__(self, is_verbose=True):
-        Cleos.__init__(
-            self, [], "wallet", "list", is_verbose)
+        import eosfactory.core.wallet_api as wallet_api
+        if wallet_api.is_native():
+            wallet_api.WalletApi.__init__(
+                self, "list_wallets", is_verbose=is_verbose)
+            self.out_msg = "Wallets:\n" + self.out_msg
+        else:
+            Cleos.__init__(
+                self, [], "wallet", "list", is_verbose)
 
         self.json = json.loads("{" + self.out_msg.replace("Wallets", \
             '"Wallets"', 1) + "}")
@@ -339,11 +640,21 @@ class WalletImport(Cleos):
     def __init__(self, key, wallet="default", is_verbose=True):
         key_private = interface.key_arg(
             key, is_owner_key=True, is_private_key=True)
-        Cleos.__init__(
-            self, 
-            ["--private-key", key_private, "--name", 
-                interface.wallet_arg(wallet)],
-            "wallet", "import", is_verbose)
+
+        import eosfactory.core.wallet_api as wallet_api
+        if wallet_api.is_native():
+            wallet_api.WalletApi.__init__(
+                self, "import_key", [interface.wallet_arg(wallet), key_private],
+                "imported private key into: {}".format(
+                    interface.wallet_arg(wallet)),
+                is_verbose)
+            self.json = {}
+        else:
+            Cleos.__init__(
+                self, 
+                ["--private-key", key_private, "--name", 
+                    interface.wallet_arg(wallet)],
+                "wallet", "import", is_verbose)
 
         self.json["key_private"] = key_private
         self.key_private = key_private
@@ -365,11 +676,19 @@ class WalletRemove_key(Cleos):
         key_public = interface.key_arg(
             key, is_owner_key=True, is_private_key=False)
 
-        Cleos.__init__(
-            self, 
-            [key_public, "--name", interface.wallet_arg(wallet), 
-                "--password", password], 
-            "wallet", "remove_key", is_verbose)
+        import eosfactory.core.wallet_api as wallet_api
+        if wallet_api.is_native():
+            wallet_api.WalletApi.__init__(
+                self, "remove_key",
+                [interface.wallet_arg(wallet), password, key_public],
+                "removed private key for: {}".format(key_public), is_verbose)
+            self.json = {}
+        else:
+            Cleos.__init__(
+                self, 
+                [key_public, "--name", interface.wallet_arg(wallet), 
+                    "--password", password], 
+                "wallet", "remove_key", is_verbose)
 
         self.json["key_public"] = key_public
         self.key_public = key_public
@@ -383,8 +702,13 @@ class WalletKeys(Cleos):
         is_verbose (bool): If *False* do not print. Default is *True*.
     '''
     def __init__(self, is_verbose=True):
-        Cleos.__init__(
-            self, [], "wallet", "keys", is_verbose)                
+        import eosfactory.core.wallet_api as wallet_api
+        if wallet_api.is_native():
+            wallet_api.WalletApi.__init__(
+                self, "get_public_keys", is_verbose=is_verbose)
+        else:
+            Cleos.__init__(
+                self, [], "wallet", "keys", is_verbose)                
         self.printself() 
 
     def __str__(self):
@@ -401,9 +725,15 @@ class WalletOpen(Cleos):
         is_verbose (bool): If *False* do not print. Default is *True*.
     '''
     def __init__(self, wallet="default", is_verbose=True):
-        Cleos.__init__(
-            self, ["--name", interface.wallet_arg(wallet)], 
-            "wallet", "open", is_verbose)
+        import eosfactory.core.wallet_api as wallet_api
+        if wallet_api.is_native():
+            wallet_api.WalletApi.__init__(
+                self, "open", interface.wallet_arg(wallet),
+                "Opened: {}".format(interface.wallet_arg(wallet)), is_verbose)
+        else:
+            Cleos.__init__(
+                self, ["--name", interface.wallet_arg(wallet)], 
+                "wallet", "open", is_verbose)
 
         self.printself()
 
@@ -415,8 +745,14 @@ class WalletLockAll(Cleos):
         is_verbose (bool): If *False* do not print. Default is *True*.    
     '''
     def __init__(self, is_verbose=True):
-        Cleos.__init__(
-            self, [], "wallet", "lock_all", is_verbose)
+        import eosfactory.core.wallet_api as wallet_api
+        if wallet_api.is_native():
+            wallet_api.WalletApi.__init__(
+                self, "lock_all", out_msg="Locked All Wallets",
+                is_verbose=is_verbose)
+        else:
+            Cleos.__init__(
+                self, [], "wallet", "lock_all", is_verbose)
 
         self.printself()
 
@@ -429,9 +765,15 @@ class WalletLock(Cleos):
         is_verbose (bool): If *False* do not print. Default is *True*.
     '''
     def __init__(self, wallet="default", is_verbose=True):
-        Cleos.__init__(
-            self, ["--name", interface.wallet_arg(wallet)], 
-            "wallet", "lock", is_verbose)
+        import eosfactory.core.wallet_api as wallet_api
+        if wallet_api.is_native():
+            wallet_api.WalletApi.__init__(
+                self, "lock", interface.wallet_arg(wallet),
+                "Locked: {}".format(interface.wallet_arg(wallet)), is_verbose)
+        else:
+            Cleos.__init__(
+                self, ["--name", interface.wallet_arg(wallet)], 
+                "wallet", "lock", is_verbose)
 
         self.printself()
 
@@ -450,10 +792,16 @@ class WalletUnlock(Cleos):
         if isinstance(wallet, interface.Wallet):
             password = wallet.password
 
-        Cleos.__init__(
-            self, 
-            ["--name", interface.wallet_arg(wallet), "--password", password], 
-            "wallet", "unlock", is_verbose)
+        import eosfactory.core.wallet_api as wallet_api
+        if wallet_api.is_native():
+            wallet_api.WalletApi.__init__(
+                self, "unlock", [interface.wallet_arg(wallet), password],
+                "Unlocked: {}".format(interface.wallet_arg(wallet)), is_verbose)
+        else:
+            Cleos.__init__(
+                self, 
+                ["--name", interface.wallet_arg(wallet), "--password", password], 
+                "wallet", "unlock", is_verbose)
 
         self.printself()
 
@@ -588,8 +936,20 @@ class CreateAccount(interface.Account, Cleos):
         if delay_sec:
             args.extend(["--delay-sec", delay_sec])
 
-        Cleos.__init__(
-            self, args, "create", "account", is_verbose)
+        import eosfactory.core.transaction as transaction
+        if transaction.is_native_push(skip_sign, dont_broadcast, ref_block):
+            transaction.push(
+                self,
+                [transaction.newaccount(
+                    interface.account_arg(creator), self.name,
+                    owner_key_public, active_key_public,
+                    authorization(
+                        permission if not permission is None else creator))],
+                expiration_sec, force_unique,
+                max_cpu_usage, max_net_usage, delay_sec, is_verbose)
+        else:
+            Cleos.__init__(
+                self, args, "create", "account", is_verbose)
             
         self.json = GetAccount(self.name, is_verbose=False, is_info=False).json
         self.printself()
@@ -604,7 +964,7 @@ def account_name():
     letters = "abcdefghijklmnopqrstuvwxyz12345"
     name = ""
     for i in range(0, 12):
-        name += letters[random.randint(0, 30)]
+        name += letters[cassette.random().randint(0, 30)]
 
     return name
 
@@ -667,6 +1027,8 @@ class PushAction(Cleos):
             component of EOSIO cleos responce.
         data (str): *["processed"]["action_traces"][0]["act"]["data"]* \
             component of EOSIO cleos responce.
+        push_time (float): The time when the transaction has been pushed, see
+            :func:`.wait.wait_for_inclusion`.
     '''
     def __init__(
             self, account, action, data,
@@ -707,11 +1069,156 @@ class PushAction(Cleos):
                         
         self.console = None
         self.data = None
-        Cleos.__init__(self, args, "push", "action", is_verbose)
+        self.push_time = time.time()
+
+        import eosfactory.core.transaction as transaction
+        actions = None
+        if transaction.is_native_push(skip_sign, dont_broadcast, ref_block):
+            try:
+                actions = [action_json(
+                    self.account_name, action, data,
+                    permission if not permission is None else account)]
+            except ValueError: # not JSON, cleos resolves it
+                pass
+
+        if actions:
+            transaction.push(
+                self, actions, expiration_sec, force_unique,
+                max_cpu_usage, max_net_usage, delay_sec, is_verbose)
+        else:
+            Cleos.__init__(self, args, "push", "action", is_verbose)
 
-        if not dont_broadcast:
+        if not dont_broadcast and not self.is_duplicate:
             self.console = self.json["processed"]["action_traces"][0]["console"]
             self.data = self.json["processed"]["action_traces"][0]["act"]["data"]
 
         self.printself()
 
+
+
+def authorization(permission):
+    '''Convert any permission argument to the *authorization* of an action.
+
+    Args:
+        permission: See :func:`.interface.permission_arg`.
+
+    Returns:
+        [{"actor": str, "permission": str}]: If a permission name is not 
+        given, *active* is assumed.
+    '''
+    if isinstance(permission, list):
+        # permission_arg() consumes the list from its end.
+        permission = list(reversed(permission))
+    retval = []
+    for perm in interface.permission_arg(permission):
+        actor, _, name = perm.partition("@")
+        retval.append({
+            "actor": actor, 
+            "permission": name if name else interface.Permission.ACTIVE.value
+            })
+    return retval
+
+
+def action_json(account, action, data, permission=None):
+    '''Compose the JSON definition of an action.
+
+    Args:
+        account (str or .interface.Account): The account of the contract.
+        action (str): The name of the action.
+        data (str or json): The arguments to the contract.
+        permission: The authorization of the action, see 
+            :func:`.interface.permission_arg`. Defaults to *account*.
+
+    Returns:
+        json: The action, as expected by the *push transaction* command.
+    '''
+    if isinstance(data, str):
+        data = json.loads(data)
+    if permission is None:
+        permission = account
+
+    return {
+        "account": interface.account_arg(account),
+        "name": action,
+        "authorization": authorization(permission),
+        "data": data
+        }
+
+
+class PushTransaction(Cleos):
+    '''Push a transaction with any number of actions.
+
+    Args:
+        actions (list): List of action definitions, see :func:`action_json`.
+
+    See definitions of the remaining parameters: \
+    :func:`.cleos.common_parameters`.
+
+    Attributes:
+        transaction_id (str): The id of the transaction.
+        traces (list): The traces of the actions, in the order of the 
+            *actions* argument; inline actions and notifications are not 
+            listed.
+        consoles (list): The *console* components of the traces.
+        data (list): The *["act"]["data"]* components of the traces.
+        console (str): All the *consoles* joined.
+        push_time (float): The time when the transaction has been pushed, see
+            :func:`.wait.wait_for_inclusion`.
+    '''
+    def __init__(
+            self, actions,
+            expiration_sec=None, 
+            skip_sign=0, dont_broadcast=0, force_unique=0,
+            max_cpu_usage=0, max_net_usage=0,
+            ref_block=None,
+            delay_sec=0,
+            is_verbose=True
+        ):
+        self.actions = actions
+        self.push_time = time.time()
+
+        args = [json.dumps({"actions": actions})]
+
+        if expiration_sec:
+            args.extend(["--expiration", str(expiration_sec)])
+        if skip_sign:
+            args.append("--skip-sign")
+        if dont_broadcast:
+            args.append("--dont-broadcast")
+        if force_unique:
+            args.append("--force-unique")
+        if max_cpu_usage:
+            args.extend(["--max-cpu-usage-ms", str(max_cpu_usage)])
+        if  max_net_usage:
+            args.extend(["--max-net-usage", str(max_net_usage)])
+        if  not ref_block is None:
+            args.extend(["--ref-block", ref_block])
+        if delay_sec:
+            args.extend(["--delay-sec", str(delay_sec)])
+
+        self.transaction_id = None
+        self.traces = []
+        self.consoles = []
+        self.data = []
+        self.console = None
+
+        import eosfactory.core.transaction as transaction
+        if transaction.is_native_push(skip_sign, dont_broadcast, ref_block):
+            transaction.push(
+                self, actions, expiration_sec, force_unique,
+                max_cpu_usage, max_net_usage, delay_sec, is_verbose)
+        else:
+            Cleos.__init__(self, args, "push", "transaction", is_verbose)
+
+        if not dont_broadcast and not self.is_duplicate:
+            self.transaction_id = self.json["transaction_id"]
+            # Since EOSIO v1.8, inline traces are listed flat, after the 
+            # traces of the actions of the transaction.
+            self.traces = [
+                trace for trace in self.json["processed"]["action_traces"] 
+                if trace.get("creator_action_ordinal", 0) == 0]
+            self.consoles = [trace["console"] for trace in self.traces]
+            self.data = [trace["act"]["data"] for trace in self.traces]
+            self.console = "".join(self.consoles)
+
+        self.printself()
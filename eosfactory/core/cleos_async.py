@@ -0,0 +1,184 @@
+import time
+import asyncio
+import functools
+import concurrent.futures
+
+import eosfactory.core.setup as setup
+import eosfactory.core.metrics as metrics
+import eosfactory.core.cache as cache
+import eosfactory.core.cleos as cleos
+
+
+__max_workers = 16
+__executor = None
+
+
+def set_max_workers(max_workers):
+    '''Set the number of commands that may run concurrently with :func:`run`.
+
+    Args:
+        max_workers (int): The number of concurrent commands. Default is 16.
+    '''
+    global __max_workers
+    __max_workers = max_workers
+    global __executor
+    if __executor:
+        __executor.shutdown(wait=False)
+        __executor = None
+
+
+def executor():
+    '''The pool of threads running the commands passed to :func:`run`.
+    '''
+    global __executor
+    if __executor is None:
+        __executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=__max_workers)
+    return __executor
+
+
+class AsyncCleos(cleos.Cleos):
+    '''An awaitable counterpart of the :class:`.cleos.Cleos` class.
+
+    Calls *EOSIO cleos*, and processes the responce. The command is issued
+    when the object is awaited, for example::
+
+        info = await AsyncCleos([], "get", "info")
+        print(info.json["head_block_num"])
+
+    *EOSIO cleos* is spawned with :func:`.cleos.spawn`, in the pool of
+    threads of :func:`run`, not with the *asyncio* subprocess API: the
+    latter needs a child watcher attached to the loop, before Python 3.8.
+    The responce is read through the cache, see :mod:`.cache`, as with the
+    :class:`.cleos.Cleos` class. The native HTTP client, see
+    :mod:`.http_api`, is not used: for the commands that have it, await
+    them with :func:`run`.
+
+    Args:
+        args (list): List of *EOSIO cleos* positionals and options.
+        command_group (str): Command group name.
+        command (str): Command name.
+        is_verbose (bool): If *False* do not print. Default is *True*.
+        is_cached (bool): If *False*, the responce is not taken from the
+            cache. Default is *True*.
+
+    Attributes:
+        See the attributes of the :class:`.cleos.Cleos` class.
+
+    Raises:
+        .core.errors.Error: If err_msg, when awaited.
+    '''
+    def __init__(
+            self, args, command_group, command, is_verbose=True,
+            is_cached=True):
+        self.out_msg = None
+        self.out_msg_details = None
+        self.err_msg = None
+        self.json = {}
+        self.is_verbose = is_verbose
+        self.is_duplicate = False
+        self.is_cached = is_cached
+        self.args = args
+        self.command = command_group + " " + command
+        self.command_line = cleos.command_line(args, command_group, command)
+
+    def __await__(self):
+        return self.run().__await__()
+
+    async def spawn(self):
+        '''Execute *EOSIO cleos*, or replay its responce, see 
+        :func:`.cleos.spawn`.
+
+        Returns:
+            (bytes, bytes): The stdout and stderr streams.
+        '''
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(
+            executor(), cleos.spawn, self.command_line)
+
+    async def run(self):
+        '''Spawn *EOSIO cleos*, unless the responce is cached, and process the
+        responce.
+
+        Returns:
+            The object itself.
+        '''
+        start_time = time.time()
+        spawn_time = 0
+        stdout_bytes = 0
+        stderr_bytes = 0
+        attempt = 0
+        cached = cache.get(self.command, self.args) if self.is_cached else None
+        while True:
+            spawn_start_time = time.time()
+            stdout, stderr = cached if cached else await self.spawn()
+            spawn_time = spawn_time + time.time() - spawn_start_time
+            stdout_bytes = stdout_bytes + len(stdout)
+            stderr_bytes = stderr_bytes + len(stderr)
+
+            self.set_streams(stdout, stderr)
+            delay = self.retry_delay(attempt, start_time)
+            if delay is None:
+                break
+            cleos.count_retry(self.command)
+            await asyncio.sleep(delay)
+            attempt = attempt + 1
+
+        parse_start_time = time.time()
+        try:
+            self.process_response()
+            if not cached and not self.err_msg:
+                cache.put(self.command, self.args, (stdout, stderr), self.json)
+            cache.after_write(self.command, self)
+        finally:
+            if setup.is_metrics:
+                metrics.record(
+                    self.command, time.time() - start_time, spawn_time,
+                    time.time() - parse_start_time,
+                    stdout_bytes, stderr_bytes, bool(self.err_msg))
+        return self
+
+
+async def run(command, *args, **kwargs):
+    '''Await any blocking EOSFactory command.
+
+    The command is executed in a pool of threads, see :func:`set_max_workers`,
+    so that independent commands may be gathered concurrently, for example::
+
+        import eosfactory.core.cleos_get as cleos_get
+
+        tables = wait(
+            run(cleos_get.GetTable, host, "accounts", alice, is_verbose=False),
+            run(cleos_get.GetTable, host, "accounts", bob, is_verbose=False))
+
+    Args:
+        command (class or function): For example, :class:`.cleos.PushAction`,
+            or the *push_action* method of an account object.
+        args: Positional arguments of the command.
+        kwargs: Keyword arguments of the command.
+
+    Returns:
+        The result of the command.
+    '''
+    loop = asyncio.get_event_loop()
+    return await loop.run_in_executor(
+        executor(), functools.partial(command, *args, **kwargs))
+
+
+def wait(*awaitables):
+    '''Run the given awaitables concurrently, and wait for all of them.
+
+    Args:
+        awaitables: Coroutines or :class:`.AsyncCleos` objects.
+
+    Returns:
+        list: The results of the awaitables, in the given order.
+    '''
+    async def gather():
+        return await asyncio.gather(*awaitables)
+
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(gather())
+    finally:
+        loop.close()
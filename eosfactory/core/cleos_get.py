@@ -1,15 +1,25 @@
 
+import os
 import json
+import time
+import collections
+import concurrent.futures
 
+import eosfactory.core.errors as errors
 import eosfactory.core.logger as logger
+import eosfactory.core.setup as setup
 import eosfactory.core.interface as interface
 import eosfactory.core.cleos as cleos
+import eosfactory.core.http_api as http_api
+import eosfactory.core.block_store as block_store
 
 
 class GetInfo(cleos.Cleos):
     '''Get current blockchain information.
 
     :param bool is_verbose: If ``False``, print a message. Default is ``True``.
+    :param bool is_cached: If ``False``, the responce is not taken from the 
+        cache, see :mod:`.cache`. Default is ``True``.
 
     :return: A :class:`eosfactory.core.cleos.Cleos` object, extended with the 
         following items:
@@ -19,8 +29,13 @@ class GetInfo(cleos.Cleos):
     :var int last_irreversible_block_num: The number of the most recent irreversible
         block.
     '''
-    def __init__(self, is_verbose=True):
-        cleos.Cleos.__init__(self, [], "get", "info", is_verbose)
+    def __init__(self, is_verbose=True, is_cached=True):
+        if setup.is_native_http:
+            http_api.ChainApi.__init__(
+                self, "get_info", None, is_verbose, is_cached=is_cached)
+        else:
+            cleos.Cleos.__init__(
+                self, [], "get", "info", is_verbose, is_cached)
         self.head_block = int(self.json["head_block_num"])
         self.head_block_time = self.json["head_block_time"]
         self.last_irreversible_block_num \
@@ -49,11 +64,26 @@ class GetActions(cleos.Cleos):
         console (bool): print console output generated by action. Default 
             is *False*.
         is_verbose (bool): If *False* do not print. Default is *True*.
+
+    If :attr:`.core.setup.is_native_http` is set, the responce is the JSON of
+    the *history* API, whatever the *json*, *full*, *pretty* and *console*
+    arguments.
     '''
     def __init__(
         self, account, pos=-1, offset=1, 
         json=False, full=False, pretty=False, console=False, is_verbose=True):
 
+        if setup.is_native_http:
+            http_api.ChainApi.__init__(
+                self, "get_actions", 
+                {
+                    "account_name": interface.account_arg(account),
+                    "pos": pos, "offset": offset
+                },
+                is_verbose, api="history")
+            self.printself()
+            return
+
         args = [interface.account_arg(account), str(pos), str(offset)]
         
         if json:
@@ -72,6 +102,9 @@ class GetActions(cleos.Cleos):
 class GetBlock(cleos.Cleos):
     '''Retrieve a full block from the blockchain.
 
+    Irreversible blocks are read through the local store, if it is enabled, 
+    see :mod:`.block_store`.
+
     :param int block_number: The number of the block to retrieve.
     :param str block_id: The ID of the block to retrieve, if set, defaults to "".   
     :param bool is_verbose: If ``False``, print a message. Default is ``True``.
@@ -79,9 +112,26 @@ class GetBlock(cleos.Cleos):
     :return: A :class:`eosfactory.core.cleos.Cleos` object.
     '''
     def __init__(self, block_number, block_id=None, is_verbose=True):
-        cleos.Cleos.__init__(
+        stored = block_store.get(block_id if block_id else block_number)
+        if stored:
+            self.json = stored
+            self.out_msg = json.dumps(stored, indent=4)
+            self.out_msg_details = None
+            self.err_msg = None
+            self.is_verbose = is_verbose
+            self.is_duplicate = False
+            self.args = [block_id] if block_id else [str(block_number)]
+        elif setup.is_native_http:
+            http_api.ChainApi.__init__(
+                self, "get_block", 
+                {"block_num_or_id": block_id if block_id else block_number},
+                is_verbose)
+        else:
+            cleos.Cleos.__init__(
                         self, [block_id] if block_id else [str(block_number)], 
                         "get", "block", is_verbose)
+        if not stored:
+            block_store.put(self.json)
         self.printself()
 
     def __str__(self):
@@ -106,6 +156,320 @@ def get_block_trx_count(block_num):
     return len(trxs)
 
 
+def block_summary(block):
+    '''The summary of a block, with no transaction data.
+
+    Args:
+        block (json): The block, as the *get_block* endpoint responds it.
+
+    Returns:
+        dict: Dictionary with the *block_num*, *id*, *timestamp*, *producer*,
+        *transaction_count*, *cpu_usage_us* and *net_usage_words* keys, the
+        last two summed over the transaction receipts.
+    '''
+    trxs = block.get("transactions", [])
+    return {
+        "block_num": block["block_num"],
+        "id": block["id"],
+        "timestamp": block["timestamp"],
+        "producer": block["producer"],
+        "transaction_count": len(trxs),
+        "cpu_usage_us": sum([trx["cpu_usage_us"] for trx in trxs]),
+        "net_usage_words": sum([trx["net_usage_words"] for trx in trxs]),
+    }
+
+
+def repeat(function, args, retries=3):
+    '''Call a function, repeating if it fails.
+
+    The delays between the attempts follow :func:`.cleos.retry_policy`.
+
+    Args:
+        function: The function.
+        args (tuple): The arguments to the function.
+        retries (int): The number of repetitions. Default is 3.
+
+    Returns:
+        The value returned by the function.
+
+    Raises:
+        .core.errors.Error: If the last attempt fails.
+    '''
+    start_time = time.time()
+    attempt = 0
+    while True:
+        try:
+            return function(*args)
+        except errors.Error:
+            delay = cleos.retry_policy().delay(attempt, start_time) \
+                if attempt < retries else None
+            if delay is None:
+                raise
+            time.sleep(delay)
+            attempt = attempt + 1
+
+
+def iter_ordered(function, args_list, workers=8, window=None, retries=3):
+    '''Yield the values of a function, called concurrently, in order.
+
+    The function is called by a pool of *workers* threads, at most *window* 
+    calls ahead of the value yielded last, hence with bounded memory, see
+    :func:`iter_blocks`.
+
+    Args:
+        function: The function.
+        args_list (iterable): The arguments to the function, a tuple per 
+            call.
+        workers (int): The number of concurrent calls. Default is 8.
+        window (int): The maximum number of calls ahead. Default is four 
+            times *workers*.
+        retries (int): The number of repetitions of a failing call, see
+            :func:`repeat`. Default is 3.
+
+    Yields:
+        The values returned, in the order of *args_list*.
+    '''
+    if window is None:
+        window = 4 * workers
+    window = max(window, workers)
+
+    args_list = iter(args_list)
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=workers)
+    pending = collections.deque()
+    try:
+        while True:
+            for args in args_list:
+                pending.append(
+                    executor.submit(repeat, function, args, retries))
+                if len(pending) >= window:
+                    break
+            if not pending:
+                return
+            yield pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+
+def fetch_block(block_num, summary=False):
+    '''Retrieve a block, or its summary, see :func:`block_summary`.
+    '''
+    block = GetBlock(block_num, is_verbose=False).json
+    return block_summary(block) if summary else block
+
+
+def iter_blocks(
+        start, end=None, workers=8, window=None, summary=False, retries=3):
+    '''Yield the blocks of a range, in order, retrieved concurrently.
+
+    The blocks are fetched by a pool of *workers* threads, at most *window* 
+    blocks ahead of the block yielded last. Hence, even a long range is 
+    scanned with bounded memory, while the requests overlap.
+
+    In the *summary* mode, the transaction data is discarded as soon as a 
+    block arrives, and only :func:`block_summary` of it is held and yielded.
+
+    Args:
+        start (int): The number of the first block.
+        end (int): The number of the last block. If not set, the head block
+            at the start of the scan.
+        workers (int): The number of concurrent requests. Default is 8.
+        window (int): The maximum number of blocks fetched ahead. Default is
+            four times *workers*.
+        summary (bool): Yield the summaries of the blocks, see 
+            :func:`block_summary`.
+        retries (int): The number of repetitions of a failing request, see
+            :func:`repeat`. Default is 3.
+
+    Yields:
+        json: The blocks, or their summaries, in the order of block numbers.
+
+    Raises:
+        .core.errors.Error: If a block cannot be retrieved.
+    '''
+    if end is None:
+        end = GetInfo(is_verbose=False, is_cached=False).head_block
+    return iter_ordered(
+        fetch_block, 
+        ((block_num, summary) for block_num in range(start, end + 1)),
+        workers, window, retries)
+
+
+class ActionCursor():
+    '''Where a scan of the action history of an account is to resume.
+
+    Passed to :func:`iter_actions`, the cursor is advanced with the actions
+    yielded. Hence, an incremental audit fetches only the new actions.
+
+    Args:
+        account (str or .interface.Account): The account.
+        seq (int): The account sequence number of the next action. Default 
+            is 0.
+        file (str): If set, a JSON file that the cursor is kept in: it is 
+            loaded if it exists, and saved as the cursor advances.
+
+    Attributes:
+        account_name (str): The EOSIO name of the account.
+        seq (int): The account sequence number of the next action.
+        file (str): The file of the cursor, if any.
+        trx_id (str): The transaction of the last action yielded.
+        actions (list): The actions of the transaction yielded, see
+            :func:`action_key`, in order not to repeat them if a scan resumes
+            in the middle of the transaction.
+    '''
+    def __init__(self, account, seq=0, file=None):
+        self.account_name = interface.account_arg(account)
+        self.seq = seq
+        self.file = file
+        self.trx_id = None
+        self.actions = []
+        if file and os.path.exists(file):
+            with open(file, "r") as f:
+                cursor = json.load(f)
+            if cursor["account_name"] == self.account_name:
+                self.seq = cursor["seq"]
+                self.trx_id = cursor.get("trx_id")
+                self.actions = cursor.get("actions", [])
+
+    def save(self):
+        '''Write the cursor to its file, if any.
+        '''
+        if not self.file:
+            return
+        with open(self.file, "w") as f:
+            json.dump({
+                "account_name": self.account_name, "seq": self.seq,
+                "trx_id": self.trx_id, "actions": self.actions}, f)
+
+    def __str__(self):
+        return "{} at {}".format(self.account_name, self.seq)
+
+
+def action_key(action):
+    '''What identifies an action within its transaction, whatever receipt of
+    it is reported.
+
+    An action is executed by its contract, and the accounts it notifies
+    execute it again, each with its own receipt. The receipts of a
+    notification have the action ordinal of the execution notifying as the
+    *closest_unnotified_ancestor_action_ordinal* field. Hence, the action is
+    identified with the action ordinal of its execution, and its digest.
+    Then, identical actions, repeated in a transaction, are different
+    actions.
+
+    If the node does not report action ordinals, like *EOSIO nodeos* before
+    version 1.8, each receipt is a different action.
+
+    Args:
+        action (json): An action, as the *get_actions* endpoint responds it.
+
+    Returns:
+        list: [<ordinal of the execution>, <action digest>], or 
+        [<global sequence number>].
+    '''
+    trace = action["action_trace"]
+    receipt = trace["receipt"]
+    if not "action_ordinal" in trace:
+        return [receipt["global_sequence"]]
+
+    if receipt["receiver"] == trace["act"]["account"]:
+        ordinal = trace["action_ordinal"]
+    else:
+        ordinal = trace["closest_unnotified_ancestor_action_ordinal"]
+    return [ordinal, receipt["act_digest"]]
+
+
+def fetch_actions(account_name, pos, count):
+    '''Retrieve the actions of an account, with the sequence numbers from 
+    *pos* to *pos + count - 1*.
+    '''
+    actions = GetActions(
+        account_name, pos, count - 1, json=True, full=True, 
+        is_verbose=False).json["actions"]
+    return sorted(actions, key=lambda action: action["account_action_seq"])
+
+
+def iter_actions(
+        account, since_seq=0, until_seq=None, cursor=None, dedup=True,
+        page_size=100, workers=4, window=None, retries=3):
+    '''Yield the actions of an account, in order, retrieved concurrently.
+
+    The range of account sequence numbers is split into pages, fetched 
+    concurrently with the *history* API, see :class:`GetActions`, and 
+    :func:`iter_ordered`.
+
+    An action is reported once per receipt of it that regards the account:
+    for example, a transfer from the account is reported as executed by the
+    token contract, and as notified to the account. With *dedup*, only the
+    first receipt of an action is yielded, see :func:`action_key`, while
+    identical actions, repeated in a transaction, are yielded each.
+
+    Args:
+        account (str or .interface.Account): The account.
+        since_seq (int): The account sequence number of the first action.
+            Default is 0.
+        until_seq (int): The account sequence number of the last action. If
+            not set, the last action at the start of the scan.
+        cursor (ActionCursor): If set, the scan starts at the cursor, 
+            whatever *since_seq*, and advances it.
+        dedup (bool): Skip the repeated receipts of an action. Default is 
+            *True*.
+        page_size (int): The number of actions in a request. Default is 100.
+        workers (int): The number of concurrent requests. Default is 4.
+        window (int): The maximum number of pages fetched ahead. Default is
+            four times *workers*.
+        retries (int): The number of repetitions of a failing request, see
+            :func:`repeat`. Default is 3.
+
+    Yields:
+        json: The actions, as the *get_actions* endpoint responds them, in 
+        the order of account sequence numbers.
+    '''
+    account_name = interface.account_arg(account)
+    if cursor is None:
+        cursor = ActionCursor(account_name, since_seq)
+    since_seq = cursor.seq
+    if until_seq is None:
+        last = GetActions(
+            account_name, -1, -1, json=True, full=True, 
+            is_verbose=False).json["actions"]
+        if not last:
+            return
+        until_seq = last[-1]["account_action_seq"]
+
+    pages = (
+        (account_name, pos, min(page_size, until_seq - pos + 1))
+            for pos in range(since_seq, until_seq + 1, page_size))
+    try:
+        for pos, actions in zip(
+                range(since_seq, until_seq + 1, page_size),
+                iter_ordered(fetch_actions, pages, workers, window, retries)):
+            for action in actions:
+                seq = action["account_action_seq"]
+                if seq < since_seq or seq > until_seq:
+                    continue
+                cursor.seq = seq + 1
+
+                if dedup:
+                    trx_id = action["action_trace"]["trx_id"]
+                    if trx_id != cursor.trx_id:
+                        cursor.trx_id = trx_id
+                        cursor.actions = []
+                    key = action_key(action)
+                    if key in cursor.actions:
+                        continue
+                    cursor.actions.append(key)
+
+                yield action
+
+            # Past the page, whether the history has gaps, or not.
+            cursor.seq = min(pos + page_size, until_seq + 1)
+            cursor.save()
+    finally:
+        cursor.save()
+
+
 class GetAccounts(cleos.Cleos):
     '''Retrieve accounts associated with a public key.
 
@@ -118,8 +482,13 @@ class GetAccounts(cleos.Cleos):
     '''
     def __init__(self, key, is_verbose=True):
         public_key = interface.key_arg(key, is_owner_key=True, is_private_key=False)
-        cleos.Cleos.__init__(
-            self, [public_key], "get", "accounts", is_verbose)
+        if setup.is_native_http:
+            http_api.ChainApi.__init__(
+                self, "get_key_accounts", {"public_key": public_key}, 
+                is_verbose, api="history")
+        else:
+            cleos.Cleos.__init__(
+                self, [public_key], "get", "accounts", is_verbose)
 
         self.names = self.json['account_names']
         self.printself()
@@ -135,13 +504,15 @@ class GetCode(cleos.Cleos):
         abi (str): If set, the name of the file to save the contract .abi to.
         wasm (bool): Save contract as wasm.
         is_verbose (bool): If *False* do not print. Default is *True*.
+        is_cached (bool): If *False*, the responce is not taken from the 
+            cache, see :mod:`.cache`. Default is *True*.
 
     Attributes:
         code_hash (str): The hash of the code.
     '''
     def __init__(
             self, account, code="", abi="", 
-            wasm=False, is_verbose=True):
+            wasm=False, is_verbose=True, is_cached=True):
 
         account_name = interface.account_arg(account)
 
@@ -153,7 +524,14 @@ class GetCode(cleos.Cleos):
         if wasm:
             args.extend(["--wasm"])
 
-        cleos.Cleos.__init__(self, args, "get", "code", is_verbose)
+        if setup.is_native_http and not (code or abi):
+            http_api.ChainApi.__init__(
+                self, "get_code_hash", {"account_name": account_name}, 
+                is_verbose, is_cached=is_cached)
+            self.out_msg = "code hash: {}\n".format(self.json["code_hash"])
+        else:
+            cleos.Cleos.__init__(
+                self, args, "get", "code", is_verbose, is_cached)
 
         msg = str(self.out_msg)
         self.json["code_hash"] = msg[msg.find(":") + 2 : len(msg) - 1]
@@ -189,23 +567,24 @@ class GetTable(cleos.Cleos):
             ripemd160 and sha256 is 'hex' only.
         reverse (bool): Iterate in reverse order.
         is_verbose (bool): If *False* do not print. Default is *True*.
+        is_cached (bool): If *False*, the responce is not taken from the 
+            cache, see :mod:`.cache`. Default is *True*.
     '''
     def __init__(
             self, account, table, scope,
             binary=False, 
             limit=10, lower="", upper="", index="",
             key_type="", encode_type="", reverse=False, show_payer=False,
-            is_verbose=True
+            is_verbose=True, is_cached=True
             ):
         args = [interface.account_arg(account)]
 
         if not scope:
             scope=account
-        else:
-            try:
-                scope_name = scope.name
-            except:
-                scope_name = scope
+        try:
+            scope_name = scope.name
+        except:
+            scope_name = scope
 
         args.append(scope_name)
         args.append(table)
@@ -229,6 +608,106 @@ class GetTable(cleos.Cleos):
         if show_payer:
             args.append("--show-payer")
 
-        cleos.Cleos.__init__(self, args, "get", "table", is_verbose)
+        self.account_name = interface.account_arg(account)
+        self.table = table
+        self.binary = binary
+
+        if setup.is_native_http:
+            params = {
+                "json": not binary,
+                "code": interface.account_arg(account),
+                "scope": scope_name,
+                "table": table,
+                "lower_bound": lower,
+                "upper_bound": upper,
+                "limit": limit if limit else 10,
+                "key_type": key_type,
+                "index_position": str(index),
+                "encode_type": encode_type if encode_type else "dec"
+            }
+            if reverse:
+                params["reverse"] = True
+            if show_payer:
+                params["show_payer"] = True
+            http_api.ChainApi.__init__(
+                self, "get_table_rows", params, is_verbose, 
+                is_cached=is_cached)
+        else:
+            cleos.Cleos.__init__(
+                self, args, "get", "table", is_verbose, is_cached)
 
         self.printself()
+
+    def frame(self):
+        '''The rows retrieved, as columns.
+
+        Returns:
+            :class:`.table_frame.TableFrame` object.
+        '''
+        import eosfactory.core.table_frame as table_frame
+        return table_frame.from_rows(
+            self.account_name, self.table, self.json["rows"], self.binary)
+
+
+def iter_table(
+        account, table, scope,
+        lower="", upper="", index="", key_type="", encode_type="", 
+        reverse=False, show_payer=False,
+        page_size=100, max_page_size=10000, page_time_sec=0.25,
+        binary=False):
+    '''Yield the rows of a database table, page by page.
+
+    The pages are retrieved lazily, following the *more* and *next_key*
+    continuation, for the primary and secondary indexes alike. Only one page
+    is held in memory, hence even huge tables can be scanned. The size of 
+    the pages adapts to the response time: it is doubled while pages take 
+    less than half of *page_time_sec*, and halved if they take longer.
+
+    The pages are never cached, see :mod:`.cache`.
+
+    Args:
+        page_size (int): The initial number of rows in a page. Default is 100.
+        max_page_size (int): The maximum number of rows in a page. Default 
+            is 10000.
+        page_time_sec (float): The target response time. Default is 0.25.
+        binary (bool): Yield the rows binary, as hexadecimal strings.
+
+    See the definitions of the remaining arguments: :class:`GetTable`.
+
+    Yields:
+        json: The rows.
+
+    Raises:
+        .core.errors.Error: If the node does not report the *next_key* 
+            continuation, as before EOSIO v1.8.
+    '''
+    while True:
+        start_time = time.time()
+        result = GetTable(
+            account, table, scope, binary=binary, limit=page_size, 
+            lower=lower, upper=upper, index=index, 
+            key_type=key_type, encode_type=encode_type, reverse=reverse,
+            show_payer=show_payer, is_verbose=False, is_cached=False)
+        response_time = time.time() - start_time
+
+        for row in result.json["rows"]:
+            yield row
+
+        if not result.json.get("more"):
+            return
+        next_key = result.json.get("next_key")
+        if not next_key:
+            raise errors.Error('''
+            The node does not report the ``next_key`` continuation of the 
+            table ``{}``. EOSIO v1.8 or newer is needed.
+            '''.format(table))
+
+        if reverse:
+            upper = next_key
+        else:
+            lower = next_key
+
+        if response_time < page_time_sec / 2:
+            page_size = min(page_size * 2, max_page_size)
+        elif response_time > page_time_sec:
+            page_size = max(page_size // 2, 1)
@@ -1,3 +1,4 @@
+import os
 import re
 import types
 
@@ -6,6 +7,8 @@ import eosfactory.core.logger as logger
 import eosfactory.core.manager as manager
 import eosfactory.core.interface as interface
 import eosfactory.core.cleos as cleos
+import eosfactory.core.transaction as transaction
+import eosfactory.core.abi as abi
 
 
 class SetContract(cleos.Cleos):
@@ -87,6 +90,12 @@ class SetContract(cleos.Cleos):
         cleos.Cleos.__init__(self, args, "set", "contract", is_verbose)
         self.contract_path_absolute = files[0]
         self.account_name = interface.account_arg(account)
+
+        if clear:
+            abi.invalidate(self.account_name)
+        elif not dont_broadcast:
+            abi.load_file(
+                self.account_name, os.path.join(contract_path_absolute, abi_file))
         self.printself()
 
 class SetAccountPermission(cleos.Cleos):
@@ -191,8 +200,25 @@ class SetAccountPermission(cleos.Cleos):
         if delay_sec:
             args.extend(["--delay-sec", str(delay_sec)])
                         
-        cleos.Cleos.__init__(
-            self, args, "set", "account permission", is_verbose)
+        if transaction.is_native_push(skip_sign, dont_broadcast, ref_block) \
+                and not return_packed:
+            authorization = cleos.authorization(
+                permission if not permission is None \
+                    else (account_name, interface.Permission.ACTIVE))
+            if args[2] == "NULL":
+                action = transaction.deleteauth(
+                    account_name, permission_name, authorization)
+            else:
+                action = transaction.updateauth(
+                    account_name, permission_name, parent_permission_name,
+                    args[2], authorization)
+            transaction.push(
+                self, [action], expiration_sec, force_unique,
+                max_cpu_usage, max_net_usage, delay_sec, is_verbose)
+        else:
+            cleos.Cleos.__init__(
+                self, args, "set", "account permission", is_verbose)
+        transaction.clear_required_keys()
         self.account_name = account_name
         self.console = None
         self.data = None
@@ -3,6 +3,7 @@ import stat
 import argparse
 import json
 import re
+import shutil
 
 import eosfactory.core.errors as errors
 import eosfactory.core.logger as logger
@@ -30,6 +31,7 @@ CONFIG_JSON = "config.json"
 CONTRACTS_DIR = "contracts/"
 TEMPLATE_DIR = "templates/contracts"
 EOSIO_CPP_DIR = "/usr/opt/eosio.cdt/0.0.0/"
+ENVIRONMENT_PREFIX = "EOSFACTORY_"
 
 node_address_ = ("LOCAL_NODE_ADDRESS", [LOCALHOST_HTTP_ADDRESS])
 wallet_address_ = ("WALLET_MANAGER_ADDRESS", [LOCALHOST_HTTP_ADDRESS])
@@ -45,6 +47,10 @@ chain_state_db_size_mb_ = ("EOSIO_SHARED_MEMORY_SIZE_MB", ["300"])
 
 wsl_root_ = ("WSL_ROOT", [None])
 nodeos_stdout_ = ("NODEOS_STDOUT", [None])
+node_probe_blocks_ = ("NODE_PROBE_BLOCKS", ["2"])
+node_probe_timeout_sec_ = ("NODE_PROBE_TIMEOUT_SEC", ["30"])
+node_p2p_address_ = ("LOCAL_NODE_P2P_ADDRESS", [None])
+node_file_prefix_ = ("LOCAL_NODE_FILE_PREFIX", [None])
 includes_ = ("INCLUDE", "includes")
 libs_ = ("LIBS", "libs")
 
@@ -71,6 +77,80 @@ key_public_ = (
 contract_workspace_dir_ = (
     "EOSIO_CONTRACT_WORKSPACE", [CONTRACTS_DIR])
 
+__config_map = None
+__resolved = {}
+
+
+def file_stamp(path):
+    '''Return a token that changes whenever the given file changes.
+
+    Args:
+        path (str): A file path, or a name of an executable to be found in 
+            the *PATH*.
+    '''
+    if not path:
+        return None
+    if not os.path.isabs(path):
+        path = shutil.which(path)
+        if not path:
+            return None
+    try:
+        stat_ = os.stat(path)
+    except OSError:
+        return None
+    return (path, stat_.st_mtime_ns, stat_.st_size)
+
+
+def resolved(key, stamp, resolve):
+    '''Return a cached value of the resolved environment.
+
+    The value is resolved anew if there is no cached one or if its stamp
+    differs from the given one.
+
+    Args:
+        key (str): The key of the cached value.
+        stamp (object): A token that changes whenever the value is to be
+            resolved anew, see :func:`.file_stamp`.
+        resolve (function): A function returning the value.
+    '''
+    global __resolved
+    if key in __resolved and __resolved[key][0] == stamp:
+        return __resolved[key][1]
+
+    value = resolve()
+    __resolved[key] = (stamp, value)
+    return value
+
+
+def clear_cache():
+    '''Forget the resolved environment, see :func:`.resolved_environment`.
+    '''
+    global __config_map
+    __config_map = None
+    global __resolved
+    __resolved = {}
+
+
+def resolved_environment():
+    '''Return the cache of the resolved environment.
+
+    It lists the values of *config.json*, and of the executable lookups 
+    that are reused until either *config.json* or the relevant executable 
+    changes.
+
+    Note:
+        The cache can be seen with the bash command:
+
+        *python3 -m eosfactory.core.config --cache*
+    '''
+    map = {}
+    for key, entry in __resolved.items():
+        map[key] = {"value": entry[1], "stamp": entry[0]}
+    map[CONFIG_JSON] = {
+        "value": __config_map[1] if __config_map else None,
+        "stamp": __config_map[0] if __config_map else None}
+    return map
+
 
 def get_app_data_dir():
     if APP_DATA_DIR_SUDO[1] in __file__:
@@ -418,11 +498,15 @@ def wsl_root():
     '''
     if not utils.is_windows_ubuntu():
         return ""
-    
-    wsl_root_sh = "wsl_root.sh"
-    wsl_root_sh = os.path.join(get_app_data_dir(), wsl_root_sh)
 
-    if wsl_root_[1][0] is None:
+    def resolve():
+        path = config_value(wsl_root_)
+        if path:
+            return path.replace("\\", "/")
+
+        wsl_root_sh = "wsl_root.sh"
+        wsl_root_sh = os.path.join(get_app_data_dir(), wsl_root_sh)
+
         path = ""
         path, error = utils.spawn(
             [wsl_root_sh, path], raise_exception=False)
@@ -453,13 +537,13 @@ not care about having efficient the intelisense of Visual Studio Code.
                     [wsl_root_sh, path], raise_exception=False)
                 if not error:
                     break
-        
-        wsl_root_[1][0] = path.replace("\\", "/")
-        # map = config_map()
-        # map[config.wsl_root_[0]] = wsl_root_[1][0]
-        # write_config_map(map)
 
-    return wsl_root_[1][0]
+        return path.replace("\\", "/")
+
+    return resolved(
+        wsl_root_[0], 
+        (config_stamp(), os.environ.get(ENVIRONMENT_PREFIX + wsl_root_[0])),
+        resolve)
 
 
 def nodeos_stdout():
@@ -476,6 +560,46 @@ def nodeos_stdout():
     return config_value(nodeos_stdout_)
 
 
+def node_probe_blocks():
+    '''The number of blocks that the local node produces before it is ready.
+
+    See :func:`.core.teos.node_probe`. It may be changed with 
+    *NODE_PROBE_BLOCKS* entry in the *config.json* file, 
+    see :func:`.current_config`.
+    '''
+    return int(config_value_checked(node_probe_blocks_))
+
+
+def node_probe_timeout_sec():
+    '''The time limit for the local node to get ready, in seconds.
+
+    See :func:`.core.teos.node_probe`. It may be changed with 
+    *NODE_PROBE_TIMEOUT_SEC* entry in the *config.json* file, 
+    see :func:`.current_config`.
+    '''
+    return float(config_value_checked(node_probe_timeout_sec_))
+
+
+def node_p2p_address():
+    '''The address where the local node listens for peers, if set.
+
+    Nodes running side by side, see :mod:`.core.node_pool`, listen at
+    different addresses. It may be changed with *LOCAL_NODE_P2P_ADDRESS*
+    entry in the *config.json* file, see :func:`.current_config`.
+    '''
+    return config_value(node_p2p_address_)
+
+
+def node_file_prefix():
+    '''The prefix of the wallet files of the local node, if set.
+
+    See :func:`.core.setup.set_nodeos_address`. It may be changed with
+    *LOCAL_NODE_FILE_PREFIX* entry in the *config.json* file, 
+    see :func:`.current_config`.
+    '''
+    return config_value(node_file_prefix_)
+
+
 def http_server_address():
     '''The http/https URL where local *nodeos* is running.
 
@@ -546,10 +670,14 @@ def eosio_cpp_dir():
     *EOSIO_CPP* entry in the *config.json* file, 
     see :func:`.current_config`.
     '''
-    eosio_cpp_version = utils.spawn(
-            [eosio_cpp(), "-version"],
+    executable = eosio_cpp()
+    eosio_cpp_version = resolved(
+        eosio_cpp_dir_[0] + " -version", 
+        (config_stamp(), file_stamp(executable)), 
+        lambda: utils.spawn(
+            [executable, "-version"],
     "Cannot determine the version of the installed 'eosio.cpp' pckage."
-        ).replace("eosio-cpp version ", "")
+        ).replace("eosio-cpp version ", ""))
 
     version_pattern = re.compile(".+/eosio\.cdt/(\d\.\d\.\d)/$")
     dir = eosio_cpp_dir_[1][0]    
@@ -609,24 +737,36 @@ def config_file():
     return file
 
 
+def config_stamp():
+    '''Return a token that changes whenever the *config.json* file changes.
+    '''
+    return file_stamp(config_file())
+
+
 def config_map():
     '''Return a JSON object read from the *config.json* file.
 
+    The file is parsed anew only if it has changed since the last call.
+
     Raises:
         .core.errors.Error: If the JSON object cannot be returned.
     '''
+    global __config_map
     path = config_file()
     if os.path.exists(path):
+        stamp = file_stamp(path)
+        if __config_map and __config_map[0] == stamp:
+            return dict(__config_map[1])
         try:
             with open(path, "r") as input:
                 text = input.read()
-                if not text:
-                    return {}
-                else:
-                    return json.loads(text)
+                map = json.loads(text) if text else {}
         except Exception as e:
             raise errors.Error(str(e), translate=False)
 
+        __config_map = (stamp, map)
+        return dict(map)
+
     raise errors.Error('''
 Cannot find the config file.       
     ''', translate=False)
@@ -645,6 +785,7 @@ def write_config_map(map):
     if os.path.exists(path):
         with open(path, "w+") as output:
             output.write(json.dumps(map, indent=4))
+        clear_cache()
         return
 
     raise errors.Error('''
@@ -655,7 +796,9 @@ Cannot find the config file.
 def config_values(config_list):
     '''List values ascribed to the key of a hard-codded configuration list.
 
-    First, consider the *config.json*, next the values of the hard-codded 
+    First, consider the environment variable named as the key prefixed with
+    :attr:`ENVIRONMENT_PREFIX`, for example *EOSFACTORY_LOCAL_NODE_ADDRESS*,
+    next the *config.json*, next the values of the hard-codded 
     configuration list.
 
     Args:
@@ -664,7 +807,13 @@ def config_values(config_list):
     config_key = config_list[0]
 
     retval = []
-    # First, configure file ...
+    # First, environment ...
+    environment_value = os.environ.get(ENVIRONMENT_PREFIX + config_key)
+    if environment_value:
+        retval.append(environment_value)
+        return retval
+
+    # ... next, configure file ...
     config_json = config_map()
     if config_key in config_json and config_json[config_key]:
         retval.append(config_json[config_key])
@@ -724,20 +873,39 @@ def first_valid_which(config_list, find_file=None, raise_error=True):
         find_file (str): If set, the given file has to exist.
         raise_error (bool): If set, raise an error on failure.
         
+    The result is cached until either the *config.json* file, or the
+    environment variable overriding it, see :func:`config_values`, or the 
+    executable found changes, see :func:`.resolved_environment`.
+
     Raises:
         .core.errors.Error: If the *raise_error* argument is set and the \
             result is not defined.            
     '''
-    values = config_values(config_list)
-    if values[0]:
-        for path in values:
-            if os.path.isabs(path):
-                if find_file:
-                    if os.path.exists(os.path.join(path, find_file)):
+    def which():
+        values = config_values(config_list)
+        if values[0]:
+            for path in values:
+                if os.path.isabs(path):
+                    if find_file:
+                        if os.path.exists(os.path.join(path, find_file)):
+                            return path
+                else:
+                    if utils.which(path):
                         return path
-            else:
-                if utils.which(path):
-                    return path
+
+    key = config_list[0] if not find_file \
+                                    else config_list[0] + " " + find_file
+    stamp = (
+        config_stamp(), os.environ.get(ENVIRONMENT_PREFIX + config_list[0]))
+    if key in __resolved and __resolved[key][0][0] == stamp \
+            and __resolved[key][0][1] == file_stamp(__resolved[key][1]):
+        path = __resolved[key][1]
+    else:
+        path = which()
+        if path:
+            __resolved[key] = ((stamp, file_stamp(path)), path)
+    if path:
+        return path
 
     if raise_error:
         config_values(config_list)
@@ -1163,6 +1331,10 @@ def current_config(contract_dir=None, dont_set_workspace=False):
         map["TEMPLATE_DIR"] = None    
 
     map[nodeos_stdout_[0]] = nodeos_stdout()
+    map[node_probe_blocks_[0]] = node_probe_blocks()
+    map[node_probe_timeout_sec_[0]] = node_probe_timeout_sec()
+    map[node_p2p_address_[0]] = node_p2p_address()
+    map[node_file_prefix_[0]] = node_file_prefix()
     
     if contract_dir:
         contract_dir = contract_dir(contract_dir)
@@ -1246,7 +1418,7 @@ The current contents of the configuration file is:
 def main():
     '''
     usage: config.py [-h] [--wsl_root] [--dependencies] [--json]
-                    [--workspace WORKSPACE]
+                    [--workspace WORKSPACE] [--cache]
 
     Show the configuration of EOSFactory or set contract workspace.
 
@@ -1257,6 +1429,8 @@ def main():
         --dont_set_workspace    Ignore empty workspace directory.
         --json                  Bare config JSON and exit.
         --workspace WORKSPACE   Set contract workspace and exit.
+        --cache                 Show the cache of the resolved environment 
+                                and exit.
     '''
 
     parser = argparse.ArgumentParser(description='''
@@ -1277,10 +1451,16 @@ def main():
     parser.add_argument(
         "--workspace", help="Set contract workspace and exit.",
         action="store_true")
+    parser.add_argument(
+        "--cache", help="Show the cache of the resolved environment and exit.",
+        action="store_true")
 
     args = parser.parse_args()
     if args.dependencies:
         installation_dependencies()
+    elif args.cache:
+        current_config(dont_set_workspace=True)
+        print(json.dumps(resolved_environment(), sort_keys=True, indent=4))
     elif args.json:
         print(json.dumps(
             current_config(dont_set_workspace=args.dont_set_workspace), 
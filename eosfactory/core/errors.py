@@ -25,6 +25,8 @@ def validate(omittable):
         pass # raise WalletAlreadyExistsError(omittable)
     elif "Error 3120002: Nonexistent wallet" in err_msg:
         raise WalletDoesNotExistError(omittable)
+    elif "Error 3120003:" in err_msg or "Error 3120006:" in err_msg:
+        raise WalletLockedError(err_msg)
     elif "Invalid wallet password" in err_msg:
         raise InvalidPasswordError(omittable)
     elif "Contract is already running this version of code" in err_msg:
@@ -33,6 +35,8 @@ def validate(omittable):
         raise MissingRequiredAuthorityError(err_msg)
     elif "Duplicate transaction" in err_msg:
         raise DuplicateTransactionError(err_msg)
+    elif "Error 3080002:" in err_msg or "Error 3080004:" in err_msg:
+        raise TransactionTooBigError(err_msg)
     
     #######################################################################
     # NOT ERRORS
@@ -104,6 +108,14 @@ class WalletAlreadyExistsError(Error):
             True)
 
 
+class WalletLockedError(Error):
+    '''The wallet is locked, or there is no unlocked wallet.
+    '''
+    def __init__(self, message):
+        Error.__init__(
+            self, message, True)
+
+
 class InvalidPasswordError(Error):
     def __init__(self, wallet):
         self.wallet = wallet
@@ -142,4 +154,11 @@ class MissingRequiredAuthorityError(Error):
 class DuplicateTransactionError(Error):
     def __init__(self, message):
         Error.__init__(
-            self, message, True)
\ No newline at end of file
+            self, message, True)
+
+class TransactionTooBigError(Error):
+    '''Transaction exceeded its NET or CPU usage limit.
+    '''
+    def __init__(self, message):
+        Error.__init__(
+            self, message, True)
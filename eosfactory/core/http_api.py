@@ -0,0 +1,324 @@
+import json
+import gzip
+import time
+import socket
+import threading
+import http.client
+import urllib.parse
+
+import eosfactory.core.errors as errors
+import eosfactory.core.setup as setup
+import eosfactory.core.metrics as metrics
+import eosfactory.core.cassette as cassette
+import eosfactory.core.cache as cache
+import eosfactory.core.cleos as cleos
+
+
+__connections = threading.local()
+__reconnect_errors = (
+    http.client.RemoteDisconnected, http.client.CannotSendRequest,
+    http.client.BadStatusLine, BrokenPipeError, ConnectionResetError)
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    '''HTTP connection over a unix socket, as *keosd* listens by default.
+
+    Args:
+        path (str): The path to the socket file.
+    '''
+    def __init__(self, path, timeout=30):
+        http.client.HTTPConnection.__init__(self, "localhost", timeout=timeout)
+        self.path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.path)
+
+
+def connection(url):
+    '''Return a persistent connection to the given URL.
+
+    Connections are kept alive and reused, one for each URL and each thread.
+
+    Args:
+        url (str): An address like *http://127.0.0.1:8888*, or 
+            *unix:///home/user/eosio-wallet/keosd.sock*.
+    '''
+    global __connections
+    if not hasattr(__connections, "map"):
+        __connections.map = {}
+
+    if not url in __connections.map:
+        parsed = urllib.parse.urlsplit(url)
+        if parsed.scheme == "unix":
+            conn = UnixHTTPConnection(parsed.path)
+        elif parsed.scheme == "https":
+            conn = http.client.HTTPSConnection(parsed.netloc, timeout=30)
+        else:
+            conn = http.client.HTTPConnection(parsed.netloc, timeout=30)
+        __connections.map[url] = conn
+
+    return __connections.map[url]
+
+
+def close_connections():
+    '''Close all the connections opened by the current thread.
+    '''
+    global __connections
+    if hasattr(__connections, "map"):
+        for conn in __connections.map.values():
+            conn.close()
+        __connections.map = {}
+
+
+def request(url, path, body="", is_gzip=None):
+    '''Send a POST request over a persistent connection.
+
+    Args:
+        url (str): The address of the server.
+        path (str): The endpoint, for example */v1/chain/get_info*.
+        body (str): The request body.
+        is_gzip (bool): If set, ask for a compressed response. If not set,
+            :attr:`.core.setup.is_http_gzip` is assumed.
+
+    Returns:
+        (int, bytes): The HTTP status and the response body.
+    '''
+    if is_gzip is None:
+        is_gzip = setup.is_http_gzip
+
+    headers = {"Content-Type": "application/json", "Connection": "keep-alive"}
+    if is_gzip:
+        headers["Accept-Encoding"] = "gzip"
+
+    parsed = urllib.parse.urlsplit(url)
+    if parsed.scheme != "unix":
+        path = parsed.path.rstrip("/") + path
+
+    conn = connection(url)
+    try:
+        conn.request("POST", path, body, headers)
+        response = conn.getresponse()
+    except __reconnect_errors:
+        # The server has dropped the kept-alive connection, try once again.
+        conn.close()
+        conn.request("POST", path, body, headers)
+        response = conn.getresponse()
+
+    data = response.read()
+    if response.getheader("Content-Encoding", "") == "gzip":
+        data = gzip.decompress(data)
+    if response.getheader("Connection", "").lower() == "close":
+        conn.close()
+
+    return (response.status, data)
+
+
+def error_message(data):
+    '''Render an error response of *nodeos* as *EOSIO cleos* does.
+
+    Args:
+        data (bytes): The body of the error response.
+    '''
+    try:
+        error = json.loads(data.decode("utf-8"))["error"]
+    except:
+        return "Error: {}".format(data.decode("utf-8", "replace"))
+
+    msg = "Error {}: {}\n".format(error["code"], error["what"])
+    details = error.get("details", [])
+    if details:
+        msg = msg + "Error Details:\n"
+        for detail in details:
+            msg = msg + detail["message"] + "\n"
+    return msg
+
+
+def post(url, path, body=""):
+    '''Send a POST request, and render errors as *EOSIO cleos* does.
+
+    The response may be recorded or replayed, see :mod:`.cassette`.
+
+    Args:
+        url (str): The address of the server.
+        path (str): The endpoint, for example */v1/chain/get_info*.
+        body (str): The request body.
+
+    Returns:
+        (json, str, int): The response and the error message, either *None*,
+        and the size of the response body.
+    '''
+    key = cassette.key([url, "POST", path, body])
+    if cassette.is_replaying():
+        data, err_msg = cassette.response(key)
+        return (
+            json.loads(data) if data else None, err_msg if err_msg else None, 
+            len(data))
+
+    data = ""
+    try:
+        status, data = request(url, path, body)
+    except __reconnect_errors as e:
+        err_msg = '''Error: Connection reset by the server at {}
+{}'''.format(url, str(e))
+    except (OSError, http.client.HTTPException) as e:
+        err_msg = '''Error: Failed to connect to nodeos at {}; is nodeos running?
+{}'''.format(url, str(e))
+    else:
+        if status == 200:
+            data = data.decode("utf-8")
+            err_msg = None
+        else:
+            err_msg = error_message(data)
+            data = ""
+
+    if cassette.is_recording():
+        cassette.add(key, data, err_msg if err_msg else "")
+    return (json.loads(data) if data else None, err_msg, len(data))
+
+
+class ChainApi(cleos.Cleos):
+    '''A prototype for native *nodeos* HTTP API calls.
+
+    Calls the *nodeos* HTTP endpoint in-process, over a persistent connection,
+    instead of spawning *EOSIO cleos*, and processes the responce.
+
+    Args:
+        endpoint (str): Endpoint name, for example *get_info*.
+        params (dict): The request body, if any.
+        is_verbose (bool): If *False* do not print. Default is *True*.
+        api (str): The API group name, *chain*, *history* or *wallet*. 
+            Default is *chain*.
+        url (str): The address of the server. If not set, the address of 
+            *nodeos* is assumed, see :func:`.core.setup.nodeos_address`.
+        is_cached (bool): If *False*, the responce is not taken from the
+            cache, see :mod:`.cache`. Default is *True*.
+
+    Attributes:
+        out_msg (str): Responce received, as a formatted JSON.
+        out_msg_details (str): Not used, for compatibility with the *Cleos*
+            class.
+        err_msg (str): Error message, formatted like the *EOSIO cleos* does.
+        json (json): Responce received as JSON.
+        is_verbose (bool): If set, a message is printed.
+        args (dict): Value of the *params* argument.
+
+    Raises:
+        .core.errors.Error: If err_msg.
+    '''
+    def __init__(
+            self, endpoint, params=None, is_verbose=True, api="chain",
+            url=None, is_cached=True):
+        self.out_msg = None
+        self.out_msg_details = None
+        self.err_msg = None
+        self.json = {}
+        self.is_verbose = is_verbose
+        self.is_duplicate = False
+        self.args = params
+
+        if url is None:
+            cleos.set_local_nodeos_address_if_none()
+            url = setup.nodeos_address()
+        path = "/v1/{}/{}".format(api, endpoint)
+        body = json.dumps(params) if params else ""
+
+        if setup.is_print_command_line:
+            print("######## request sent to nodeos:")
+            print(url + path)
+            print(body)
+            print("")
+
+        command = api + " " + endpoint
+        start_time = time.time()
+        spawn_time = 0
+        stdout_bytes = 0
+        attempt = 0
+        cached = cache.get(command, params) if is_cached else None
+        while True:
+            spawn_start_time = time.time()
+            if cached:
+                # Parsed anew, as the callers may modify the JSON.
+                json_, self.err_msg, size = (
+                    json.loads(cached[0]) if cached[0] else None,
+                    cached[1], cached[2])
+            else:
+                json_, self.err_msg, size = post(url, path, body)
+            spawn_time = spawn_time + time.time() - spawn_start_time
+            stdout_bytes = stdout_bytes + size
+
+            delay = self.retry_delay(attempt, start_time)
+            if delay is None:
+                break
+            cleos.count_retry(command)
+            time.sleep(delay)
+            attempt = attempt + 1
+
+        parse_start_time = time.time()
+        try:
+            if json_ is not None:
+                self.json = json_
+                self.out_msg = json.dumps(self.json, indent=4)
+
+            errors.validate(self)
+            if not cached and not self.err_msg:
+                cache.put(
+                    command, params, (self.out_msg, self.err_msg, size), json_)
+            cache.after_write(command, self)
+        finally:
+            if setup.is_metrics:
+                metrics.record(
+                    command, time.time() - start_time, spawn_time,
+                    time.time() - parse_start_time,
+                    stdout_bytes, 0, bool(self.err_msg))
+
+        if setup.is_print_response:
+            print("######## nodeos response:")
+            print(self.out_msg)
+
+
+def account_info(account_json):
+    '''Render the *get_account* response as *EOSIO cleos get account* does.
+
+    Args:
+        account_json (json): The response of the *get_account* endpoint.
+    '''
+    out = "created: {}\n".format(account_json["created"])
+    out = out + "permissions: \n"
+
+    permissions = account_json["permissions"]
+    def print_permission(parent, indent):
+        for permission in permissions:
+            if permission["parent"] == parent:
+                auth = permission["required_auth"]
+                line = " " * indent + "{} {:>5}:    ".format(
+                    permission["perm_name"], auth["threshold"])
+                for key in auth["keys"]:
+                    line = line + "{} {}, ".format(key["weight"], key["key"])
+                for account in auth["accounts"]:
+                    line = line + "{} {}@{}, ".format(
+                        account["weight"], account["permission"]["actor"],
+                        account["permission"]["permission"])
+                out_lines.append(line.rstrip(", "))
+                print_permission(permission["perm_name"], indent + 3)
+
+    out_lines = []
+    print_permission("", 5)
+    out = out + "\n".join(out_lines) + "\n"
+
+    out = out + "memory: \n     quota: {:>15}  used: {:>15}\n\n".format(
+        account_json["ram_quota"], account_json["ram_usage"])
+
+    for name, limit in [
+            ("net bandwidth", "net_limit"), ("cpu bandwidth", "cpu_limit")]:
+        limit = account_json[limit]
+        out = out + "{}: \n     used: {:>15}\n     available: {:>10}\n" \
+            "     limit: {:>14}\n\n".format(
+                name, limit["used"], limit["available"], limit["max"])
+
+    if "core_liquid_balance" in account_json:
+        out = out + "EOS balances: \n     liquid: {:>18}\n".format(
+            account_json["core_liquid_balance"])
+
+    return out
@@ -13,6 +13,11 @@ import eosfactory.core.setup as setup
 import eosfactory.core.teos as teos
 import eosfactory.core.cleos as cleos
 import eosfactory.core.cleos_get as cleos_get
+import eosfactory.core.cassette as cassette
+import eosfactory.core.transaction as transaction
+import eosfactory.core.abi as abi
+import eosfactory.core.cache as cache
+import eosfactory.core.block_store as block_store
 
 
 def reboot():
@@ -88,11 +93,17 @@ def object_names_2_accout_names(sentence):
 
 
 def stop_keosd():
-    cleos.WalletStop(is_verbose=False)
+    '''Stop *keosd* serving the wallet directory, see :func:`.teos.keosd_stop`.
+    '''
+    teos.keosd_stop()
 
 
 def kill_keosd():
-    os.system("pkill keosd")
+    '''Stop *keosd* serving the wallet directory, see :func:`.teos.keosd_stop`.
+    '''
+    if cassette.is_replaying():
+        return
+    teos.keosd_stop()
 
 
 class Transaction():
@@ -119,6 +130,12 @@ def is_local_testnet():
 
 
 def node_start(clear=False, nodeos_stdout=None):
+    if cassette.is_replaying():
+        logger.INFO('''
+        Replaying the cassette, the local node is not started.
+        ''')
+        return
+
     try:
         teos.node_start(clear, nodeos_stdout)
         teos.node_probe()
@@ -130,9 +147,12 @@ def node_start(clear=False, nodeos_stdout=None):
             teos.on_nodeos_error(clear)
 
 
-def reset(nodeos_stdout=None):
+def reset(nodeos_stdout=None, checkpoint=None):
     ''' Start clean the local EOSIO node.
 
+    If the *checkpoint* argument is set, the node is not started clean, but
+    restored to the named checkpoint, see :mod:`.core.checkpoint`.
+
     The procedure addresses problems with instabilities of EOSIO *nodeos* 
     executable: it happens that it blocks itself on clean restart. 
 
@@ -175,8 +195,13 @@ def reset(nodeos_stdout=None):
             the configuration of EOSFactory, see :func:`.core.config.nodeos_stdout`.
             If the file is set with the configuration, and in the same time 
             it is set with this argument, the argument setting prevails. 
+        checkpoint (str): If set, the name of a checkpoint to restore.
+
+    Raises:
+        .core.errors.Error: If the checkpoint does not exist.
     '''
     import eosfactory.shell.account as account
+    import eosfactory.core.checkpoint as checkpoint_
     account.reboot()
 
     if not cleos.set_local_nodeos_address_if_none():
@@ -184,8 +209,22 @@ def reset(nodeos_stdout=None):
         No local nodeos is set: {}
         '''.format(setup.nodeos_address()))
 
+    if checkpoint and not checkpoint_.exists(checkpoint):
+        raise errors.Error('''
+        There is no checkpoint ``{}``.
+        '''.format(checkpoint), translate=False)
+
     clear_testnet_cache()
-    node_start(clear=True, nodeos_stdout=nodeos_stdout)
+    transaction.clear_cache()
+    abi.invalidate()
+    cache.clear()
+    block_store.clear(setup.nodeos_address())
+    if checkpoint:
+        teos.node_stop()
+        checkpoint_.restore(checkpoint)
+        node_start(nodeos_stdout=nodeos_stdout)
+    else:
+        node_start(clear=True, nodeos_stdout=nodeos_stdout)
 
 
 def resume(nodeos_stdout=None):
@@ -210,6 +249,8 @@ def resume(nodeos_stdout=None):
 def stop():
     ''' Stops all running EOSIO nodes.
     '''
+    if cassette.is_replaying():
+        return
     teos.node_stop()
 
 
@@ -0,0 +1,213 @@
+import json
+import atexit
+import threading
+
+import eosfactory.core.setup as setup
+
+
+BUCKETS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10]
+'''Upper bounds of the wall-time histogram buckets, in seconds.
+'''
+
+__registry = {}
+__lock = threading.Lock()
+
+
+def enable(is_enabled=True):
+    '''Start, or stop, recording the metrics of commands.
+
+    Equivalent to setting :attr:`.core.setup.is_metrics`.
+    '''
+    setup.is_metrics = is_enabled
+
+
+class CommandMetrics():
+    '''Metrics of a command.
+
+    Attributes:
+        count (int): The number of calls.
+        errors (int): The number of calls that have failed.
+        retries (int): The number of repetitions, see
+            :class:`.cleos.RetryPolicy`.
+        wall_time (float): The total duration of the calls, in seconds.
+        spawn_time (float): The part of *wall_time* spent waiting for
+            *EOSIO cleos* or *nodeos*.
+        parse_time (float): The part of *wall_time* spent processing the
+            responces.
+        stdout_bytes (int): The total size of the responces.
+        stderr_bytes (int): The total size of the messages received via the
+            stderr stream.
+        buckets (list): The wall-time histogram: the number of calls not
+            longer than the corresponding :attr:`BUCKETS` limit, not
+            cumulative.
+    '''
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.retries = 0
+        self.wall_time = 0.0
+        self.spawn_time = 0.0
+        self.parse_time = 0.0
+        self.stdout_bytes = 0
+        self.stderr_bytes = 0
+        self.buckets = [0] * (len(BUCKETS) + 1)
+
+    def observe(
+            self, wall_time, spawn_time, parse_time,
+            stdout_bytes, stderr_bytes, is_error):
+        self.count = self.count + 1
+        if is_error:
+            self.errors = self.errors + 1
+        self.wall_time = self.wall_time + wall_time
+        self.spawn_time = self.spawn_time + spawn_time
+        self.parse_time = self.parse_time + parse_time
+        self.stdout_bytes = self.stdout_bytes + stdout_bytes
+        self.stderr_bytes = self.stderr_bytes + stderr_bytes
+
+        i = 0
+        while i < len(BUCKETS) and wall_time > BUCKETS[i]:
+            i = i + 1
+        self.buckets[i] = self.buckets[i] + 1
+
+    def to_json(self):
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "retries": self.retries,
+            "wall_time": self.wall_time,
+            "spawn_time": self.spawn_time,
+            "parse_time": self.parse_time,
+            "stdout_bytes": self.stdout_bytes,
+            "stderr_bytes": self.stderr_bytes,
+            "histogram": dict(zip(
+                [str(bucket) for bucket in BUCKETS] + ["+Inf"], self.buckets))
+        }
+
+
+def command_metrics(command):
+    global __registry
+    if not command in __registry:
+        __registry[command] = CommandMetrics()
+    return __registry[command]
+
+
+def record(
+        command, wall_time, spawn_time, parse_time,
+        stdout_bytes, stderr_bytes, is_error):
+    '''Record a call of a command.
+
+    Args:
+        command (str): The command, for example *push action*.
+        wall_time (float): The duration of the call, in seconds.
+        spawn_time (float): The part of *wall_time* spent waiting for
+            *EOSIO cleos* or *nodeos*.
+        parse_time (float): The part of *wall_time* spent processing the
+            responce.
+        stdout_bytes (int): The size of the responce.
+        stderr_bytes (int): The size of the stderr stream.
+        is_error (bool): Whether the call has failed.
+    '''
+    with __lock:
+        command_metrics(command).observe(
+            wall_time, spawn_time, parse_time,
+            stdout_bytes, stderr_bytes, is_error)
+
+
+def record_retry(command):
+    '''Record a repetition of a command.
+
+    Args:
+        command (str): The command, for example *push action*.
+    '''
+    with __lock:
+        values = command_metrics(command)
+        values.retries = values.retries + 1
+
+
+def metrics():
+    '''The metrics recorded.
+
+    Returns:
+        dict: Dictionary {<command>: <metrics>}, see
+        :class:`CommandMetrics` for the fields of *<metrics>*.
+    '''
+    with __lock:
+        return {
+            command: values.to_json()
+                for command, values in __registry.items()}
+
+
+def clear():
+    '''Discard the metrics recorded.
+    '''
+    with __lock:
+        __registry.clear()
+
+
+def to_prometheus():
+    '''Render the metrics recorded in the Prometheus text format.
+    '''
+    counters = [
+        ("calls_total", "count", "Number of calls."),
+        ("errors_total", "errors", "Number of failed calls."),
+        ("retries_total", "retries", "Number of repetitions."),
+        ("spawn_seconds_total", "spawn_time",
+            "Time spent waiting for cleos or nodeos."),
+        ("parse_seconds_total", "parse_time",
+            "Time spent processing responces."),
+        ("stdout_bytes_total", "stdout_bytes", "Size of responces."),
+        ("stderr_bytes_total", "stderr_bytes", "Size of stderr streams."),
+    ]
+    metrics_ = metrics()
+    lines = []
+
+    for name, field, help in counters:
+        name = "eosfactory_command_" + name
+        lines.append("# HELP {} {}".format(name, help))
+        lines.append("# TYPE {} counter".format(name))
+        for command, values in sorted(metrics_.items()):
+            lines.append('{}{{command="{}"}} {}'.format(
+                name, command, values[field]))
+
+    name = "eosfactory_command_seconds"
+    lines.append("# HELP {} Duration of calls.".format(name))
+    lines.append("# TYPE {} histogram".format(name))
+    for command, values in sorted(metrics_.items()):
+        cumulative = 0
+        for bucket in [str(bucket) for bucket in BUCKETS] + ["+Inf"]:
+            cumulative = cumulative + values["histogram"][bucket]
+            lines.append('{}_bucket{{command="{}",le="{}"}} {}'.format(
+                name, command, bucket, cumulative))
+        lines.append('{}_sum{{command="{}"}} {}'.format(
+            name, command, values["wall_time"]))
+        lines.append('{}_count{{command="{}"}} {}'.format(
+            name, command, values["count"]))
+
+    return "\n".join(lines) + "\n"
+
+
+def dump(path, format=None):
+    '''Write the metrics recorded to a file.
+
+    Args:
+        path (str): The file.
+        format (str): Either *json* or *prometheus*. If not set, *prometheus*
+            is assumed if the file extension is *.prom*, *json* otherwise.
+    '''
+    if format is None:
+        format = "prometheus" if path.endswith(".prom") else "json"
+
+    with open(path, "w") as f:
+        if format == "prometheus":
+            f.write(to_prometheus())
+        else:
+            json.dump(metrics(), f, indent=4)
+
+
+def dump_at_exit(path, format=None):
+    '''Enable recording, and write the metrics to a file at exit.
+
+    See :func:`dump` for the arguments.
+    '''
+    enable()
+    atexit.register(dump, path, format)
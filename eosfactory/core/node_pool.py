@@ -0,0 +1,218 @@
+'''A pool of local nodes, running side by side, and a parallel test runner.
+
+The local node is configured with :mod:`.core.config`, and a process knows
+one local node. A :class:`Node` object of the pool is a set of
+configuration entries, set with environment variables, see
+:func:`.core.config.config_values`: the node serves at its own HTTP and
+peer-to-peer ports, keeps its blocks and state in its own directory, and it
+has its own wallet directory, hence its own *keosd*, see
+:func:`.core.teos.keosd_start`. Also, its wallet files have their own
+prefix, see :func:`.core.setup.file_prefix`.
+
+The ports of the nodes, by default, see :attr:`HTTP_PORT` and
+:attr:`P2P_PORT`, are the EOSIO defaults, 8888 and 9876, shifted by 10000,
+so that they collide with neither a local node, nor a *keosd* listening to
+its default HTTP port, 8900.
+
+A :class:`NodePool` object runs test scripts in parallel, each with one of
+its nodes: a worker process is started per node, it prepares the directories
+of the node, and runs the scripts, one after another, as they are assigned
+to it, with the environment of the node. The node is not started by the
+worker: the scripts see it as the local node, and start it, for example, they
+reset it, see :func:`.core.manager.reset`, with no interference with the
+other nodes.
+
+See :mod:`eosfactory.run_tests`.
+'''
+
+import os
+import sys
+import time
+import shutil
+import subprocess
+import multiprocessing
+
+import eosfactory.core.config as config
+import eosfactory.core.setup as setup
+
+
+POOL_DIR = "pool"
+HTTP_PORT = 18888
+P2P_PORT = 19876
+'''The ports of the first node of the pool, the following ones are next.
+'''
+HOST = "127.0.0.1"
+
+
+class Node():
+    '''A node of the pool.
+
+    Args:
+        index (int): The index of the node in the pool.
+        http_port (int): The HTTP port of the first node of the pool.
+        p2p_port (int): The peer-to-peer port of the first node of the pool.
+
+    Attributes:
+        address (str): The HTTP address of the node.
+        p2p_address (str): The peer-to-peer address of the node.
+        directory (str): The directory of the node, with its data, its
+            configuration, its wallets, and the output of the scripts run.
+        file_prefix (str): The prefix of the wallet files of the node.
+    '''
+    def __init__(self, index, http_port=HTTP_PORT, p2p_port=P2P_PORT):
+        self.index = index
+        self.address = "{}:{}".format(HOST, http_port + index)
+        self.p2p_address = "{}:{}".format(HOST, p2p_port + index)
+        self.directory = os.path.join(
+            config.get_app_data_dir(), POOL_DIR, str(index))
+        self.file_prefix = "{}{}".format(POOL_DIR, index)
+
+    def environment(self):
+        '''The configuration of the node, as environment variables.
+        '''
+        entries = {
+            config.node_address_[0]: self.address,
+            config.node_p2p_address_[0]: self.p2p_address,
+            config.node_file_prefix_[0]: self.file_prefix,
+            config.data_dir_[0]: os.path.join(self.directory, "data") + os.sep,
+            config.config_dir_[0]:
+                os.path.join(self.directory, "config") + os.sep,
+            config.keosd_wallet_dir_[0]:
+                os.path.join(self.directory, "wallet") + os.sep,
+            config.nodeos_stdout_[0]:
+                os.path.join(self.directory, "nodeos.log")
+        }
+        environment = dict(os.environ)
+        for key, value in entries.items():
+            environment[config.ENVIRONMENT_PREFIX + key] = value
+        return environment
+
+    def prepare(self):
+        '''Make the directories of the node, and make the current process see
+        the node as the local one. The node is not started.
+        '''
+        config_ini = os.path.join(config.nodeos_config_dir(), "config.ini")
+        for dir in ["data", "config", "wallet"]:
+            os.makedirs(os.path.join(self.directory, dir), exist_ok=True)
+        if os.path.exists(config_ini):
+            shutil.copy(config_ini, os.path.join(self.directory, "config"))
+
+        os.environ.update(self.environment())
+        config.clear_cache()
+        setup.reboot()
+
+    def stop(self):
+        '''Stop the node and its *keosd*, if the scripts have left them
+        running.
+        '''
+        import eosfactory.core.teos as teos
+        teos.node_stop()
+        teos.keosd_stop()
+
+    def run(self, script):
+        '''Run a script with the node.
+
+        Returns:
+            tuple: (<script>, <exit code>, <duration in seconds>, <output
+            file>).
+        '''
+        output = os.path.join(
+            self.directory,
+            os.path.splitext(os.path.basename(script))[0] + ".log")
+        start_time = time.time()
+        with open(output, "w") as f:
+            returncode = subprocess.run(
+                [sys.executable, script], stdin=subprocess.DEVNULL, stdout=f,
+                stderr=subprocess.STDOUT, env=self.environment()).returncode
+        return (script, returncode, time.time() - start_time, output)
+
+    def __str__(self):
+        return "node {} at {}".format(self.index, self.address)
+
+
+def worker(node, scripts, results):
+    '''The worker process of a node: runs the scripts from a queue, until
+    *None*.
+    '''
+    try:
+        node.prepare()
+    except Exception as e:
+        results.put((node.index, None, str(e)))
+        return
+
+    try:
+        while True:
+            script = scripts.get()
+            if script is None:
+                break
+            results.put((node.index, node.run(script), None))
+    finally:
+        node.stop()
+        results.put((node.index, None, None))
+
+
+class NodePool():
+    '''A pool of local nodes, running test scripts in parallel.
+
+    Args:
+        size (int): The number of nodes.
+        http_port (int): The HTTP port of the first node. Default is
+            :attr:`HTTP_PORT`.
+        p2p_port (int): The peer-to-peer port of the first node. Default is
+            :attr:`P2P_PORT`.
+
+    Attributes:
+        nodes (list): The :class:`Node` objects.
+    '''
+    def __init__(self, size, http_port=HTTP_PORT, p2p_port=P2P_PORT):
+        self.nodes = [Node(i, http_port, p2p_port) for i in range(size)]
+
+    def run(self, scripts, on_result=None):
+        '''Run scripts, each with the node that is free first.
+
+        Args:
+            scripts (list): The paths of the scripts.
+            on_result: If set, a function called with each result, as it
+                comes, see :meth:`Node.run`.
+
+        Returns:
+            list: The results, see :meth:`Node.run`, in the order of the
+            *scripts* argument. The exit code is *None* if the script has
+            not run, because its node has failed to be prepared.
+        '''
+        context = multiprocessing.get_context("spawn")
+        script_queue = context.Queue()
+        result_queue = context.Queue()
+        for script in scripts:
+            script_queue.put(script)
+        for _ in self.nodes:
+            script_queue.put(None)
+
+        processes = [
+            context.Process(
+                target=worker, args=(node, script_queue, result_queue))
+                    for node in self.nodes]
+        for process in processes:
+            process.start()
+
+        results = {}
+        running = len(processes)
+        try:
+            while running:
+                index, result, error = result_queue.get()
+                if result:
+                    results[result[0]] = result
+                    if on_result:
+                        on_result(result)
+                    continue
+                running = running - 1
+                if error:
+                    print("ERROR: {} failed to be prepared:\n{}".format(
+                        self.nodes[index], error))
+        finally:
+            for process in processes:
+                process.join()
+
+        return [
+            results.get(script, (script, None, 0, None))
+                for script in scripts]
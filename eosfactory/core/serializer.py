@@ -0,0 +1,406 @@
+import struct
+import calendar
+import datetime
+
+import eosfactory.core.errors as errors
+
+
+BASE58_ALPHABET = \
+    "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+BLOCK_TIMESTAMP_EPOCH_MS = 946684800000
+
+
+def pack_uint8(value):
+    return struct.pack("<B", value)
+
+
+def pack_uint16(value):
+    return struct.pack("<H", value)
+
+
+def pack_uint32(value):
+    return struct.pack("<I", value)
+
+
+def pack_uint64(value):
+    return struct.pack("<Q", value)
+
+
+def pack_int8(value):
+    return struct.pack("<b", value)
+
+
+def pack_int16(value):
+    return struct.pack("<h", value)
+
+
+def pack_int32(value):
+    return struct.pack("<i", value)
+
+
+def pack_int64(value):
+    return struct.pack("<q", value)
+
+
+def pack_uint128(value):
+    return int(value).to_bytes(16, "little")
+
+
+def pack_int128(value):
+    return int(value).to_bytes(16, "little", signed=True)
+
+
+def pack_float32(value):
+    return struct.pack("<f", float(value))
+
+
+def pack_float64(value):
+    return struct.pack("<d", float(value))
+
+
+def pack_bool(value):
+    if isinstance(value, str):
+        value = value.lower() == "true"
+    return pack_uint8(1 if value else 0)
+
+
+def pack_varuint32(value):
+    '''Pack an integer as LEB128, as EOSIO does for lengths of containers.
+    '''
+    retval = bytearray()
+    while True:
+        byte = value & 0x7f
+        value = value >> 7
+        if value:
+            retval.append(byte | 0x80)
+        else:
+            retval.append(byte)
+            return bytes(retval)
+
+
+def pack_varint32(value):
+    '''Pack a signed integer as zig-zag LEB128.
+    '''
+    return pack_varuint32(((value << 1) ^ (value >> 31)) & 0xffffffff)
+
+
+def pack_bytes(value):
+    '''Pack a byte sequence, prefixed with its length.
+
+    Args:
+        value (bytes or str): The bytes, or their hexadecimal representation.
+    '''
+    if isinstance(value, str):
+        value = bytes.fromhex(value)
+    return pack_varuint32(len(value)) + value
+
+
+def pack_string(value):
+    return pack_bytes(value.encode("utf-8"))
+
+
+def pack_vector(values, pack_value):
+    '''Pack a list, prefixed with its length.
+
+    Args:
+        values (list): The items.
+        pack_value (function): The function packing an item.
+    '''
+    return pack_varuint32(len(values)) \
+        + b"".join([pack_value(value) for value in values])
+
+
+def name_to_int(name):
+    '''Convert an EOSIO name to its *uint64* value.
+
+    Raises:
+        .core.errors.Error: If the name is not valid.
+    '''
+    def char_to_symbol(c):
+        if c >= "a" and c <= "z":
+            return ord(c) - ord("a") + 6
+        if c >= "1" and c <= "5":
+            return ord(c) - ord("1") + 1
+        if c == ".":
+            return 0
+        raise errors.Error('''
+        Invalid character ``{}`` in the EOSIO name ``{}``.
+        '''.format(c, name), translate=False)
+
+    if len(name) > 13:
+        raise errors.Error('''
+        The EOSIO name ``{}`` is longer than 13 characters.
+        '''.format(name), translate=False)
+
+    value = 0
+    for i in range(0, 13):
+        c = char_to_symbol(name[i]) if i < len(name) else 0
+        if i < 12:
+            value = value | (c & 0x1f) << (64 - 5 * (i + 1))
+        else:
+            value = value | (c & 0x0f)
+    return value
+
+
+def int_to_name(value):
+    '''Convert the *uint64* value of an EOSIO name to the name.
+    '''
+    charmap = ".12345abcdefghijklmnopqrstuvwxyz"
+    name = ["."] * 13
+    for i in range(0, 13):
+        c = charmap[value & (0x0f if i == 0 else 0x1f)]
+        name[12 - i] = c
+        value = value >> (4 if i == 0 else 5)
+    return "".join(name).rstrip(".")
+
+
+def pack_name(name):
+    return pack_uint64(name_to_int(name))
+
+
+def base58_decode(value):
+    number = 0
+    for c in value:
+        number = number * 58 + BASE58_ALPHABET.index(c)
+    retval = number.to_bytes((number.bit_length() + 7) // 8, "big")
+    pad = len(value) - len(value.lstrip(BASE58_ALPHABET[0]))
+    return b"\0" * pad + retval
+
+
+def base58_encode(value):
+    '''The inverse of :func:`base58_decode`.
+    '''
+    number = int.from_bytes(value, "big")
+    retval = ""
+    while number:
+        number, digit = divmod(number, 58)
+        retval = BASE58_ALPHABET[digit] + retval
+    pad = len(value) - len(value.lstrip(b"\0"))
+    return BASE58_ALPHABET[0] * pad + retval
+
+
+def pack_checksum(value, size):
+    '''Pack a hash, like *checksum256*, given as a hexadecimal string.
+
+    Args:
+        value (str): The hash.
+        size (int): The size of the hash, in bytes.
+
+    Raises:
+        .core.errors.Error: If the size does not match.
+    '''
+    data = bytes.fromhex(value)
+    if len(data) != size:
+        raise errors.Error('''
+        The checksum ``{}`` is not {} bytes long.
+        '''.format(value, size), translate=False)
+    return data
+
+
+def pack_public_key(key):
+    '''Pack a public key, either legacy *EOS...* or *PUB_K1_...*.
+
+    Raises:
+        .core.errors.Error: If the key is not valid.
+    '''
+    if key.startswith("PUB_K1_"):
+        data = base58_decode(key[7:])
+    elif key.startswith("EOS"):
+        data = base58_decode(key[3:])
+    else:
+        raise errors.Error('''
+        Unsupported public key format: ``{}``.
+        '''.format(key), translate=False)
+
+    if len(data) != 37:
+        raise errors.Error('''
+        Invalid public key: ``{}``.
+        '''.format(key), translate=False)
+    # the key type K1 followed with the key, without the checksum
+    return pack_uint8(0) + data[:33]
+
+
+def pack_signature(signature):
+    '''Pack a signature, *SIG_K1_...*.
+
+    Raises:
+        .core.errors.Error: If the signature is not valid.
+    '''
+    data = base58_decode(signature[7:]) \
+        if signature.startswith("SIG_K1_") else b""
+    if len(data) != 69:
+        raise errors.Error('''
+        Invalid signature: ``{}``.
+        '''.format(signature), translate=False)
+    return pack_uint8(0) + data[:65]
+
+
+def pack_symbol_code(code):
+    '''Pack a symbol code, like *EOS*.
+
+    Raises:
+        .core.errors.Error: If the code is not valid.
+    '''
+    if not code or len(code) > 7 or not code.isalpha() or not code.isupper():
+        raise errors.Error('''
+        Invalid symbol code: ``{}``.
+        '''.format(code), translate=False)
+    return code.encode("ascii").ljust(8, b"\0")
+
+
+def pack_symbol(symbol):
+    '''Pack a symbol, like *4,EOS*.
+    '''
+    precision, code = symbol.split(",")
+    return pack_uint8(int(precision)) + pack_symbol_code(code.strip())[:7]
+
+
+def pack_asset(asset):
+    '''Pack an asset, like *1.0000 EOS*.
+
+    Raises:
+        .core.errors.Error: If the asset is not valid.
+    '''
+    try:
+        amount, code = asset.split()
+        precision = len(amount.split(".")[1]) if "." in amount else 0
+        amount = int(amount.replace(".", ""))
+    except ValueError:
+        raise errors.Error('''
+        Invalid asset: ``{}``.
+        '''.format(asset), translate=False)
+    return pack_int64(amount) + pack_symbol("{},{}".format(precision, code))
+
+
+def pack_extended_asset(extended_asset):
+    '''Pack an extended asset, like 
+    *{"quantity": "1.0000 EOS", "contract": "eosio.token"}*.
+    '''
+    return pack_asset(extended_asset["quantity"]) \
+        + pack_name(extended_asset["contract"])
+
+
+def time_point_sec(value):
+    '''Convert a time, like *2019-01-01T00:00:00.000*, to epoch seconds.
+    '''
+    return calendar.timegm(datetime.datetime.strptime(
+        value.split(".")[0], "%Y-%m-%dT%H:%M:%S").timetuple())
+
+
+def time_point_sec_string(seconds):
+    '''Convert epoch seconds to a time string, like *2019-01-01T00:00:00*.
+    '''
+    return datetime.datetime.utcfromtimestamp(seconds).strftime(
+        "%Y-%m-%dT%H:%M:%S")
+
+
+def time_point(value):
+    '''Convert a time, like *2019-01-01T00:00:00.500*, to epoch microseconds.
+    '''
+    fraction = value.split(".")[1] if "." in value else ""
+    return time_point_sec(value) * 1000000 \
+        + int((fraction + "000000")[:6])
+
+
+def pack_time_point(value):
+    return pack_int64(time_point(value))
+
+
+def pack_time_point_sec(value):
+    if isinstance(value, str):
+        value = time_point_sec(value)
+    return pack_uint32(value)
+
+
+def pack_block_timestamp(value):
+    '''Pack a time as the number of half-seconds since year 2000.
+    '''
+    return pack_uint32((time_point(value) // 1000 - BLOCK_TIMESTAMP_EPOCH_MS) \
+        // 500)
+
+
+def pack_permission_level(permission_level):
+    return pack_name(permission_level["actor"]) \
+        + pack_name(permission_level["permission"])
+
+
+def pack_authority(authority):
+    '''Pack an authority, for example
+    *{"threshold": 1, "keys": [{"key": "EOS...", "weight": 1}]}*.
+    '''
+    return pack_uint32(authority["threshold"]) \
+        + pack_vector(
+            authority.get("keys", []),
+            lambda key: pack_public_key(key["key"]) \
+                + pack_uint16(key["weight"])) \
+        + pack_vector(
+            authority.get("accounts", []),
+            lambda account: pack_permission_level(account["permission"]) \
+                + pack_uint16(account["weight"])) \
+        + pack_vector(
+            authority.get("waits", []),
+            lambda wait: pack_uint32(wait["wait_sec"]) \
+                + pack_uint16(wait["weight"]))
+
+
+def pack_action(action):
+    '''Pack an action, its *data* component given as a hexadecimal string.
+    '''
+    return pack_name(action["account"]) \
+        + pack_name(action["name"]) \
+        + pack_vector(action["authorization"], pack_permission_level) \
+        + pack_bytes(action["data"])
+
+
+def pack_transaction(transaction):
+    '''Pack a transaction, given as JSON, like *EOSIO nodeos* responds it.
+    '''
+    return pack_uint32(time_point_sec(transaction["expiration"])) \
+        + pack_uint16(transaction["ref_block_num"]) \
+        + pack_uint32(transaction["ref_block_prefix"]) \
+        + pack_varuint32(transaction["max_net_usage_words"]) \
+        + pack_uint8(transaction["max_cpu_usage_ms"]) \
+        + pack_varuint32(transaction["delay_sec"]) \
+        + pack_vector(transaction["context_free_actions"], pack_action) \
+        + pack_vector(transaction["actions"], pack_action) \
+        + pack_vector(
+            transaction["transaction_extensions"],
+            lambda extension: pack_uint16(extension[0]) \
+                + pack_bytes(extension[1]))
+
+
+BUILT_IN_TYPES = {
+    "bool": pack_bool,
+    "int8": lambda value: pack_int8(int(value)),
+    "uint8": lambda value: pack_uint8(int(value)),
+    "int16": lambda value: pack_int16(int(value)),
+    "uint16": lambda value: pack_uint16(int(value)),
+    "int32": lambda value: pack_int32(int(value)),
+    "uint32": lambda value: pack_uint32(int(value)),
+    "int64": lambda value: pack_int64(int(value)),
+    "uint64": lambda value: pack_uint64(int(value)),
+    "int128": pack_int128,
+    "uint128": pack_uint128,
+    "varint32": lambda value: pack_varint32(int(value)),
+    "varuint32": lambda value: pack_varuint32(int(value)),
+    "float32": pack_float32,
+    "float64": pack_float64,
+    "float128": lambda value: pack_checksum(value, 16),
+    "time_point": pack_time_point,
+    "time_point_sec": pack_time_point_sec,
+    "block_timestamp_type": pack_block_timestamp,
+    "name": pack_name,
+    "bytes": pack_bytes,
+    "string": pack_string,
+    "checksum160": lambda value: pack_checksum(value, 20),
+    "checksum256": lambda value: pack_checksum(value, 32),
+    "checksum512": lambda value: pack_checksum(value, 64),
+    "public_key": pack_public_key,
+    "signature": pack_signature,
+    "symbol": pack_symbol,
+    "symbol_code": pack_symbol_code,
+    "asset": pack_asset,
+    "extended_asset": pack_extended_asset,
+}
+'''The packing functions of the types built into the EOSIO ABI serializer.
+'''
@@ -15,6 +15,14 @@ account_map = "accounts.json"
 password_map = "passwords.json"
 wallet_default_name = "default"
 is_local_address = False
+is_native_http = False
+is_http_gzip = False
+is_native_push = False
+is_native_wallet = False
+is_metrics = False
+is_cache = False
+is_block_store = False
+is_node_restarted = False
 
 __nodeos_address = None
 __file_prefix = None
@@ -0,0 +1,220 @@
+'''Supervision of the local EOSIO processes.
+
+A :class:`Supervisor` object owns the *Popen* handle of a process that it
+starts directly, with no shell. Hence, it stops the process with *SIGINT*,
+and *SIGKILL* if needed, and reaps it, in milliseconds rather than seconds,
+with no zombie processes left. A watching thread detects a crash as soon as
+it happens, and, if so configured, restarts the process.
+
+The local node, see :func:`.core.teos.node_start`, is supervised with a
+:class:`NodeSupervisor` object, see :func:`.core.teos.node_supervisor`.
+'''
+
+import os
+import time
+import signal
+import subprocess
+import threading
+
+import eosfactory.core.errors as errors
+import eosfactory.core.logger as logger
+
+
+STOP_TIMEOUT_SEC = 10
+'''How long a process may take to exit after *SIGINT*, before *SIGKILL*.
+'''
+MAX_RESTARTS = 3
+
+
+class Supervisor():
+    '''A supervised process.
+
+    Args:
+        args (list): The command line, the executable first.
+        name (str): The name of the process, for messages.
+        stdout (str): If set, a file where the *stdout* stream of the process
+            is send. The file is truncated when the process is started, and
+            appended to when it is restarted.
+        is_restarted (bool): If set, the process is restarted if it crashes,
+            at most *max_restarts* times.
+        max_restarts (int): Default is :attr:`MAX_RESTARTS`.
+        restart_args (list): The command line of a restart. Default is
+            *args*.
+
+    Attributes:
+        process (subprocess.Popen): The process.
+        start_time (float): The time when the process has been started.
+        restarts (int): The number of restarts after crashes.
+        exit_code (int): The exit code of the last process crashed, if any.
+    '''
+    def __init__(
+            self, args, name=None, stdout=None, is_restarted=False,
+            max_restarts=MAX_RESTARTS, restart_args=None):
+        self.args = args
+        self.name = name if name else os.path.basename(args[0])
+        self.stdout = stdout
+        self.is_restarted = is_restarted
+        self.max_restarts = max_restarts
+        self.restart_args = restart_args if restart_args else args
+        self.process = None
+        self.start_time = None
+        self.restarts = 0
+        self.exit_code = None
+        self.is_stopping = False
+        self.lock = threading.RLock()
+
+    def start(self, args=None, mode="w"):
+        '''Start the process.
+
+        Raises:
+            .core.errors.Error: If the process cannot be started.
+        '''
+        stdout = subprocess.DEVNULL
+        try:
+            if self.stdout:
+                stdout = open(self.stdout, mode)
+            with self.lock:
+                self.process = subprocess.Popen(
+                    args if args else self.args,
+                    stdin=subprocess.DEVNULL, stdout=stdout,
+                    stderr=subprocess.DEVNULL)
+                self.start_time = time.time()
+                self.is_stopping = False
+        except OSError as e:
+            raise errors.Error('''
+            Cannot start ``{}``.
+            Error message is
+            {}
+            '''.format(self.name, str(e)), translate=False)
+        finally:
+            if not stdout == subprocess.DEVNULL:
+                # The process has got its copy of the handle.
+                stdout.close()
+
+        threading.Thread(
+            target=self.watch, args=(self.process,), daemon=True).start()
+        return self
+
+    def watch(self, process):
+        '''Wait for the process to exit. If it crashes, restart it, or report.
+        '''
+        process.wait()
+        with self.lock:
+            if not process is self.process or self.is_stopping:
+                return
+            self.exit_code = process.returncode
+            if self.is_restarted and self.restarts < self.max_restarts:
+                self.restarts = self.restarts + 1
+                logger.INFO('''
+                ``{}`` has exited with the code {}. Restarting.
+                '''.format(self.name, process.returncode), translate=False)
+                try:
+                    self.start(self.restart_args, mode="a")
+                except errors.Error as e:
+                    logger.ERROR(e.message, translate=False)
+                return
+
+        # Not an error if another instance has been running already.
+        logger.INFO('''
+        ``{}`` has exited with the code {}.
+        '''.format(self.name, process.returncode), translate=False)
+
+    def is_running(self):
+        '''Whether the process is running.
+        '''
+        return not self.process is None and self.process.poll() is None
+
+    def pid(self):
+        return self.process.pid if self.process else None
+
+    def stop(self, timeout_sec=STOP_TIMEOUT_SEC):
+        '''Stop the process: send it *SIGINT*, then *SIGKILL* if it does not
+        exit within *timeout_sec*, and reap it.
+
+        Returns:
+            int: The exit code, or *None* if no process has been started.
+        '''
+        with self.lock:
+            self.is_stopping = True
+            process = self.process
+        if process is None:
+            return None
+
+        if process.poll() is None:
+            try:
+                process.send_signal(signal.SIGINT)
+                process.wait(timeout_sec)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+        return process.returncode
+
+    def health(self):
+        '''The state of the process.
+
+        Returns:
+            dict: With the *name*, *pid*, *is_running*, *uptime_sec*,
+            *restarts* and *exit_code* fields.
+        '''
+        with self.lock:
+            is_running = self.is_running()
+            return {
+                "name": self.name,
+                "pid": self.pid(),
+                "is_running": is_running,
+                "uptime_sec": time.time() - self.start_time \
+                    if is_running else 0,
+                "restarts": self.restarts,
+                "exit_code": self.exit_code
+            }
+
+    def __str__(self):
+        return "\n".join([
+            "{}: {}".format(key, value)
+                for key, value in self.health().items()])
+
+
+class NodeSupervisor(Supervisor):
+    '''The supervised local node.
+
+    See the :class:`Supervisor` class. The node is restarted without the
+    options that clear the blockchain.
+    '''
+    def __init__(
+            self, args, stdout=None, is_restarted=False,
+            max_restarts=MAX_RESTARTS):
+        restart_args = []
+        skip = False
+        for arg in args:
+            if skip:
+                skip = False
+                continue
+            if arg == "--delete-all-blocks":
+                continue
+            if arg == "--genesis-json":
+                skip = True
+                continue
+            restart_args.append(arg)
+
+        Supervisor.__init__(
+            self, args, "nodeos", stdout, is_restarted, max_restarts,
+            restart_args)
+
+    def health(self):
+        '''The state of the node.
+
+        Returns:
+            dict: See :meth:`Supervisor.health`, with the *head_block_num*
+            field added, *None* if the node does not respond.
+        '''
+        import eosfactory.core.http_api as http_api
+        retval = Supervisor.health(self)
+        retval["head_block_num"] = None
+        if retval["is_running"]:
+            try:
+                retval["head_block_num"] = int(http_api.ChainApi(
+                    "get_info", is_verbose=False, is_cached=False
+                    ).json["head_block_num"])
+            except Exception:
+                pass
+        return retval
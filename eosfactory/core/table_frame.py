@@ -0,0 +1,267 @@
+'''Columnar snapshots of contract tables, for bulk analysis.
+
+A :class:`TableFrame` object holds the rows of a table as columns: arrays of
+fixed-width numbers, NumPy arrays if NumPy is installed, or arrays of the
+standard *array* module otherwise. Hence, invariants can be checked with
+vectorized reductions, for example::
+
+    accounts = TableFrame(token, "accounts", alice)
+    assert accounts.sum("balance.amount") == 1000000
+
+The columns follow the ABI of the contract, see :mod:`.abi`. Fields of
+nested structs are flattened, named like *<field>.<subfield>*. Numeric fields
+have a column each. Names, symbols and symbol codes are *uint64* values, see
+:func:`.serializer.int_to_name`. Assets have two columns: the *int64*
+*<field>.amount* and the *uint64* *<field>.symbol*. Times are epoch seconds,
+*time_point* microseconds, and *block_timestamp_type* half-seconds since year
+2000. Other fields, like strings or vectors, are lists of their JSON values.
+
+If all the columns are fixed-width, the rows are retrieved binary, and
+unpacked in bulk, with no Python objects made for the rows.
+'''
+
+import array
+import struct
+
+import eosfactory.core.errors as errors
+import eosfactory.core.serializer as serializer
+import eosfactory.core.abi as abi
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+FORMATS = {
+    "bool": "B",
+    "int8": "b",
+    "uint8": "B",
+    "int16": "h",
+    "uint16": "H",
+    "int32": "i",
+    "uint32": "I",
+    "int64": "q",
+    "uint64": "Q",
+    "float32": "f",
+    "float64": "d",
+    "name": "Q",
+    "symbol": "Q",
+    "symbol_code": "Q",
+    "asset": "qQ",
+    "extended_asset": "qQQ",
+    "time_point": "q",
+    "time_point_sec": "I",
+    "block_timestamp_type": "I",
+}
+'''The *struct* formats of the fixed-width ABI types, one item per column.
+'''
+SUBCOLUMNS = {
+    "asset": ["amount", "symbol"],
+    "extended_asset": ["amount", "symbol", "contract"],
+}
+
+
+def columns(abi_, name, type_):
+    '''The columns of a field.
+
+    Args:
+        abi_ (.abi.Abi): The ABI of the contract.
+        name (str): The name of the field, or the prefix of the column names.
+        type_ (str): The ABI type of the field.
+
+    Returns:
+        list: List of (<column name>, <format>, <field path>, <ABI type>,
+        <index>) tuples. The format is *None* if the column is not
+        fixed-width. The index is the position of the column among the
+        columns of a multi-column type, like *asset*.
+    '''
+    resolved = abi_.resolve(type_)
+    if resolved in FORMATS:
+        formats = FORMATS[resolved]
+        if len(formats) == 1:
+            return [(name, formats, [], resolved, 0)]
+        return [
+            (name + "." + SUBCOLUMNS[resolved][i], formats[i], [], resolved, i)
+                for i in range(0, len(formats))]
+
+    if resolved in abi_.structs:
+        struct_ = abi_.structs[resolved]
+        retval = []
+        if struct_.get("base"):
+            retval.extend(columns(abi_, name, struct_["base"]))
+        for field in struct_["fields"]:
+            for column in columns(
+                    abi_, name + "." + field["name"] if name else field["name"],
+                    field["type"]):
+                retval.append((
+                    column[0], column[1], [field["name"]] + column[2],
+                    column[3], column[4]))
+        return retval
+
+    return [(name, None, [], resolved, 0)]
+
+
+def row_type(abi_, table):
+    '''The ABI type of the rows of a table.
+
+    Raises:
+        .core.errors.Error: If the ABI has no such table.
+    '''
+    for table_ in abi_.abi_json.get("tables", []):
+        if table_["name"] == table:
+            return table_["type"]
+    raise errors.Error('''
+    The ABI of ``{}`` has no table ``{}``.
+    '''.format(abi_.account_name, table), translate=False)
+
+
+class TableFrame():
+    '''A snapshot of a contract table, as columns.
+
+    The table is scanned with :func:`.cleos_get.iter_table`.
+
+    Args:
+        account (str or .interface.Account): The account of the contract.
+        table (str): The name of the table.
+        scope (str or .interface.Account): The scope of the table.
+
+    See the definitions of the remaining arguments:
+    :func:`.cleos_get.iter_table`.
+
+    Attributes:
+        account_name (str): The EOSIO name of the contract's account.
+        table (str): The name of the table.
+        column_names (list): The names of the columns, in the order of fields.
+        columns (dict): Dictionary {<column name>: <column>}.
+        is_binary (bool): Whether all the columns are fixed-width, and the
+            rows have been retrieved binary.
+    '''
+    def __init__(
+            self, account, table, scope,
+            lower="", upper="", index="", key_type="", encode_type="",
+            reverse=False, page_size=1000):
+        import eosfactory.core.interface as interface
+        import eosfactory.core.cleos_get as cleos_get
+
+        self.set_layout(interface.account_arg(account), table)
+        self.extend(cleos_get.iter_table(
+            account, table, scope, lower, upper, index, key_type, encode_type,
+            reverse, page_size=page_size, binary=self.is_binary))
+        self.finalize()
+
+    def set_layout(self, account_name, table):
+        self.account_name = account_name
+        self.table = table
+        abi_ = abi.get(account_name)
+        self.layout = columns(abi_, "", row_type(abi_, table))
+        self.column_names = [column[0] for column in self.layout]
+        self.is_binary = all([column[1] for column in self.layout])
+        self.format = "".join([column[1] for column in self.layout]) \
+            if self.is_binary else None
+        self.row_size = struct.calcsize("<" + self.format) \
+            if self.is_binary else 0
+        self.columns = {
+            column[0]: array.array(column[1]) if column[1] else []
+                for column in self.layout}
+
+    def extend(self, rows):
+        '''Append rows, binary if :attr:`is_binary`, JSON otherwise.
+
+        The binary rows are unpacked in bulk, page by page.
+        '''
+        page = []
+        for row in rows:
+            page.append(row)
+            if len(page) >= 1000:
+                self.extend_page(page)
+                page = []
+        self.extend_page(page)
+
+    def extend_page(self, rows):
+        if not rows:
+            return
+
+        if self.is_binary:
+            data = bytes.fromhex("".join(rows))
+            if len(data) != self.row_size * len(rows):
+                raise errors.Error('''
+                The rows of the table ``{}`` do not match its ABI.
+                '''.format(self.table), translate=False)
+            values = struct.unpack("<" + self.format * len(rows), data)
+            width = len(self.layout)
+            for i, name in enumerate(self.column_names):
+                self.columns[name].extend(values[i::width])
+            return
+
+        for row in rows:
+            for name, format, path, type_, index in self.layout:
+                value = row
+                for field in path:
+                    value = value[field]
+                if not format:
+                    self.columns[name].append(value)
+                    continue
+                # Multi-column types are unpacked once, for the first column.
+                if not index:
+                    unpacked = struct.unpack(
+                        "<" + FORMATS[type_],
+                        serializer.BUILT_IN_TYPES[type_](value))
+                self.columns[name].append(unpacked[index])
+
+    def finalize(self):
+        '''Convert the columns to NumPy arrays, if NumPy is installed.
+        '''
+        if numpy is None:
+            return
+        for name, format, _, _, _ in self.layout:
+            if format:
+                column = self.columns[name]
+                self.columns[name] = numpy.frombuffer(column, dtype=format) \
+                    if len(column) else numpy.zeros(0, dtype=format)
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def __len__(self):
+        if not self.column_names:
+            return 0
+        return len(self.columns[self.column_names[0]])
+
+    def sum(self, name):
+        '''The sum of a column.
+        '''
+        column = self.columns[name]
+        if numpy is None or isinstance(column, list):
+            return sum(column)
+        return column.sum()
+
+    def __str__(self):
+        return "{} rows of the table ``{}`` of ``{}``, columns:\n{}".format(
+            len(self), self.table, self.account_name,
+            "\n".join(self.column_names))
+
+
+def from_rows(account, table, rows, is_binary=False):
+    '''Make a :class:`TableFrame` object of given rows.
+
+    Args:
+        account (str or .interface.Account): The account of the contract.
+        table (str): The name of the table.
+        rows (list): The rows, binary or JSON, as *get table* responds them.
+        is_binary (bool): Whether the rows are binary.
+    '''
+    import eosfactory.core.interface as interface
+    frame = TableFrame.__new__(TableFrame)
+    frame.set_layout(interface.account_arg(account), table)
+    if is_binary != frame.is_binary:
+        if is_binary:
+            raise errors.Error('''
+            The table ``{}`` has columns that are not fixed-width, JSON rows
+            are needed.
+            '''.format(table), translate=False)
+        # JSON rows of a fixed-width table
+        frame.is_binary = False
+    frame.extend(rows)
+    frame.finalize()
+    return frame
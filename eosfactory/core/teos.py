@@ -1,6 +1,7 @@
 #!/usr/bin/python3
 
 import os
+import signal
 import subprocess
 import threading
 import time
@@ -18,6 +19,7 @@ import eosfactory.core.utils as utils
 import eosfactory.core.setup as setup
 import eosfactory.core.config as config
 import eosfactory.core.vscode as vscode
+import eosfactory.core.supervisor as supervisor
 
 TEMPLATE_NAME = "CONTRACT_NAME"
 TEMPLATE_HOME = "${HOME}"
@@ -31,6 +33,17 @@ EOSIO_CPP_INCLUDE = "eosio.cdt"
 EOSIO_DISPATCH = r"void\s*apply\s*\(|EOSIO_DISPATCH"
 ROOT = config.wsl_root()
 HOME = ROOT + os.environ["HOME"]
+PROBE_MIN_SEC = 0.05
+PROBE_MAX_SEC = 0.25
+'''The range of intervals between the polls of :func:`node_probe`.
+'''
+
+KEOSD_TIMEOUT_SEC = 10
+KEOSD_SOCKET = "keosd.sock"
+
+__node_supervisor = None
+__keosd_supervisor = None
+__keosd_address = None
 
 
 def resolve_home(string): 
@@ -542,6 +555,8 @@ def args(clear=False):
         args_.extend(["--config-dir", config_dir])
     if data_dir:
         args_.extend(["--data-dir", data_dir])
+    if config.node_p2p_address():
+        args_.extend(["--p2p-listen-endpoint", config.node_p2p_address()])
 
     if clear:
         node_stop()
@@ -551,14 +566,159 @@ def args(clear=False):
     return args_
 
 
-def keosd_start():
-    if not config.keosd_wallet_dir(raise_error=False):
-        utils.spawn([config.keosd_exe()])
+def keosd_wallet_dir():
+    '''The wallet directory, as configured, see
+    :func:`.core.config.keosd_wallet_dir`, created if it does not exist.
+    '''
+    wallet_dir = config.keosd_wallet_dir(raise_error=False)
+    if wallet_dir:
+        return wallet_dir
+    wallet_dir = os.path.expandvars(
+        config.config_value(config.keosd_wallet_dir_))
+    os.makedirs(wallet_dir, exist_ok=True)
+    return wallet_dir
 
-        while True:
-            time.sleep(1)
-            if config.keosd_wallet_dir(raise_error=False):
-                break
+
+def keosd_responds(address):
+    import eosfactory.core.http_api as http_api
+    try:
+        return not http_api.ChainApi(
+            "list_wallets", is_verbose=False, api="wallet", url=address, 
+            is_cached=False).err_msg
+    except Exception:
+        return False
+
+
+def keosd_start(timeout_sec=KEOSD_TIMEOUT_SEC):
+    '''Make sure that *keosd* serves the wallet directory.
+
+    If no *keosd* responds at the unix socket in the wallet directory, see
+    :func:`.core.config.keosd_wallet_dir`, one is started, supervised, see
+    :class:`.supervisor.Supervisor`, with the directory as its data, and
+    wallet, directory. The socket is polled at short intervals until *keosd*
+    responds. Hence, a session, for example, a worker of
+    :class:`.node_pool.NodePool`, may have its own *keosd*, if it has its
+    own wallet directory.
+
+    Returns:
+        str: The address of *keosd*, for the *--wallet-url* option of
+        *EOSIO cleos*.
+
+    Raises:
+        .core.errors.Error: If *keosd* does not respond in time.
+    '''
+    global __keosd_supervisor, __keosd_address
+    wallet_dir = keosd_wallet_dir()
+    socket_file = os.path.join(wallet_dir, KEOSD_SOCKET)
+    address = "unix://" + socket_file
+    if __keosd_address == address and (__keosd_supervisor is None 
+            or __keosd_supervisor.is_running()):
+        return address
+
+    if os.path.exists(socket_file) and keosd_responds(address):
+        __keosd_address = address
+        return address
+
+    keosd_stop()
+    if os.path.exists(socket_file):
+        os.remove(socket_file)
+    __keosd_supervisor = supervisor.Supervisor([
+        config.keosd_exe(),
+        "--data-dir", wallet_dir, "--config-dir", wallet_dir,
+        "--wallet-dir", wallet_dir, "--unix-socket-path", socket_file
+        ], "keosd").start()
+
+    start_time = time.time()
+    delay = PROBE_MIN_SEC
+    while not (os.path.exists(socket_file) and keosd_responds(address)):
+        if not __keosd_supervisor.is_running():
+            raise errors.Error('''
+            ``keosd`` has exited with the code {}.
+            '''.format(__keosd_supervisor.process.returncode), 
+            translate=False)
+        if time.time() - start_time > timeout_sec:
+            raise errors.Error('''
+            ``keosd`` does not respond at
+                {}
+            '''.format(address), translate=False)
+        time.sleep(delay)
+        delay = min(delay * 1.5, PROBE_MAX_SEC)
+
+    __keosd_address = address
+    return address
+
+
+def keosd_address():
+    '''The address of *keosd*, if started with :func:`keosd_start`.
+    '''
+    return __keosd_address
+
+
+def keosd_pids():
+    '''The process IDs of *keosd* instances serving the wallet directory.
+
+    The instances of other wallet directories, given with the *--data-dir*
+    option, are not listed, and neither are those with the default one if
+    the wallet directory is not the default one.
+    '''
+    wallet_dir = config.keosd_wallet_dir(raise_error=False)
+    if not wallet_dir:
+        return []
+    wallet_dir = os.path.realpath(wallet_dir)
+    default_dir = os.path.realpath(os.path.expandvars("${HOME}/eosio-wallet"))
+    name = os.path.splitext(os.path.basename(config.keosd_exe()))[0]
+    pids = []
+    for pid in get_pid(name):
+        try:
+            with open("/proc/{}/cmdline".format(pid), "rb") as f:
+                args_ = " ".join(
+                    f.read().decode("ISO-8859-1").split("\0")).split()
+        except OSError:
+            args_ = []
+        data_dir = default_dir
+        if "--data-dir" in args_ and args_.index("--data-dir") + 1 < len(args_):
+            data_dir = os.path.realpath(args_[args_.index("--data-dir") + 1])
+        if data_dir == wallet_dir:
+            pids.append(pid)
+    return pids
+
+
+def keosd_stop():
+    '''Stop *keosd* serving the wallet directory.
+
+    The *keosd* supervised, see :func:`keosd_start`, is stopped with 
+    *SIGINT*, then *SIGKILL* if needed, and reaped. Other instances serving
+    the wallet directory, see :func:`keosd_pids`, are stopped alike. Those
+    serving other directories are not.
+
+    Raises:
+        .core.errors.Error: If *keosd* does not exit.
+    '''
+    global __keosd_address
+    __keosd_address = None
+    if __keosd_supervisor:
+        __keosd_supervisor.stop()
+
+    pids = keosd_pids()
+    if not pids:
+        return
+
+    for sig in [signal.SIGINT, signal.SIGKILL]:
+        for pid in pids:
+            try:
+                os.kill(pid, sig)
+            except ProcessLookupError:
+                pass
+
+        deadline = time.time() + supervisor.STOP_TIMEOUT_SEC
+        while time.time() < deadline:
+            if not keosd_pids():
+                return
+            time.sleep(PROBE_MIN_SEC)
+
+    raise errors.Error('''
+    Failed to kill ``keosd``. Pid is {}.
+    '''.format(str(pids)), translate=False)
 
 
 def on_nodeos_error(clear=False):
@@ -604,6 +764,10 @@ def on_nodeos_error(clear=False):
 def node_start(clear=False, nodeos_stdout=None):
     '''Start the local EOSIO node.
 
+    The node is supervised, see :func:`node_supervisor`. If 
+    :attr:`.core.setup.is_node_restarted` is set, it is restarted if it 
+    crashes.
+
     Args:
         clear (bool): If set, the blockchain is deleted and then re-created.
         nodeos_stdout (str): If set, a file where *stdout* stream of
@@ -612,6 +776,7 @@ def node_start(clear=False, nodeos_stdout=None):
             If the file is set with the configuration, and in the same time 
             it is set with this argument, the argument setting prevails. 
     '''
+    global __node_supervisor
     args_ = args(clear)
 
     if setup.is_print_command_line:
@@ -621,80 +786,100 @@ def node_start(clear=False, nodeos_stdout=None):
     if not nodeos_stdout:
         nodeos_stdout = config.nodeos_stdout()
 
-    std_out_handle = subprocess.DEVNULL
-    if nodeos_stdout:
-        try:
-            std_out_handle = open(nodeos_stdout, 'w')
-        except Exception as e:
-            raise errors.Error('''
-            Error when preparing to start the local EOS node, 
-            opening the given stdout log file that is 
-            {}
-            Error message is
-            {}
-            '''.format(nodeos_stdout, str(e)))
+    command_line = [config.node_exe()]
+    for arg in args_:
+        arg = str(arg)
+        # Options are given with their values, like "--producer-name eosio".
+        if arg.startswith("--") and " " in arg:
+            command_line.extend(arg.split(" ", 1))
+        else:
+            command_line.append(arg)
+    __node_supervisor = supervisor.NodeSupervisor(
+        command_line, nodeos_stdout, setup.is_node_restarted).start()
 
-    def onExit():
-        if not std_out_handle == subprocess.DEVNULL:
-            try:
-                std_out_handle.close()
-            except:
-                pass
 
-    if setup.is_print_command_line:
-        print("######## nodeos command line:")
-        print(config.node_exe() + " " + " ".join(args_))
-                
-    args_.insert(0, config.node_exe())
-    def runInThread():
-        proc = subprocess.Popen(
-            " ".join(args_), 
-            stdin=subprocess.DEVNULL, stdout=std_out_handle, 
-            stderr=subprocess.DEVNULL, shell=True)
-        proc.wait()
-        onExit()
-        return
-    
-    thread = threading.Thread(target=runInThread)
-    thread.start()
+def node_supervisor():
+    '''The supervisor of the local node, if started with :func:`node_start`.
 
+    Returns:
+        :class:`.supervisor.NodeSupervisor` object, or *None*.
+    '''
+    return __node_supervisor
 
-def node_probe():
-    count = 25
-    count1 = count - 7
-    num = 5
-    block_num = None
-    time.sleep(5)
 
-    while True:
-        time.sleep(1)
-        count = count - 1
-        if count > count1:
-            print(".", end="", flush=True)
-            continue
+def node_probe(blocks=None, timeout_sec=None):
+    '''Wait until the local node is ready, that is, produces blocks.
 
-        try:
-            import eosfactory.core.cleos_get as cleos_get
-            head_block_num = cleos_get.GetInfo(is_verbose=0).head_block
-        except:
-            head_block_num = 0
-        finally:
-            print("*", end="", flush=True)
-
-        if block_num is None:
-            block_num = head_block_num
-
-        if head_block_num - block_num >= num:
-            print()
-            logger.INFO('''
-            Local node is running. Block number is {}
-            '''.format(head_block_num))
-            break
+    The HTTP endpoint of the node is polled at short intervals, from 
+    :attr:`PROBE_MIN_SEC` growing to :attr:`PROBE_MAX_SEC`, until the head 
+    block advances by *blocks*. If the node, as started with 
+    :func:`node_start`, exits while no node responds, the probe fails at 
+    once.
 
-        if count <= 0:
+    Args:
+        blocks (int): The number of blocks. Default is 
+            :func:`.core.config.node_probe_blocks`.
+        timeout_sec (float): The time limit. Default is 
+            :func:`.core.config.node_probe_timeout_sec`.
+
+    Returns:
+        int: The head block number.
+
+    Raises:
+        .core.errors.Error: If the node does not get ready in time, or exits.
+    '''
+    import eosfactory.core.http_api as http_api
+    if blocks is None:
+        blocks = config.node_probe_blocks()
+    if timeout_sec is None:
+        timeout_sec = config.node_probe_timeout_sec()
+
+    start_time = time.time()
+    delay = PROBE_MIN_SEC
+    block_num = None
+    dots = 0
+    while True:
+        try:
+            head_block_num = int(http_api.ChainApi(
+                "get_info", is_verbose=False, is_cached=False
+                ).json["head_block_num"])
+        except Exception:
+            head_block_num = None
+
+        if not head_block_num is None:
+            if block_num is None:
+                block_num = head_block_num
+            if head_block_num - block_num >= blocks:
+                if dots:
+                    print()
+                logger.INFO('''
+                Local node is running. Block number is {}
+                '''.format(head_block_num))
+                return head_block_num
+
+        # A node that has been running already may respond, though.
+        if head_block_num is None and __node_supervisor \
+                and not __node_supervisor.is_running():
+            if dots:
+                print()
+            raise errors.Error('''
+            The local node has exited with the code {}.
+            '''.format(__node_supervisor.process.returncode), 
+            translate=False)
+
+        elapsed = time.time() - start_time
+        if elapsed > timeout_sec:
+            if dots:
+                print()
             raise errors.Error('''
             The local node does not respond.
             ''')
+        while dots < int(elapsed):
+            print("." if head_block_num is None else "*", end="", flush=True)
+            dots = dots + 1
+
+        time.sleep(delay)
+        delay = min(delay * 1.5, PROBE_MAX_SEC)
 
 
 def is_local_node_process_running(name=None):
@@ -705,34 +890,70 @@ def is_local_node_process_running(name=None):
         
 
 def node_stop():
-    # You can see if the process is a zombie by using top or 
-    # the following command:
-    # ps aux | awk '$8=="Z" {print $2}'
-    
-    pids = get_pid()
-    count = 10
-    if pids:
+    '''Stop the local node.
+
+    The node supervised, see :func:`node_supervisor`, is stopped with 
+    *SIGINT*, then *SIGKILL* if needed, and reaped. Nodes started otherwise, 
+    for example by a previous session, are found with *pgrep*, and stopped 
+    alike.
+
+    Raises:
+        .core.errors.Error: If a node does not exit.
+    '''
+    if __node_supervisor:
+        __node_supervisor.stop()
+
+    pids = node_pids()
+    if not pids:
+        return
+
+    for sig in [signal.SIGINT, signal.SIGKILL]:
         for pid in pids:
-            os.system("kill " + str(pid))
-    
-        while count > 0:
-            time.sleep(1)
-            if not is_local_node_process_running():
-                break
-            count = count -1
+            try:
+                os.kill(pid, sig)
+            except ProcessLookupError:
+                pass
 
-    if count <= 0:
-        raise errors.Error('''
+        deadline = time.time() + supervisor.STOP_TIMEOUT_SEC
+        while time.time() < deadline:
+            if not node_pids():
+                logger.INFO('''
+                Local node is stopped {}.
+                '''.format(str(pids)))
+                return
+            time.sleep(PROBE_MIN_SEC)
+
+    raise errors.Error('''
 Failed to kill {}. Pid is {}.
     '''.format(
         os.path.splitext(os.path.basename(config.node_exe()))[0], str(pids))
     )
-    else:         
-        logger.INFO('''
-        Local node is stopped {}.
-        '''.format(str(pids)))        
 
-    
+
+def node_pids():
+    '''The process IDs of the local nodes, except those serving at another
+    address than the local node, see :func:`.core.config.http_server_address`.
+
+    Hence, nodes running side by side, see :mod:`.core.node_pool`, are not
+    stopped by each other.
+    '''
+    address = config.http_server_address()
+    pids = []
+    for pid in get_pid():
+        try:
+            with open("/proc/{}/cmdline".format(pid), "rb") as f:
+                args_ = " ".join(
+                    f.read().decode("ISO-8859-1").split("\0")).split()
+        except OSError:
+            args_ = []
+        if "--http-server-address" in args_:
+            index = args_.index("--http-server-address") + 1
+            if index < len(args_) and args_[index] != address:
+                continue
+        pids.append(pid)
+    return pids
+
+
 def node_is_running():
     return not get_pid()
 
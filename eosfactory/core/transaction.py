@@ -0,0 +1,308 @@
+import json
+import time
+
+import eosfactory.core.errors as errors
+import eosfactory.core.setup as setup
+import eosfactory.core.cassette as cassette
+import eosfactory.core.serializer as serializer
+import eosfactory.core.abi as abi
+import eosfactory.core.http_api as http_api
+import eosfactory.core.wallet_api as wallet_api
+
+
+TAPOS_MAX_AGE_SEC = 600
+'''How long the reference block and the chain id are cached.
+'''
+DEFAULT_EXPIRATION_SEC = 30
+STALE_CACHE_ERRORS = [
+    "Error 3040005:", # expired transaction
+    "Error 3040007:", # invalid reference block
+    "Error 3090003:", # unsatisfied authorization
+    ]
+
+__tapos = {}
+__required_keys = {}
+
+
+def clear_cache():
+    '''Forget the cached reference blocks and the required keys.
+
+    The caches are cleared when the local node is reset, and whenever a
+    transaction fails for a reason that the caches may explain.
+    '''
+    __tapos.clear()
+    __required_keys.clear()
+
+
+def clear_required_keys():
+    '''Forget the keys required by authorizations, as permissions change.
+    '''
+    __required_keys.clear()
+
+
+def is_native_push(skip_sign=0, dont_broadcast=0, ref_block=None):
+    '''Whether a transaction is to be pushed natively, see :func:`push`.
+
+    That is, if :attr:`.core.setup.is_native_push` is set, and neither the
+    given options, nor a cassette, see :mod:`.cassette`, need *EOSIO cleos*.
+    '''
+    return setup.is_native_push \
+        and not skip_sign and not dont_broadcast and ref_block is None \
+        and not cassette.is_recording() and not cassette.is_replaying()
+
+
+def tapos_fields(block_id):
+    '''The TAPOS fields of a transaction referencing the given block.
+
+    Args:
+        block_id (str): The id of the block, hexadecimal.
+
+    Returns:
+        tuple: (<ref_block_num>, <ref_block_prefix>).
+    '''
+    return (
+        int(block_id[0:8], 16) & 0xffff,
+        int.from_bytes(bytes.fromhex(block_id[16:24]), "little"))
+
+
+def tapos():
+    '''The chain id and the reference block, cached for the current node.
+
+    Returns:
+        dict: With the *chain_id*, *ref_block_num*, *ref_block_prefix* and
+        *head_block_time* fields, and the *time* when it was cached.
+    '''
+    address = setup.nodeos_address()
+    if address in __tapos \
+            and time.time() - __tapos[address]["time"] < TAPOS_MAX_AGE_SEC:
+        return __tapos[address]
+
+    info = http_api.ChainApi("get_info", is_verbose=False).json
+    ref_block_num, ref_block_prefix = tapos_fields(
+        info["last_irreversible_block_id"])
+    __tapos[address] = {
+        "chain_id": info["chain_id"],
+        "ref_block_num": ref_block_num,
+        "ref_block_prefix": ref_block_prefix,
+        "head_block_time": serializer.time_point_sec(
+            info["head_block_time"]),
+        "time": time.time()
+    }
+    return __tapos[address]
+
+
+def pack_data(action):
+    '''The *data* component of the given action, packed.
+
+    The data is packed locally, with the ABI of the contract, see
+    :mod:`.abi`. If it fails, the node is asked to pack the data, so that
+    errors are reported as *EOSIO nodeos* reports them.
+
+    Returns:
+        str: Hexadecimal representation of the data.
+    '''
+    data = action["data"]
+    if isinstance(data, str):
+        return data
+
+    try:
+        return abi.get(action["account"]).pack_action(
+            action["name"], data).hex()
+    except errors.Error:
+        pass
+
+    return http_api.ChainApi(
+        "abi_json_to_bin",
+        {"code": action["account"], "action": action["name"], "args": data},
+        is_verbose=False).json["binargs"]
+
+
+def authority(value):
+    '''Convert an authority argument to JSON, as *EOSIO cleos* does.
+
+    Args:
+        value (str or json): A public key, or the JSON of an authority.
+    '''
+    if isinstance(value, str):
+        value = value.strip()
+        if value.startswith("{"):
+            value = json.loads(value)
+        else:
+            value = {
+                "threshold": 1, 
+                "keys": [{"key": value, "weight": 1}],
+                "accounts": [], "waits": []}
+    return value
+
+
+def system_action(name, authorization, data):
+    return {
+        "account": "eosio", "name": name, "authorization": authorization,
+        "data": data.hex()}
+
+
+def newaccount(creator, name, owner_key, active_key, authorization):
+    '''The *eosio::newaccount* action, packed locally.
+
+    Args:
+        creator (str): The name of the creator account.
+        name (str): The name of the new account.
+        owner_key (str): The owner public key.
+        active_key (str): The active public key.
+        authorization (list): See :func:`.cleos.authorization`.
+    '''
+    return system_action(
+        "newaccount", authorization,
+        serializer.pack_name(creator) + serializer.pack_name(name) \
+            + serializer.pack_authority(authority(owner_key)) \
+            + serializer.pack_authority(authority(active_key)))
+
+
+def updateauth(account, permission, parent, authority_, authorization):
+    '''The *eosio::updateauth* action, packed locally.
+
+    Args:
+        account (str): The name of the account.
+        permission (str): The permission name.
+        parent (str): The parent permission name.
+        authority_ (str or json): See :func:`authority`.
+        authorization (list): See :func:`.cleos.authorization`.
+    '''
+    return system_action(
+        "updateauth", authorization,
+        serializer.pack_name(account) + serializer.pack_name(permission) \
+            + serializer.pack_name(parent) \
+            + serializer.pack_authority(authority(authority_)))
+
+
+def deleteauth(account, permission, authorization):
+    '''The *eosio::deleteauth* action, packed locally.
+    '''
+    return system_action(
+        "deleteauth", authorization,
+        serializer.pack_name(account) + serializer.pack_name(permission))
+
+
+def build(
+        actions, expiration_sec=None, force_unique=0,
+        max_cpu_usage=0, max_net_usage=0, delay_sec=0):
+    '''Compose a transaction.
+
+    Args:
+        actions (list): List of actions, see :func:`.cleos.action_json`. The
+            *data* component may be hexadecimal, already packed.
+
+    See definitions of the remaining parameters: \
+    :func:`.cleos.common_parameters`.
+
+    Returns:
+        json: The transaction, with the action data packed.
+    '''
+    tapos_ = tapos()
+    if not expiration_sec:
+        expiration_sec = DEFAULT_EXPIRATION_SEC
+    expiration = tapos_["head_block_time"] \
+        + int(time.time() - tapos_["time"]) + int(expiration_sec)
+
+    context_free_actions = []
+    if force_unique:
+        context_free_actions.append({
+            "account": "eosio.null", "name": "nonce", "authorization": [],
+            "data": serializer.pack_string(str(time.time())).hex()
+        })
+
+    return {
+        "expiration": serializer.time_point_sec_string(expiration),
+        "ref_block_num": tapos_["ref_block_num"],
+        "ref_block_prefix": tapos_["ref_block_prefix"],
+        "max_net_usage_words": (int(max_net_usage) + 7) // 8,
+        "max_cpu_usage_ms": int(max_cpu_usage),
+        "delay_sec": int(delay_sec),
+        "context_free_actions": context_free_actions,
+        "actions": [
+            dict(action, data=pack_data(action)) for action in actions],
+        "transaction_extensions": [],
+        "signatures": [],
+        "context_free_data": []
+    }
+
+
+def required_keys(transaction):
+    '''The public keys needed to sign the given transaction.
+
+    The keys are cached for the authorizations of the transaction.
+    '''
+    authorizations = set()
+    for action in transaction["actions"]:
+        for permission in action["authorization"]:
+            authorizations.add(
+                permission["actor"] + "@" + permission["permission"])
+    key = (setup.nodeos_address(), tuple(sorted(authorizations)))
+
+    if not key in __required_keys:
+        available_keys = wallet_api.WalletApi(
+            "get_public_keys", is_verbose=False).json
+        __required_keys[key] = http_api.ChainApi(
+            "get_required_keys",
+            {"transaction": transaction, "available_keys": available_keys},
+            is_verbose=False).json["required_keys"]
+
+    return __required_keys[key]
+
+
+def sign(transaction):
+    '''Get signatures of the given transaction from *keosd*.
+
+    Returns:
+        list: The signatures.
+    '''
+    return wallet_api.WalletApi(
+        "sign_transaction",
+        [transaction, required_keys(transaction), tapos()["chain_id"]],
+        is_verbose=False).json["signatures"]
+
+
+def push(
+        command, actions, expiration_sec=None, force_unique=0,
+        max_cpu_usage=0, max_net_usage=0, delay_sec=0, is_verbose=True):
+    '''Push a transaction without *EOSIO cleos*.
+
+    The transaction is composed and packed locally, signed by *keosd*, and
+    posted to the */v1/chain/push_transaction* endpoint. The reference block
+    and the required keys are cached, hence, as long as the caches are
+    valid, only action data packing, signing and pushing cost round-trips.
+
+    Args:
+        command (.cleos.Cleos): The command object, its *out_msg*, *err_msg*
+            and *json* attributes are set as if *EOSIO cleos* responded.
+        actions (list): List of actions, see :func:`build`.
+
+    See definitions of the remaining parameters: \
+    :func:`.cleos.common_parameters`.
+
+    Raises:
+        .core.errors.Error: If the transaction fails.
+    '''
+    for attempt in range(0, 2):
+        try:
+            transaction = build(
+                actions, expiration_sec, force_unique,
+                max_cpu_usage, max_net_usage, delay_sec)
+            signatures = sign(transaction)
+            packed_trx = serializer.pack_transaction(transaction).hex()
+
+            http_api.ChainApi.__init__(
+                command, "push_transaction",
+                {
+                    "signatures": signatures,
+                    "compression": "none",
+                    "packed_context_free_data": "",
+                    "packed_trx": packed_trx
+                },
+                is_verbose)
+            return
+        except errors.Error as e:
+            if attempt or not [
+                    error for error in STALE_CACHE_ERRORS if error in str(e)]:
+                raise
+            clear_cache()
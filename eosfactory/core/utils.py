@@ -68,9 +68,13 @@ def uname(options=None):
     return spawn(command_line)
 
 
+__is_windows_ubuntu = None
 def is_windows_ubuntu():
-    resp = uname("-v")
-    return resp.find("Microsoft") != -1
+    global __is_windows_ubuntu
+    if __is_windows_ubuntu is None:
+        resp = uname("-v")
+        __is_windows_ubuntu = resp.find("Microsoft") != -1
+    return __is_windows_ubuntu
 
 
 def which(file_path):
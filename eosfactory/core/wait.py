@@ -0,0 +1,267 @@
+'''Waiting for the chain to progress, instead of sleeping.
+
+The functions poll *get_info* adaptively: the sleep between the polls is
+about the time the awaited blocks take to be produced, see
+:attr:`.cache.BLOCK_INTERVAL_SEC`, and short when the goal is near. Hence,
+they return as soon as the condition holds, for example::
+
+    result = HOST.push_action("close", {...}, permission=CAROL)
+    wait_for_inclusion(result)
+
+If :attr:`.core.setup.is_metrics` is set, the inclusion and finality
+latencies of transactions, measured since they have been pushed, are
+recorded as the *wait inclusion* and *wait irreversible* commands, see
+:mod:`.metrics`.
+'''
+
+import time
+
+import eosfactory.core.errors as errors
+import eosfactory.core.setup as setup
+import eosfactory.core.metrics as metrics
+import eosfactory.core.cache as cache
+import eosfactory.core.cleos_get as cleos_get
+
+
+POLL_MIN_SEC = 0.02
+'''The shortest sleep between polls.
+'''
+POLL_MAX_SEC = 5
+'''The longest sleep between polls.
+'''
+INCLUSION_TIMEOUT_SEC = 30
+IRREVERSIBLE_TIMEOUT_SEC = 400
+'''The default time limits, enough for the finality of a public chain.
+'''
+
+
+def poll_delay(remaining_blocks, idle_polls):
+    '''The sleep before the next poll.
+
+    Args:
+        remaining_blocks (int): The number of blocks still awaited.
+        idle_polls (int): The number of polls since the head block has
+            changed.
+    '''
+    if remaining_blocks > 1:
+        return min(
+            (remaining_blocks - 1) * cache.BLOCK_INTERVAL_SEC, POLL_MAX_SEC)
+    return min(POLL_MIN_SEC * 2 ** idle_polls, cache.BLOCK_INTERVAL_SEC)
+
+
+def poll(condition, timeout_sec, message):
+    '''Poll *get_info* until a condition holds.
+
+    Args:
+        condition: A function of the :class:`.cleos_get.GetInfo` object,
+            returning the number of blocks still awaited, zero or less if
+            none.
+        timeout_sec (float): The time limit.
+        message (str): The error message, if the time limit is exceeded.
+
+    Returns:
+        :class:`.cleos_get.GetInfo` object, for which the condition holds.
+
+    Raises:
+        .core.errors.Error: If the time limit is exceeded.
+    '''
+    start_time = time.time()
+    head_block = None
+    idle_polls = 0
+    while True:
+        info = cleos_get.GetInfo(is_verbose=False, is_cached=False)
+        remaining_blocks = condition(info)
+        if remaining_blocks <= 0:
+            return info
+
+        if info.head_block == head_block:
+            idle_polls = idle_polls + 1
+        else:
+            head_block = info.head_block
+            idle_polls = 0
+
+        delay = poll_delay(remaining_blocks, idle_polls)
+        if time.time() + delay - start_time > timeout_sec:
+            delay = timeout_sec - (time.time() - start_time)
+            if delay <= 0:
+                raise errors.Error(message, translate=False)
+        time.sleep(delay)
+
+
+def wait_blocks(count=1, timeout_sec=None):
+    '''Wait until a number of blocks are produced.
+
+    Args:
+        count (int): The number of blocks. Default is 1.
+        timeout_sec (float): The time limit. Default is the time of
+            producing twice as many blocks, plus a second.
+
+    Returns:
+        int: The head block number.
+
+    Raises:
+        .core.errors.Error: If the time limit is exceeded.
+    '''
+    if timeout_sec is None:
+        timeout_sec = 2 * count * cache.BLOCK_INTERVAL_SEC + 1
+    start_block = cleos_get.GetInfo(
+        is_verbose=False, is_cached=False).head_block
+    return poll(
+        lambda info: start_block + count - info.head_block, timeout_sec,
+        '''
+        The node has not produced {} blocks in {} seconds.
+        '''.format(count, timeout_sec)).head_block
+
+
+def transaction_arg(transaction):
+    '''The ID and the block number of a transaction.
+
+    Args:
+        transaction (.cleos.Cleos or json or str): The result of pushing the
+            transaction, for example a :class:`.cleos.PushAction` object, or
+            its JSON, or the transaction ID.
+
+    Returns:
+        tuple: (<transaction ID>, <block number or None>, <push time or
+        None>).
+    '''
+    push_time = getattr(transaction, "push_time", None)
+    if hasattr(transaction, "json"):
+        transaction = transaction.json
+    if isinstance(transaction, str):
+        return (transaction, None, push_time)
+
+    try:
+        return (
+            transaction["transaction_id"],
+            transaction["processed"]["block_num"], push_time)
+    except (KeyError, TypeError):
+        raise errors.Error('''
+        The argument is not the result of a transaction:
+        {}
+        '''.format(transaction), translate=False)
+
+
+def block_includes(block, transaction_id):
+    for trx in block.get("transactions", []):
+        # The deferred transactions are given by ID only.
+        trx_id = trx["trx"] if isinstance(trx["trx"], str) \
+            else trx["trx"]["id"]
+        if trx_id == transaction_id:
+            return True
+    return False
+
+
+def find_transaction(transaction_id, start_block, end_block):
+    '''The number of the block, in a range, that includes a transaction.
+
+    Returns:
+        int: The block number, or *None* if not found.
+    '''
+    for block_num in range(start_block, end_block + 1):
+        if block_includes(
+                cleos_get.GetBlock(block_num, is_verbose=False).json,
+                transaction_id):
+            return block_num
+    return None
+
+
+def record(command, start_time, is_error=False):
+    if setup.is_metrics and start_time:
+        metrics.record(
+            command, time.time() - start_time, 0, 0, 0, 0, is_error)
+
+
+def await_inclusion(transaction_id, block_num, timeout_sec):
+    '''Wait until a transaction is in a block, the given one or later.
+
+    Returns:
+        int: The number of the block.
+    '''
+    # The block to look up next, and the one including the transaction.
+    state = {"next": block_num, "found": None}
+
+    def condition(info):
+        if info.head_block >= state["next"]:
+            state["found"] = find_transaction(
+                transaction_id, state["next"], info.head_block)
+            state["next"] = info.head_block + 1
+        return 0 if state["found"] else state["next"] - info.head_block
+
+    poll(condition, timeout_sec, '''
+    The transaction ``{}`` is not in a block after {} seconds.
+    '''.format(transaction_id, timeout_sec))
+    return state["found"]
+
+
+def wait_for_inclusion(transaction, timeout_sec=INCLUSION_TIMEOUT_SEC):
+    '''Wait until a transaction is in a block.
+
+    The transaction is looked up in the block that has executed it, as the
+    responce reports, and in the following blocks, in case of a fork.
+
+    Args:
+        transaction: The result of pushing the transaction, see
+            :func:`transaction_arg`. If it is the transaction ID, the
+            transaction is looked up in the blocks produced since the call.
+        timeout_sec (float): The time limit. Default is
+            :attr:`INCLUSION_TIMEOUT_SEC`.
+
+    Returns:
+        int: The number of the block.
+
+    Raises:
+        .core.errors.Error: If the time limit is exceeded.
+    '''
+    start_time = time.time()
+    transaction_id, block_num, push_time = transaction_arg(transaction)
+    if block_num is None:
+        block_num = cleos_get.GetInfo(
+            is_verbose=False, is_cached=False).head_block
+    try:
+        block_num = await_inclusion(transaction_id, block_num, timeout_sec)
+    except errors.Error:
+        record("wait inclusion", push_time or start_time, True)
+        raise
+    record("wait inclusion", push_time or start_time)
+    return block_num
+
+
+def wait_for_irreversible(transaction, timeout_sec=IRREVERSIBLE_TIMEOUT_SEC):
+    '''Wait until a transaction is in an irreversible block.
+
+    Args:
+        transaction: The result of pushing the transaction, see
+            :func:`transaction_arg`.
+        timeout_sec (float): The time limit. Default is
+            :attr:`IRREVERSIBLE_TIMEOUT_SEC`.
+
+    Returns:
+        int: The number of the block.
+
+    Raises:
+        .core.errors.Error: If the time limit is exceeded.
+    '''
+    start_time = time.time()
+    transaction_id, _, push_time = transaction_arg(transaction)
+    try:
+        block_num = wait_for_inclusion(transaction, timeout_sec)
+        while True:
+            poll(
+                lambda info: block_num - info.last_irreversible_block_num,
+                timeout_sec - (time.time() - start_time), '''
+                The transaction ``{}`` is not irreversible after {} seconds.
+                '''.format(transaction_id, timeout_sec))
+            if block_includes(
+                    cleos_get.GetBlock(block_num, is_verbose=False).json,
+                    transaction_id):
+                break
+            # Forked out meanwhile: wait for the block including it now.
+            block_num = await_inclusion(
+                transaction_id, block_num + 1,
+                timeout_sec - (time.time() - start_time))
+    except errors.Error:
+        record("wait irreversible", push_time or start_time, True)
+        raise
+    record("wait irreversible", push_time or start_time)
+    return block_num
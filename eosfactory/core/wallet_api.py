@@ -0,0 +1,71 @@
+'''Native client of *keosd*, the EOSIO wallet manager.
+
+The */v1/wallet/...* endpoints of *keosd* are called in-process, over a
+persistent connection to the unix socket that *keosd* listens to, instead of
+spawning *EOSIO cleos*. The :class:`.cleos.WalletCreate`,
+:class:`.cleos.WalletOpen`, :class:`.cleos.WalletUnlock` and the other wallet
+commands use the client if :attr:`.core.setup.is_native_wallet` is set, and
+*keosd* is started if it is not running, see :func:`.core.teos.keosd_start`.
+Their responces are formatted as *EOSIO cleos* formats them.
+'''
+
+import eosfactory.core.setup as setup
+import eosfactory.core.cassette as cassette
+import eosfactory.core.http_api as http_api
+
+
+CREATE_MESSAGE = '''Creating wallet: {}
+Save password to use in the future to unlock this wallet.
+Without password imported keys will not be retrievable.
+"{}"
+'''
+
+
+def keosd_address():
+    '''The address of *keosd* serving the wallet directory, started if it is
+    not running, see :func:`.core.teos.keosd_start`.
+
+    Returns:
+        str: The address.
+
+    Raises:
+        .core.errors.Error: If *keosd* does not respond.
+    '''
+    import eosfactory.core.teos as teos
+    return teos.keosd_start()
+
+
+def is_native():
+    '''Whether the wallet commands are to call *keosd* natively.
+
+    That is, if :attr:`.core.setup.is_native_wallet` is set, and a cassette,
+    see :mod:`.cassette`, does not need *EOSIO cleos*.
+    '''
+    return setup.is_native_wallet \
+        and not cassette.is_recording() and not cassette.is_replaying()
+
+
+class WalletApi(http_api.ChainApi):
+    '''A prototype for native *keosd* HTTP API calls.
+
+    Args:
+        endpoint (str): Endpoint name, for example *unlock*.
+        params (json): The request body, if any.
+        out_msg (str): If set, and the call succeeds, the *out_msg* attribute,
+            the way *EOSIO cleos* renders the responce.
+        is_verbose (bool): If *False* do not print. Default is *True*.
+        api (str): The API group name, *wallet* or *keosd*. Default is
+            *wallet*.
+
+    See the attributes of the :class:`.http_api.ChainApi` class.
+
+    Raises:
+        .core.errors.Error: If err_msg.
+    '''
+    def __init__(
+            self, endpoint, params=None, out_msg=None, is_verbose=True,
+            api="wallet"):
+        http_api.ChainApi.__init__(
+            self, endpoint, params, is_verbose, api=api, url=keosd_address())
+        if not out_msg is None and not self.err_msg:
+            self.out_msg = out_msg
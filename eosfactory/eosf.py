@@ -7,9 +7,14 @@ import eosfactory.core.cleos as cleos
 import eosfactory.core.manager as manager
 import eosfactory.core.testnet as testnet
 import eosfactory.core.interface as interface
+import eosfactory.core.metrics as metrics
+import eosfactory.core.wait as wait
+import eosfactory.core.checkpoint as checkpoint
 import eosfactory.shell.wallet as wallet
 import eosfactory.shell.account as account
 import eosfactory.shell.contract as contract
+import eosfactory.shell.batch as batch
+import eosfactory.shell.rollback as rollback
 
 
 verbosity =  logger.verbosity
@@ -26,8 +31,13 @@ Error = errors.Error
 LowRamError = errors.LowRamError
 MissingRequiredAuthorityError = errors.MissingRequiredAuthorityError
 DuplicateTransactionError = errors.DuplicateTransactionError
+TransactionTooBigError = errors.TransactionTooBigError
+WalletLockedError = errors.WalletLockedError
 
 CreateKey = cleos.CreateKey
+RetryPolicy = cleos.RetryPolicy
+set_retry_policy = cleos.set_retry_policy
+retry_counts = cleos.retry_counts
 Permission = interface.Permission
 
 create_wallet = wallet.create_wallet
@@ -41,6 +51,10 @@ create_master_account = account.create_master_account
 new_master_account = account.new_master_account
 
 print_stats = account.print_stats
+diff_stats = account.diff_stats
+
+batch = batch.batch
+RollbackTestCase = rollback.RollbackTestCase
 
 Contract = contract.Contract
 ContractBuilder = contract.ContractBuilder
@@ -48,10 +62,16 @@ project_from_template = teos.project_from_template
 
 reboot = manager.reboot
 reset = manager.reset
+save_checkpoint = checkpoint.save
 resume = manager.resume
 stop = manager.stop
 
+wait_blocks = wait.wait_blocks
+wait_for_inclusion = wait.wait_for_inclusion
+wait_for_irreversible = wait.wait_for_irreversible
+
 info = manager.info
+metrics = metrics.metrics
 status = manager.status
 
 Testnet =  testnet.Testnet
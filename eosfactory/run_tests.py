@@ -0,0 +1,84 @@
+import os
+import sys
+import glob
+import argparse
+
+import eosfactory.core.node_pool as node_pool
+
+
+def run_tests(scripts, jobs=1, http_port=node_pool.HTTP_PORT,
+        p2p_port=node_pool.P2P_PORT):
+    '''Run test scripts in parallel, each with a local node of its own.
+
+    See :mod:`.core.node_pool`.
+
+    Args:
+        scripts (list): The paths of the scripts.
+        jobs (int): The number of scripts run in parallel, that is, of local
+            nodes.
+        http_port (int): The HTTP port of the first node.
+        p2p_port (int): The peer-to-peer port of the first node.
+
+    Returns:
+        list: The scripts failed.
+    '''
+    pool = node_pool.NodePool(
+        min(jobs, len(scripts)) if scripts else 1, http_port, p2p_port)
+
+    def on_result(result):
+        script, returncode, duration, output = result
+        print("{} {} ({:.1f} s)".format(
+            "OK  " if returncode == 0 else "FAIL", script, duration))
+        if returncode:
+            print("    see {}".format(output))
+
+    results = pool.run(scripts, on_result)
+    failed = [result[0] for result in results if result[1] != 0]
+    print("\n{} of {} scripts passed.".format(
+        len(scripts) - len(failed), len(scripts)))
+    for script in failed:
+        print("FAILED: {}".format(script))
+    return failed
+
+
+def main():
+    '''
+    usage: python3 -m eosfactory.run_tests [-h] [-j JOBS] [--port PORT]
+        [--p2p_port P2P_PORT] [script [script ...]]
+
+    Run test scripts in parallel, each with a local node of its own.
+
+    Args:
+        script: A test script. Default is the scripts of the *tests* directory.
+        -j: The number of scripts run in parallel. Default is 1.
+        --port: The HTTP port of the first node. Default is 18888.
+        --p2p_port: The peer-to-peer port of the first node. Default is 19876.
+        -h: Show help message and exit
+    '''
+    parser = argparse.ArgumentParser(description='''
+    Run test scripts in parallel, each with a local node of its own.
+    ''')
+
+    parser.add_argument(
+        "script", nargs="*",
+        help="A test script. Default is the scripts of the tests directory.")
+    parser.add_argument(
+        "-j", "--jobs", type=int, default=1,
+        help="The number of scripts run in parallel.")
+    parser.add_argument(
+        "--port", type=int, default=node_pool.HTTP_PORT,
+        help="The HTTP port of the first node.")
+    parser.add_argument(
+        "--p2p_port", type=int, default=node_pool.P2P_PORT,
+        help="The peer-to-peer port of the first node.")
+
+    args = parser.parse_args()
+    scripts = args.script if args.script else sorted(glob.glob(
+        os.path.join(os.path.dirname(os.path.dirname(__file__)), "tests",
+        "*.py")))
+    if run_tests(scripts, args.jobs, args.port, args.p2p_port):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -12,13 +12,16 @@ import eosfactory.core.interface as interface
 import eosfactory.core.teos as teos
 import eosfactory.core.interface as interface
 import eosfactory.core.cleos as cleos
+import eosfactory.core.cleos_async as cleos_async
 import eosfactory.core.cleos_get as cleos_get
 import eosfactory.core.cleos_set as cleos_set
 import eosfactory.core.cleos_sys as cleos_sys
+import eosfactory.core.table_frame as table_frame
 import eosfactory.core.manager as manager
 import eosfactory.core.testnet as testnet
 import eosfactory.core.account as account
 import eosfactory.shell.wallet as wallet
+import eosfactory.shell.batch as batch
 
 
 wallet_globals = None
@@ -76,6 +79,20 @@ class Account():
             self, pos, offset, json, full, pretty, console, is_verbose=False)
         return result
 
+    def iter_actions(
+            self, since_seq=0, until_seq=None, cursor=None, dedup=True,
+            page_size=100):
+        '''Yield the actions of the account, retrieved concurrently.
+
+        See :func:`.cleos_get.iter_actions`.
+
+        Yields:
+            json: The actions, in the order of account sequence numbers.
+        '''
+        stop_if_account_is_not_set(self)
+        return cleos_get.iter_actions(
+            self, since_seq, until_seq, cursor, dedup, page_size)
+
     def code(self, code=None, abi=None, wasm=False):
         '''Retrieve the code and ABI
 
@@ -295,18 +312,46 @@ class Account():
                 component of EOSIO cleos responce.
             data (str): *["processed"]["action_traces"][0]["act"]["data"]* \
                 component of EOSIO cleos responce.
+
+        Raises:
+            .core.errors.Error: If pushed within a batch, see 
+                :mod:`.shell.batch`, with any transaction option but 
+                *permission* and *dont_broadcast* set.
         '''
         stop_if_account_is_not_set(self)
         data = manager.data_json(data)
         if not permission:
             permission = self
 
+        if batch.current() and not dont_broadcast:
+            options = {
+                "expiration_sec": expiration_sec, "skip_sign": skip_sign,
+                "force_unique": force_unique, "max_cpu_usage": max_cpu_usage,
+                "max_net_usage": max_net_usage, "ref_block": ref_block,
+                "delay_sec": delay_sec}
+            given = [name for name, value in options.items() if value]
+            if given:
+                raise errors.Error('''
+                The action ``{}`` is pushed within a batch, so these options
+                cannot apply to it:
+                ``{}``
+                Set the transaction options of a batch with the 
+                ``batch(...)`` function.
+                '''.format(action, "``, ``".join(given)), translate=False)
+
+            result = batch.current().add(self, action, data, permission)
+            logger.INFO('''
+                * push action ``{}`` (batched):
+                '''.format(action))
+            self.action = result
+            return result
+
         result = cleos.PushAction(
             self, action, data,
             permission, expiration_sec, 
             skip_sign, dont_broadcast, force_unique,
             max_cpu_usage, max_net_usage,
-            ref_block,
+            ref_block, delay_sec,
             is_verbose=False, json=True)
 
         logger.INFO('''
@@ -325,6 +370,70 @@ class Account():
             pass
 
         self.action = result
+        return result
+
+    async def push_action_async(self, *args, **kwargs):
+        '''Awaitable counterpart of the :meth:`push_action` method.
+
+        The action is pushed in a worker thread, see
+        :func:`.core.cleos_async.run`, so that independent actions may be
+        gathered concurrently.
+        '''
+        return await cleos_async.run(self.push_action, *args, **kwargs)
+
+    def push_actions(
+            self, actions,
+            expiration_sec=None, 
+            skip_sign=0, dont_broadcast=0, force_unique=0,
+            max_cpu_usage=0, max_net_usage=0,
+            ref_block=None, delay_sec=0):
+        '''Push a transaction with many actions.
+
+        Call *EOSIO cleos* with the *push transaction* command. Store the 
+        result, which is an object of the class :class:`.cleos.PushTransaction`, 
+        as the value of the *action* attribute.
+
+        Args:
+            actions (list): List of tuples (action, data) or 
+                (action, data, permission), where *action* is the name of an
+                action of the contract, *data* are the arguments to the
+                contract, and *permission* defaults to self.
+
+        See definitions of the remaining parameters: \
+        :func:`.cleos.common_parameters`.
+
+        Returns:
+            :class:`.cleos.PushTransaction` object, its *consoles* and *traces*
+            attributes list the results of the actions.
+        '''
+        stop_if_account_is_not_set(self)
+        actions_json = []
+        for action in actions:
+            permission = action[2] if len(action) > 2 else None
+            actions_json.append(cleos.action_json(
+                self, action[0], manager.data_json(action[1]),
+                permission if permission else self))
+
+        result = cleos.PushTransaction(
+            actions_json,
+            expiration_sec, 
+            skip_sign, dont_broadcast, force_unique,
+            max_cpu_usage, max_net_usage,
+            ref_block, delay_sec,
+            is_verbose=False)
+
+        logger.INFO('''
+            * push transaction with actions ``{}``:
+            '''.format(", ".join([action[0] for action in actions])))
+
+        self.action = result
+        try:
+            self._console = result.console
+            logger.DEBUG(self._console)
+        except:
+            pass
+
+        return result
 
     def show_action(
             self, action, data, permission=None,
@@ -347,7 +456,8 @@ class Account():
             self, table_name, scope="", 
             binary=False, 
             limit=10, lower="", upper="", index="",
-            key_type="", encode_type="", reverse=False, show_payer=False
+            key_type="", encode_type="", reverse=False, show_payer=False,
+            is_cached=True
             ):
         '''Retrieve the contents of a database table
 
@@ -376,6 +486,8 @@ class Account():
                 ripemd160 and sha256 is 'hex' only.
             reverse (bool): Iterate in reverse order.
             show_payer (bool): Show RAM payer.
+            is_cached (bool): If *False*, the responce is not taken from the 
+                cache, see :mod:`.cache`. Default is *True*.
 
         Returns:
             :class:`.cleos_set.SetTable` object
@@ -390,7 +502,7 @@ class Account():
                     binary, 
                     limit, lower, upper, index, 
                     key_type, encode_type, reverse, show_payer,
-                    is_verbose=False)
+                    is_verbose=False, is_cached=is_cached)
 
         try:
             account_map = manager.account_map()
@@ -402,6 +514,47 @@ class Account():
 
         return result
 
+    def iter_table(
+            self, table_name, scope="", 
+            lower="", upper="", index="",
+            key_type="", encode_type="", reverse=False, show_payer=False,
+            page_size=100):
+        '''Yield the rows of a database table, retrieved page by page.
+
+        See :func:`.cleos_get.iter_table`, and the arguments of the 
+        :meth:`table` method.
+
+        Yields:
+            json: The rows.
+        '''
+        stop_if_account_is_not_set(self)
+        return cleos_get.iter_table(
+            self, table_name, scope if scope else self,
+            lower, upper, index, key_type, encode_type, reverse, show_payer,
+            page_size)
+
+    def table_frame(
+            self, table_name, scope="", 
+            lower="", upper="", index="",
+            key_type="", encode_type="", reverse=False):
+        '''Retrieve a database table as columns, for bulk analysis.
+
+        See :class:`.table_frame.TableFrame`, and the arguments of the 
+        :meth:`table` method.
+
+        Returns:
+            :class:`.table_frame.TableFrame` object.
+        '''
+        stop_if_account_is_not_set(self)
+        return table_frame.TableFrame(
+            self, table_name, scope if scope else self,
+            lower, upper, index, key_type, encode_type, reverse)
+
+    async def table_async(self, *args, **kwargs):
+        '''Awaitable counterpart of the :meth:`table` method.
+        '''
+        return await cleos_async.run(self.table, *args, **kwargs)
+
     def buy_ram(
             self, amount_kbytes, receiver=None,
             expiration_sec=None, 
@@ -432,6 +585,11 @@ class Account():
             * Transfered RAM from {} to {} kbytes: {}
             '''.format(result.payer, result.receiver, result.amount))
 
+    async def buy_ram_async(self, *args, **kwargs):
+        '''Awaitable counterpart of the :meth:`buy_ram` method.
+        '''
+        return await cleos_async.run(self.buy_ram, *args, **kwargs)
+
     def delegate_bw(
             self, stake_net_quantity, stake_cpu_quantity,
             receiver=None,
@@ -468,6 +626,11 @@ class Account():
             result.payer, result.receiver,
             result.stake_net_quantity, result.stake_cpu_quantity))
 
+    async def delegate_bw_async(self, *args, **kwargs):
+        '''Awaitable counterpart of the :meth:`delegate_bw` method.
+        '''
+        return await cleos_async.run(self.delegate_bw, *args, **kwargs)
+
     def info(self):
         stop_if_account_is_not_set(self)
         msg = manager.accout_names_2_object_names(
@@ -480,23 +643,30 @@ class Account():
         msg = re.sub(r"(?<=^name: )\w+", self.name, msg, flags=re.M)
         print(msg)
 
-    def stats(self, params, last_col="%s", col="%15s", to_string=False):
-        def find(element, json):
-            try:
-                keys = element.split('.')
-                rv = json
-                for key in keys:
-                    rv = rv[key]
-            except:
-                rv = "n/a"
-            return rv
+    async def info_async(self):
+        '''Awaitable counterpart of the :meth:`info` method.
+        '''
+        return await cleos_async.run(self.info)
+
+    def stats(
+            self, params, last_col="%s", col="%15s", to_string=False,
+            to_table=False):
+        '''Print statistics of the account.
+
+        See :func:`print_stats`.
 
-        json = cleos.GetAccount(self, is_info=False, is_verbose=0).json
-        json["account_object_name"] = self.account_object_name
+        Args:
+            to_string (bool): If set, return the statistics as a string.
+            to_table (bool): If set, return the statistics as a table, see 
+                :func:`stats_table`.
+        '''
+        json = get_accounts([self])[0]
+        if to_table:
+            return stats_table([json], params)
 
         output = ""
         for param in params:
-            output = output + col % find(param, json)
+            output = output + col % find_stat(param, json)
             output = output + "  " + last_col % (param) + "\n"
          
         if to_string:
@@ -1046,8 +1216,8 @@ def put_account_to_wallet_and_on_stack(
 
     if account_object.owner_key:
         if wallet_singleton.keys_in_wallets(
-                [account_object.owner_key.key_private,
-                account_object.active_key.key_private]):
+                [account_object.owner_key.key_public,
+                account_object.active_key.key_public]):
             wallet_singleton.map_account(account_object)
         else:
             if wallet_singleton.import_key(account_object):
@@ -1067,23 +1237,24 @@ def put_account_to_wallet_and_on_stack(
 
 def print_stats(
         accounts, params, 
-        last_col="%s", col="%15s"
+        last_col="%s", col="%15s", to_table=False
     ):
-    def find(element, json):
-        try:
-            keys = element.split('.')
-            rv = json
-            for key in keys:
-                rv = rv[key]
-        except:
-            rv = "n/a"
-        return rv
+    '''Print statistics of the given accounts.
 
-    jsons = []
-    for account in accounts:
-        json = cleos.GetAccount(account, is_info=False, is_verbose=0).json
-        json["account_object_name"] = account.account_object_name
-        jsons.append(json)
+    The accounts are queried concurrently, once for all the *params*.
+
+    Args:
+        accounts (list): List of account objects.
+        params (list): List of *get account* JSON fields, for example 
+            *"net_limit.used"*.
+        last_col (str): Format of the parameter name column.
+        col (str): Format of the account columns.
+        to_table (bool): If set, return the statistics as a table, see 
+            :func:`stats_table`, rather than print them.
+    '''
+    jsons = get_accounts(accounts)
+    if to_table:
+        return stats_table(jsons, params)
 
     header = ""
     for json in jsons:
@@ -1092,11 +1263,113 @@ def print_stats(
 
     for param in params:
         for json in jsons:
-            output = output + col % find(param, json)
+            output = output + col % find_stat(param, json)
         output = output + "  " + last_col % (param) + "\n" 
 
     logger.OUT(output, translate=False)
-    
+
+
+def find_stat(param, json):
+    '''Find the given field of a *get account* JSON.
+
+    Args:
+        param (str): Dot-separated path, for example *"net_limit.used"*.
+        json (json): The *get account* JSON.
+
+    Returns:
+        The value found, or *"n/a"*.
+    '''
+    try:
+        keys = param.split('.')
+        rv = json
+        for key in keys:
+            rv = rv[key]
+    except:
+        rv = "n/a"
+    return rv
+
+
+def get_accounts(accounts):
+    '''Query the given accounts concurrently.
+
+    The number of concurrent queries is limited, see
+    :func:`.core.cleos_async.set_max_workers`.
+
+    Args:
+        accounts (list): List of account objects.
+
+    Returns:
+        list: The *get account* JSONs, in the order of the *accounts*, with the
+        *account_object_name* fields added.
+    '''
+    def get_account(account):
+        json = cleos.GetAccount(account, is_info=False, is_verbose=0).json
+        json["account_object_name"] = account.account_object_name
+        return json
+
+    if len(accounts) < 2:
+        return [get_account(account) for account in accounts]
+    return list(cleos_async.executor().map(get_account, accounts))
+
+
+def stats_table(jsons, params):
+    '''Extract numeric statistics from *get account* JSONs.
+
+    Asset values, like *"10.0000 EOS"*, are converted to their amounts, and 
+    missing values to *None*.
+
+    Args:
+        jsons (list): The JSONs returned by :func:`get_accounts`.
+        params (list): List of *get account* JSON fields.
+
+    Returns:
+        dict: Dictionary {<param>: {<account object name>: <value>}}.
+    '''
+    table = {}
+    for param in params:
+        row = {}
+        for json in jsons:
+            value = find_stat(param, json)
+            if isinstance(value, str):
+                try:
+                    value = float(value.split(" ")[0])
+                except ValueError:
+                    value = None
+            row[json["account_object_name"]] = value
+        table[param] = row
+
+    return table
+
+
+def diff_stats(before, after):
+    '''Compare two tables returned by :func:`print_stats`.
+
+    For example::
+
+        before = print_stats([alice, carol], ["ram_usage"], to_table=True)
+        host.push_action(...)
+        after = print_stats([alice, carol], ["ram_usage"], to_table=True)
+        print(diff_stats(before, after)["ram_usage"]["alice"])
+
+    Args:
+        before (dict): The earlier table.
+        after (dict): The later table.
+
+    Returns:
+        dict: The table of differences, *None* where a value is missing.
+    '''
+    table = {}
+    for param, row in after.items():
+        table[param] = {}
+        for name, value in row.items():
+            value_before = before.get(param, {}).get(name)
+            if value is None or value_before is None:
+                table[param][name] = None
+            else:
+                table[param][name] = value - value_before
+
+    return table
+
 
 def is_in_globals(account_object_name, globals):
     if account_object_name in globals and globals[account_object_name] and\
@@ -0,0 +1,202 @@
+import json
+
+import eosfactory.core.logger as logger
+import eosfactory.core.errors as errors
+import eosfactory.core.cleos as cleos
+
+
+__batch = None
+
+
+def current():
+    '''The batch being active, if any.
+    '''
+    return __batch
+
+
+def set_current(batch):
+    '''Activate the given batch, or none if *None*.
+
+    Returns:
+        The batch active previously, if any.
+    '''
+    global __batch
+    previous = __batch
+    __batch = batch
+    return previous
+
+
+class BatchedAction():
+    '''The result of an action pushed within a batch.
+
+    Its attributes are set when the batch is sent to the blockchain, that is,
+    when the batch is full, or at the latest, when the *with* block ends.
+
+    Attributes:
+        account_name (str): The EOSIO name of the contract's account.
+        action (json): The definition of the action.
+        transaction (.cleos.PushTransaction): The transaction that has
+            included the action.
+        trace (json): The trace of the action.
+        console (str): The *["console"]* component of the trace.
+        data (json): The *["act"]["data"]* component of the trace.
+    '''
+    def __init__(self, action):
+        self.account_name = action["account"]
+        self.action = action
+        self.transaction = None
+        self.trace = None
+        self.console = None
+        self.data = None
+
+    def set_trace(self, transaction, trace):
+        self.transaction = transaction
+        self.trace = trace
+        self.console = trace["console"]
+        self.data = trace["act"]["data"]
+
+    def __str__(self):
+        if self.transaction is None:
+            return "pending: {}".format(json.dumps(self.action))
+        return json.dumps(self.trace, indent=4)
+
+
+class Batch():
+    '''Coalesce actions into as few transactions as possible.
+
+    While the batch is active, see :func:`batch`, the *push_action* methods
+    of account and contract objects do not push transactions. Instead, they
+    queue the actions and return :class:`BatchedAction` objects.
+
+    A transaction is pushed whenever the queue reaches *max_actions* actions or
+    *max_size* bytes. If the blockchain rejects the transaction as exceeding
+    the NET or CPU limit, it is split in halves that are pushed one after
+    another.
+
+    Args:
+        max_actions (int): The maximum number of actions in a transaction.
+            Default is 100.
+        max_size (int): The maximum size of the JSON definitions of the
+            actions in a transaction, in bytes. The serialized transaction is
+            smaller. Default is 64kB.
+
+    See definitions of the remaining parameters: \
+    :func:`.cleos.common_parameters`.
+
+    Attributes:
+        transactions (list): The :class:`.cleos.PushTransaction` objects
+            pushed.
+    '''
+    def __init__(
+            self, max_actions=100, max_size=64 * 1024,
+            expiration_sec=None, force_unique=0,
+            max_cpu_usage=0, max_net_usage=0):
+        self.max_actions = max_actions
+        self.max_size = max_size
+        self.expiration_sec = expiration_sec
+        self.force_unique = force_unique
+        self.max_cpu_usage = max_cpu_usage
+        self.max_net_usage = max_net_usage
+        self.transactions = []
+        self.pending = []
+        self.size = 0
+        self.previous = None
+
+    def add(self, account, action, data, permission=None):
+        '''Queue an action.
+
+        Args:
+            account (str or .interface.Account): The account of the contract.
+            action (str): The name of the action.
+            data (str or json): The arguments to the contract.
+            permission: The authorization of the action, defaults to
+                *account*.
+
+        Returns:
+            :class:`BatchedAction` object.
+        '''
+        batched = BatchedAction(
+            cleos.action_json(account, action, data, permission))
+        size = len(json.dumps(batched.action))
+
+        if self.pending and self.size + size > self.max_size:
+            self.flush()
+
+        self.pending.append(batched)
+        self.size = self.size + size
+
+        if len(self.pending) >= self.max_actions:
+            self.flush()
+
+        return batched
+
+    def flush(self):
+        '''Push all the queued actions.
+        '''
+        pending = self.pending
+        self.pending = []
+        self.size = 0
+        if pending:
+            self.push(pending)
+
+    def push(self, batched_actions):
+        try:
+            result = cleos.PushTransaction(
+                [batched.action for batched in batched_actions],
+                self.expiration_sec,
+                force_unique=self.force_unique,
+                max_cpu_usage=self.max_cpu_usage,
+                max_net_usage=self.max_net_usage,
+                is_verbose=False)
+        except errors.TransactionTooBigError:
+            if len(batched_actions) == 1:
+                raise
+            half = len(batched_actions) // 2
+            logger.INFO('''
+            * Transaction with {} actions is too big, splitting it.
+            '''.format(len(batched_actions)))
+            self.push(batched_actions[:half])
+            self.push(batched_actions[half:])
+            return
+
+        for batched, trace in zip(batched_actions, result.traces):
+            batched.set_trace(result, trace)
+        self.transactions.append(result)
+
+        logger.INFO('''
+            * pushed transaction with {} actions:
+            {}
+            '''.format(len(batched_actions), result.transaction_id))
+
+    def __enter__(self):
+        self.previous = set_current(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        set_current(self.previous)
+        if exc_type is None:
+            self.flush()
+        else:
+            self.pending = []
+
+
+def batch(
+        max_actions=100, max_size=64 * 1024,
+        expiration_sec=None, force_unique=0,
+        max_cpu_usage=0, max_net_usage=0):
+    '''Coalesce the actions pushed within a *with* block.
+
+    For example::
+
+        with batch():
+            for i in range(0, 1000):
+                host.push_action("transfer", {...}, permission=alice)
+
+    See the arguments of the :class:`Batch` class.
+
+    Returns:
+        :class:`Batch` object, the context manager.
+    '''
+    return Batch(
+        max_actions, max_size, expiration_sec, force_unique,
+        max_cpu_usage, max_net_usage)
@@ -218,15 +218,32 @@ class Contract(ContractBuilder):
             action (str or json or filename): Definition of the action to 
                 execute on the contract.
             data (str): The arguments to the contract.
+            json (bool): Not used, the responce is always JSON.
 
         See definitions of the remaining parameters: \
         :func:`.cleos.common_parameters`.
         '''            
-        self.account.push_action(action, data,
+        return self.account.push_action(action, data,
             permission, expiration_sec,
             skip_sign, dont_broadcast, force_unique,
             max_cpu_usage, max_net_usage,
-            ref_block, json)
+            ref_block)
+
+    def push_actions(
+            self, actions,
+            expiration_sec=None, 
+            skip_sign=0, dont_broadcast=0, force_unique=0,
+            max_cpu_usage=0, max_net_usage=0,
+            ref_block=None, delay_sec=0):
+        '''Push a transaction with many actions.
+
+        See :meth:`.shell.account.Account.push_actions`.
+        '''
+        return self.account.push_actions(actions,
+            expiration_sec,
+            skip_sign, dont_broadcast, force_unique,
+            max_cpu_usage, max_net_usage,
+            ref_block, delay_sec)
 
     def show_action(self, action, data, permission=None):
         ''' Implements the `push action` command without broadcasting. 
@@ -259,6 +276,20 @@ class Contract(ContractBuilder):
             binary, 
             limit, key, lower, upper)
 
+    def iter_table(self, table_name, scope="", lower="", upper=""):
+        '''Yield the rows of a database table, retrieved page by page.
+
+        See :meth:`.shell.account.Account.iter_table`.
+        '''
+        return self.account.iter_table(table_name, scope, lower, upper)
+
+    def table_frame(self, table_name, scope="", lower="", upper=""):
+        '''Retrieve a database table as columns, for bulk analysis.
+
+        See :meth:`.shell.account.Account.table_frame`.
+        '''
+        return self.account.table_frame(table_name, scope, lower, upper)
+
     def code(self, code=None, abi=None, wasm=False):
         '''Retrieve the code and ABI
 
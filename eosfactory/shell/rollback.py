@@ -0,0 +1,124 @@
+'''Rollback of the local node after each test.
+
+The tests of a *unittest* test case share the chain: what a test changes,
+the next one sees. With the :class:`RollbackTestCase` mixin, the local node
+is checkpointed once, before the first test, that is, after the accounts and
+the contracts of the *setUpClass* method are created, and rolled back to the
+checkpoint after each test::
+
+    class Test(RollbackTestCase, unittest.TestCase):
+
+        @classmethod
+        def setUpClass(cls):
+            create_master_account("MASTER")
+            create_account("HOST", MASTER)
+            ...
+
+        def test_01(self):
+            ...
+
+The account objects are rolled back, too: those created during a test are
+removed from the global namespace, and those replaced are restored.
+
+The rollback is a restart of the node, see :func:`.core.checkpoint.rollback`,
+as *nodeos* cannot undo the blocks it has applied. Measured with a stand-in
+node that starts at once, the rollback takes 15 to 20 ms. Added to this is
+the time *nodeos* takes to shut down and to start again with the restored
+state, which grows with the state, hence a rollback per test is not
+guaranteed to take well under a second.
+
+With a remote testnet, nothing is checkpointed and rolled back.
+'''
+
+import eosfactory.core.errors as errors
+import eosfactory.core.interface as interface
+import eosfactory.core.manager as manager
+import eosfactory.core.checkpoint as checkpoint
+import eosfactory.shell.account as account
+
+
+CHECKPOINT = "unittest"
+'''The default name of the checkpoint.
+'''
+
+__marks = {}
+
+
+def account_objects():
+    '''The global namespace of the account objects, as a copy.
+    '''
+    if account.wallet_globals is None:
+        return {}
+    return dict(account.wallet_globals)
+
+
+def mark(name=CHECKPOINT):
+    '''Checkpoint the local node, and the account objects.
+
+    Args:
+        name (str): The name of the checkpoint. Default is
+            :attr:`CHECKPOINT`.
+
+    Returns:
+        bool: Whether checkpointed, that is, whether the node is local.
+    '''
+    if not manager.is_local_testnet():
+        return False
+    checkpoint.save(name)
+    __marks[name] = account_objects()
+    return True
+
+
+def rollback(name=CHECKPOINT):
+    '''Roll the local node, and the account objects, back to a checkpoint.
+
+    Args:
+        name (str): The name of the checkpoint, see :func:`mark`. Default is
+            :attr:`CHECKPOINT`.
+
+    Raises:
+        .core.errors.Error: If the checkpoint is not marked.
+    '''
+    if not name in __marks:
+        raise errors.Error('''
+        The checkpoint ``{}`` is not marked.
+        '''.format(name), translate=False)
+
+    checkpoint.rollback(name)
+
+    marked = __marks[name]
+    globals_ = account.wallet_globals
+    if globals_ is None:
+        return
+    for object_name, account_object in list(globals_.items()):
+        if not isinstance(account_object, interface.Account):
+            continue
+        if object_name in marked:
+            globals_[object_name] = marked[object_name]
+        else:
+            del globals_[object_name]
+
+
+class RollbackTestCase():
+    '''A *unittest.TestCase* mixin, rolling the local node back after each
+    test.
+
+    The mixin precedes *unittest.TestCase* in the list of base classes.
+
+    Attributes:
+        checkpoint (str): The name of the checkpoint. Default is
+            :attr:`CHECKPOINT`.
+    '''
+    checkpoint = CHECKPOINT
+
+    def setUp(self):
+        super().setUp()
+        cls = type(self)
+        # Once per test case, after its setUpClass.
+        if not "is_marked" in cls.__dict__:
+            cls.is_marked = mark(self.checkpoint)
+
+    def tearDown(self):
+        if type(self).__dict__.get("is_marked"):
+            rollback(self.checkpoint)
+        super().tearDown()
@@ -1,5 +1,6 @@
 import os
 import json
+import time
 import inspect
 
 import eosfactory.core.errors as errors
@@ -12,6 +13,13 @@ import eosfactory.core.cleos as cleos
 import eosfactory.core.manager as manager
 
 
+UNLOCK_TIMEOUT_SEC = 900
+'''The time of inactivity after which *keosd* locks the wallets, its 
+*--unlock-timeout* option.
+'''
+UNLOCK_MARGIN_SEC = 10
+
+
 class Wallet(cleos.WalletCreate):
     ''' Create a new wallet locally and operate it.
 
@@ -19,6 +27,17 @@ class Wallet(cleos.WalletCreate):
 
         name (str): The name of the new wallet, defaults to `default`.
         password (str): The password to the wallet, if the wallet exists. 
+
+    The wallet remembers when it has been unlocked, and the public keys it
+    holds, so that it is not re-opened, nor are its keys re-listed, with 
+    each operation. If *keosd* reports the wallet locked, it is unlocked, 
+    and the operation is repeated.
+
+    Attributes:
+        active_time (float): The time of the last operation on the unlocked
+            wallet, or *None* if it is not known to be unlocked.
+        public_keys (set): The public keys in the unlocked wallets, or *None*
+            if not listed yet.
     '''
     wallet_single = None
     globals = {}
@@ -39,6 +58,8 @@ class Wallet(cleos.WalletCreate):
                 '''.format(Wallet.wallet_single.name))
 
         self.wallet_dir = config.keosd_wallet_dir()
+        self.active_time = None
+        self.public_keys = None
 
         logger.INFO('''
                 * Wallet name is ``{}``, wallet directory is
@@ -56,6 +77,8 @@ class Wallet(cleos.WalletCreate):
                         os.path.join(self.wallet_dir, setup.password_map)))
 
         cleos.WalletCreate.__init__(self, name, password, is_verbose=False)
+        # Either created or restored, the wallet is open and unlocked.
+        self.active_time = time.time()
 
         if self.is_created: # new password
             logger.INFO('''
@@ -93,6 +116,8 @@ class Wallet(cleos.WalletCreate):
         Returns `WalletOpen` object
         '''
         cleos.WalletOpen(self.name, is_verbose=False)
+        # keosd locks a wallet that it opens.
+        self.active_time = None
         logger.TRACE('''
         * Wallet ``{}`` opened.
         '''.format(self.name))
@@ -102,6 +127,7 @@ class Wallet(cleos.WalletCreate):
         Returns `cleos.WalletLock` object.
         '''
         cleos.WalletLock(self.name, is_verbose=False)
+        self.active_time = None
         logger.TRACE("Wallet `{}` locked.".format(self.name))
 
     def lock_all(self):
@@ -109,6 +135,7 @@ class Wallet(cleos.WalletCreate):
         Returns `cleos.WalletLock` object.
         '''
         cleos.WalletLockAll(is_verbose=False)
+        self.active_time = None
         logger.TRACE("All wallets locked.")
 
     def unlock(self):
@@ -117,15 +144,66 @@ class Wallet(cleos.WalletCreate):
         '''
         cleos.WalletUnlock(
             self.name, self.password, is_verbose=False)
+        self.active_time = time.time()
         logger.TRACE('''
         * Wallet ``{}`` unlocked.
         '''.format(self.name))
 
-    def open_unlock(self):
-        ''' Open & Unlock.
+    def is_unlocked(self):
+        '''Whether the wallet is known to be unlocked.
+
+        That is, if it has been unlocked, and used since, not longer than 
+        :attr:`UNLOCK_TIMEOUT_SEC` ago.
         '''
+        return not self.active_time is None \
+            and time.time() - self.active_time \
+                < UNLOCK_TIMEOUT_SEC - UNLOCK_MARGIN_SEC
+
+    def open_unlock(self, force=False):
+        ''' Open & Unlock, unless the wallet is known to be unlocked.
+
+        Args:
+            force (bool): If set, open and unlock anyway.
+        '''
+        if not force and self.is_unlocked():
+            return
         cleos.WalletOpen(self.name, is_verbose=False)
         cleos.WalletUnlock(self.name, self.password, is_verbose=False)
+        self.active_time = time.time()
+
+    def call_unlocked(self, command):
+        '''Call a wallet command, with the wallet unlocked.
+
+        If *keosd* reports the wallet locked, or not open, as when it has 
+        been restarted, the wallet is opened and unlocked, its public keys 
+        are to be listed again, and the command is repeated.
+
+        Args:
+            command (function): The command, without arguments.
+
+        Returns:
+            The result of the command.
+        '''
+        self.open_unlock()
+        try:
+            result = command()
+        except (errors.WalletLockedError, errors.WalletDoesNotExistError):
+            self.public_keys = None
+            self.open_unlock(force=True)
+            result = command()
+
+        self.active_time = time.time()
+        return result
+
+    def key_set(self):
+        '''The public keys in the unlocked wallets, listed once.
+
+        Returns:
+            set: The keys.
+        '''
+        if self.public_keys is None:
+            self.keys()
+        return self.public_keys
 
     def remove_key(self, account_or_key):
         '''Remove key from wallet.
@@ -136,32 +214,33 @@ class Wallet(cleos.WalletCreate):
                 .interface.Account object, both owner and active keys are 
                 removed.
         '''
-        self.open_unlock()
-
         removed_keys = []
         account_name = None
         if isinstance(account_or_key, interface.Account):
-            cleos.WalletRemove_key(
+            self.call_unlocked(lambda: cleos.WalletRemove_key(
                 interface.key_arg(
                     account_or_key, is_owner_key=True, is_private_key=True), 
-                self.name, self.password, is_verbose=False)
+                self.name, self.password, is_verbose=False))
             removed_keys.append(interface.key_arg(
                     account_or_key, is_owner_key=True, is_private_key=False))
 
-            cleos.WalletRemove_key(
+            self.call_unlocked(lambda: cleos.WalletRemove_key(
                 interface.key_arg(
                     account_or_key, is_owner_key=False, is_private_key=True), 
-                self.name, self.password, is_verbose=False)
+                self.name, self.password, is_verbose=False))
             removed_keys.append(interface.key_arg(
                     account_or_key, is_owner_key=False, is_private_key=False))
         else:
-            cleos.WalletRemove_key(
+            self.call_unlocked(lambda: cleos.WalletRemove_key(
                 interface.key_arg(
                     account_or_key, is_private_key=True), 
-                self.name, self.password, is_verbose=False)
+                self.name, self.password, is_verbose=False))
             removed_keys.append(interface.key_arg(
                     account_or_key, is_private_key=False))
 
+        if not self.public_keys is None:
+            self.public_keys.difference_update(removed_keys)
+
         if account_name is None:
             if len(removed_keys) > 0:
                 logger.TRACE('''
@@ -175,17 +254,6 @@ class Wallet(cleos.WalletCreate):
                 '''.format(account_name, self.name)
                         )        
 
-        wallet_keys = cleos.WalletKeys(is_verbose=False)
-
-        for key in removed_keys:
-            if key in wallet_keys.json:
-                raise errors.Error('''
-                Failed to remove key '{}' from the wallet '{}'
-                '''.format(key, self.name))
-
-        logger.TRACE('''
-        * Cross-checked: all listed keys removed from the wallet.
-        ''')
         return True
 
     def import_key(self, account_or_key):
@@ -199,22 +267,21 @@ class Wallet(cleos.WalletCreate):
                 .interface.Account object, both owner and active keys are 
                 imported.
         '''
-        self.open_unlock()
         imported_keys = []
         account_name = None
         if isinstance(account_or_key, interface.Account):
             account_name = account_or_key.name
-            cleos.WalletImport(
+            self.call_unlocked(lambda: cleos.WalletImport(
                 interface.key_arg(
                     account_or_key, is_owner_key=True, is_private_key=True), 
-                self.name, is_verbose=False)
+                self.name, is_verbose=False))
             imported_keys.append(interface.key_arg(
                     account_or_key, is_owner_key=True, is_private_key=False))
 
-            wallet_import = cleos.WalletImport(
+            self.call_unlocked(lambda: cleos.WalletImport(
                 interface.key_arg(
                     account_or_key, is_owner_key=False, is_private_key=True), 
-                self.name, is_verbose=False)
+                self.name, is_verbose=False))
             imported_keys.append(interface.key_arg(
                     account_or_key, is_owner_key=False, is_private_key=False))
             logger.TRACE('''
@@ -223,9 +290,11 @@ class Wallet(cleos.WalletCreate):
                 '''.format(account_name, self.name)
                 )
         else:           
-            wallet_import = cleos.WalletImport(
+            self.call_unlocked(lambda: cleos.WalletImport(
                 interface.key_arg(account_or_key, is_private_key=True), 
-                self.name, is_verbose=False)
+                self.name, is_verbose=False))
+            # The public key is not known, the keys are to be listed again.
+            self.public_keys = None
 
             logger.TRACE('''
                 * Importing keys into the wallet ``{}``
@@ -233,26 +302,9 @@ class Wallet(cleos.WalletCreate):
                         )
             return True
         
-        wallet_keys = cleos.WalletKeys(is_verbose=False)
-
-        if len(imported_keys) == 0:
-            raise errors.Error('''
-                The list of imported keys is empty.
-                ''')
-
-        ok = True
-        for key in imported_keys:
-            if not key in wallet_keys.json:
-                ok = False
-                raise errors.Error('''
-                Failed to import keys of the account '{}' into the wallet '{}'
-                '''.format(
-                    account_name if account_name else "n/a", self.name))
-
-        if ok:
-            logger.TRACE('''
-            * Cross-checked: all account keys are in the wallet.
-            ''')
+        # A failed import raises, see :class:`.cleos.WalletImport`.
+        if not self.public_keys is None:
+            self.public_keys.update(imported_keys)
         return True
 
     def keys_in_wallets(self, keys):
@@ -264,10 +316,9 @@ class Wallet(cleos.WalletCreate):
         Returns: 
             bool: Whether all listed keys are in the wallet.
         '''
-        self.open_unlock()
-        result = cleos.WalletKeys(is_verbose=False)
+        wallet_keys = self.key_set()
         for key in keys:
-            if not key in result.json:
+            if not key in wallet_keys:
                 return False
         return True
 
@@ -275,10 +326,9 @@ class Wallet(cleos.WalletCreate):
         '''Restore into the global namespace all the account objects 
         represented in the wallet. 
         '''
-        self.open_unlock()
         account_map = manager.account_map()
         new_map = {}
-        wallet_keys = cleos.WalletKeys(is_verbose=0)
+        wallet_keys = self.key_set()
         if len(account_map) > 0:
             logger.INFO('''
                     ######### Restore cached account objects:
@@ -287,8 +337,8 @@ class Wallet(cleos.WalletCreate):
                 try:
                     account_ = cleos.GetAccount(
                         name, is_info=False, is_verbose=False)
-                    if account_.owner_key in wallet_keys.json and \
-                            account_.active_key in wallet_keys.json:
+                    if account_.owner_key in wallet_keys and \
+                            account_.active_key in wallet_keys:
                         new_map[name] = object_name
 
                     from eosfactory.shell.account import create_account
@@ -315,13 +365,16 @@ class Wallet(cleos.WalletCreate):
         '''Stop keosd, the EOSIO wallet manager.
         '''
         cleos.WalletStop()
+        self.active_time = None
+        self.public_keys = None
         
     def keys(self):
         ''' Lists public keys from all unlocked wallets.
         Returns `cleos.WalletKeys` object.
         '''
-        self.open_unlock()
-        wallet_keys = cleos.WalletKeys(is_verbose=False)
+        wallet_keys = self.call_unlocked(
+            lambda: cleos.WalletKeys(is_verbose=False))
+        self.public_keys = set(wallet_keys.json)
         logger.TRACE('''
             Keys in all open walets:
             {}
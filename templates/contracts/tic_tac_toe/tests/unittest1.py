@@ -1,4 +1,4 @@
-import unittest, argparse, sys, time
+import unittest, argparse, sys
 from eosfactory.eosf import *
 
 verbosity([Verbosity.INFO, Verbosity.OUT, Verbosity.TRACE])
@@ -15,7 +15,7 @@ HOST = Account()
 ALICE = Account()
 CAROL = Account()
 
-class Test(unittest.TestCase):
+class Test(RollbackTestCase, unittest.TestCase):
 
     @classmethod
     def stats(cls):
@@ -69,60 +69,25 @@ class Test(unittest.TestCase):
         except errors.ContractRunningError:
             pass
 
-    def test_01(self):
+    def create(self):
         COMMENT('''
-        Attempting to create a new game.
-        This might fail if the previous game has not been closes properly:
+        Create a new game. Each test starts with no game, as the local node
+        is rolled back after each test:
         ''')
-        try:
-            HOST.push_action(
-                "create",
-                {
-                    "challenger": ALICE,
-                    "host": CAROL
-                },
-                permission=(CAROL, Permission.ACTIVE))
-        except Error as e:
-            if "game already exists" in e.message:
-                COMMENT('''
-                We need to close the previous game before creating a new one:
-                ''')
-                HOST.push_action(
-                    "close",
-                    {
-                        "challenger": ALICE,
-                        "host": CAROL
-                    },
-                    permission=(CAROL, Permission.ACTIVE))
-
-                time.sleep(3)
-
-                COMMENT('''
-                Second attempt to create a new game:
-                ''')
-                HOST.push_action(
-                    "create",
-                    {
-                        "challenger": ALICE, 
-                        "host": CAROL
-                    },
-                    permission=(CAROL, Permission.ACTIVE))
-            else:
-                COMMENT('''
-                The error is different than expected.
-                ''')
-                raise Error(str(e))
-
-        table = HOST.table("games", CAROL)
-        self.assertEqual(table.json["rows"][0]["board"][0], 0)
-        self.assertEqual(table.json["rows"][0]["board"][1], 0)
-        self.assertEqual(table.json["rows"][0]["board"][2], 0)
-        self.assertEqual(table.json["rows"][0]["board"][3], 0)
-        self.assertEqual(table.json["rows"][0]["board"][4], 0)
-        self.assertEqual(table.json["rows"][0]["board"][5], 0)
-        self.assertEqual(table.json["rows"][0]["board"][6], 0)
-        self.assertEqual(table.json["rows"][0]["board"][7], 0)
-        self.assertEqual(table.json["rows"][0]["board"][8], 0)
+        HOST.push_action(
+            "create",
+            {
+                "challenger": ALICE,
+                "host": CAROL
+            },
+            permission=(CAROL, Permission.ACTIVE))
+
+    def board(self):
+        return HOST.table("games", CAROL).json["rows"][0]["board"]
+
+    def test_01(self):
+        self.create()
+        self.assertEqual(self.board(), [0] * 9)
 
         COMMENT('''
         First move is by CAROL:
@@ -150,16 +115,7 @@ class Test(unittest.TestCase):
             },
             permission=(ALICE, Permission.ACTIVE))
 
-        table = HOST.table("games", CAROL)
-        self.assertEqual(table.json["rows"][0]["board"][0], 1)
-        self.assertEqual(table.json["rows"][0]["board"][1], 0)
-        self.assertEqual(table.json["rows"][0]["board"][2], 0)
-        self.assertEqual(table.json["rows"][0]["board"][3], 0)
-        self.assertEqual(table.json["rows"][0]["board"][4], 2)
-        self.assertEqual(table.json["rows"][0]["board"][5], 0)
-        self.assertEqual(table.json["rows"][0]["board"][6], 0)
-        self.assertEqual(table.json["rows"][0]["board"][7], 0)
-        self.assertEqual(table.json["rows"][0]["board"][8], 0)
+        self.assertEqual(self.board(), [1, 0, 0, 0, 2, 0, 0, 0, 0])
 
         COMMENT('''
         Restarting the game:
@@ -173,17 +129,15 @@ class Test(unittest.TestCase):
             }, 
             permission=(CAROL, Permission.ACTIVE))
 
-        table = HOST.table("games", CAROL)
-        self.assertEqual(table.json["rows"][0]["board"][0], 0)
-        self.assertEqual(table.json["rows"][0]["board"][1], 0)
-        self.assertEqual(table.json["rows"][0]["board"][2], 0)
-        self.assertEqual(table.json["rows"][0]["board"][3], 0)
-        self.assertEqual(table.json["rows"][0]["board"][4], 0)
-        self.assertEqual(table.json["rows"][0]["board"][5], 0)
-        self.assertEqual(table.json["rows"][0]["board"][6], 0)
-        self.assertEqual(table.json["rows"][0]["board"][7], 0)
-        self.assertEqual(table.json["rows"][0]["board"][8], 0)
-        
+        self.assertEqual(self.board(), [0] * 9)
+
+    def test_02(self):
+        COMMENT('''
+        The game of the previous test is left open, yet it is gone:
+        ''')
+        self.create()
+        self.assertEqual(self.board(), [0] * 9)
+
         COMMENT('''
         Closing the game:
         WARNING: This action should fail due to authority mismatch!
@@ -208,6 +162,23 @@ class Test(unittest.TestCase):
             },
             permission=(CAROL, Permission.ACTIVE))
 
+        self.assertFalse(HOST.table("games", CAROL).json["rows"])
+
+    def tearDown(self):
+        if not testnet.is_local() \
+                and HOST.table("games", CAROL).json["rows"]:
+            COMMENT('''
+            A remote testnet is not rolled back, close the game:
+            ''')
+            HOST.push_action(
+                "close",
+                {
+                    "challenger": ALICE,
+                    "host": CAROL
+                },
+                permission=(CAROL, Permission.ACTIVE))
+        super().tearDown()
+
     @classmethod
     def tearDownClass(cls):
         if testnet.is_local():
@@ -134,7 +134,7 @@ class Test(unittest.TestCase):
                     },
                     permission=(Test.carol, Permission.ACTIVE))
 
-                time.sleep(3)
+                wait_for_inclusion(Test.host.action)
 
                 COMMENT('''
                 Second attempt to create a new game:
@@ -114,7 +114,7 @@ class Test(unittest.TestCase):
                     },
                     permission=(CAROL, Permission.ACTIVE))
 
-                time.sleep(3)
+                wait_for_inclusion(HOST.action)
 
                 COMMENT('''
                 Second attempt to create a new game:
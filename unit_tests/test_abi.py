@@ -0,0 +1,208 @@
+'''Node-free tests of the packing of action data with contract ABIs, and of
+the ABI cache.
+
+Run with *python3 -m unittest unit_tests/test_abi.py*.
+'''
+import unittest
+import unittest.mock
+
+import eosfactory.core.errors as errors
+import eosfactory.core.setup as setup
+import eosfactory.core.abi as abi
+
+
+TOKEN_ABI = {
+    "version": "eosio::abi/1.1",
+    "types": [
+        {"new_type_name": "account_name", "type": "name"},
+        {"new_type_name": "owner", "type": "account_name"}
+    ],
+    "structs": [
+        {
+            "name": "transfer", "base": "",
+            "fields": [
+                {"name": "from", "type": "account_name"},
+                {"name": "to", "type": "name"},
+                {"name": "quantity", "type": "asset"},
+                {"name": "memo", "type": "string"}
+            ]
+        },
+        {
+            "name": "account", "base": "",
+            "fields": [{"name": "owner", "type": "owner"}]
+        },
+        {
+            "name": "balance", "base": "account",
+            "fields": [{"name": "amount", "type": "uint64"}]
+        },
+        {
+            "name": "options", "base": "",
+            "fields": [
+                {"name": "ids", "type": "uint16[]"},
+                {"name": "note", "type": "string?"},
+                {"name": "value", "type": "value"},
+                {"name": "extra", "type": "uint8$"}
+            ]
+        }
+    ],
+    "variants": [
+        {"name": "value", "types": ["uint64", "string"]}
+    ],
+    "actions": [
+        {"name": "transfer", "type": "transfer", "ricardian_contract": ""},
+        {"name": "options", "type": "options", "ricardian_contract": ""}
+    ]
+}
+
+ALICE_HEX = "0000000000855c34"
+BOB_HEX = "0000000000000e3d"
+
+
+class TestPack(unittest.TestCase):
+
+    def setUp(self):
+        self.abi = abi.Abi(TOKEN_ABI, "eosio.token")
+
+    def test_typedef(self):
+        self.assertEqual(self.abi.resolve("owner"), "name")
+        self.assertEqual(self.abi.pack("owner", "alice").hex(), ALICE_HEX)
+
+    def test_circular_typedef(self):
+        circular = abi.Abi({"types": [
+            {"new_type_name": "a", "type": "b"},
+            {"new_type_name": "b", "type": "a"}]})
+        with self.assertRaises(errors.Error):
+            circular.pack("a", 1)
+
+    def test_transfer(self):
+        self.assertEqual(
+            self.abi.pack_action("transfer", {
+                "from": "alice", "to": "bob", "quantity": "1.0000 EOS",
+                "memo": "hi"}).hex(),
+            ALICE_HEX + BOB_HEX + "102700000000000004454f5300000000"
+                + "026869")
+
+    def test_base(self):
+        self.assertEqual(
+            self.abi.pack("balance", {"owner": "alice", "amount": 7}).hex(),
+            ALICE_HEX + "0700000000000000")
+
+    def test_extensions(self):
+        self.assertEqual(
+            self.abi.pack_action("options", {
+                "ids": [1, 2], "note": None, "value": ["uint64", 5],
+                "extra": 9}).hex(),
+            "02" "0100" "0200" "00" "00" "0500000000000000" "09")
+        self.assertEqual(
+            self.abi.pack_action("options", {
+                "ids": [], "note": "hi", "value": ["string", "hi"]}).hex(),
+            "00" "01026869" "01026869")
+
+    def test_errors(self):
+        with self.assertRaises(errors.Error):
+            self.abi.pack_action("issue", {})
+        with self.assertRaises(errors.Error):
+            self.abi.pack_action("transfer", {"from": "alice"})
+        with self.assertRaises(errors.Error):
+            self.abi.pack("value", ["uint32", 5])
+        with self.assertRaises(errors.Error):
+            self.abi.pack("unknown", 5)
+        with self.assertRaises(errors.Error):
+            self.abi.pack("uint64", "five")
+
+
+class TestCache(unittest.TestCase):
+    '''The cached ABIs are keyed with the node and the account, and checked
+    against the hashes on the node.
+    '''
+    NODE = "http://127.0.0.1:8888"
+    OTHER_NODE = "http://127.0.0.1:8889"
+
+    def setUp(self):
+        abi.invalidate()
+        setup.set_nodeos_address(self.NODE)
+
+    def tearDown(self):
+        abi.invalidate()
+        setup.reboot()
+
+    def requests(self, account_name, code_hash=None):
+        '''The endpoints that *abi.get* calls.
+        '''
+        with unittest.mock.patch.object(abi.http_api, "ChainApi") as chain_api:
+            chain_api.return_value.json = {
+                "abi": TOKEN_ABI, "code_hash": "11", "abi_hash": "a1"}
+            abi.get(account_name, code_hash)
+            return [call[0][0] for call in chain_api.call_args_list]
+
+    def fetched(self, account_name, code_hash=None):
+        '''Whether *abi.get* asks the node for the ABI.
+        '''
+        return "get_abi" in self.requests(account_name, code_hash)
+
+    def age(self, account_name):
+        with unittest.mock.patch.object(abi.http_api, "ChainApi"):
+            abi.get(account_name).time -= abi.CHECK_INTERVAL_SEC + 1
+
+    def test_get(self):
+        registered = abi.register("eosio.token", TOKEN_ABI)
+        self.assertIs(abi.get("eosio.token"), registered)
+        self.assertTrue(self.fetched("alice"))
+        self.assertFalse(self.fetched("alice"))
+
+    def test_code_hash(self):
+        abi.register("eosio.token", TOKEN_ABI, "00")
+        self.assertFalse(self.fetched("eosio.token", "00"))
+        self.assertTrue(self.fetched("eosio.token", "11"))
+        self.assertEqual(abi.get("eosio.token").code_hash, "11")
+
+    def test_check(self):
+        abi.register("eosio.token", TOKEN_ABI, "11", "a1")
+        self.assertEqual(self.requests("eosio.token"), [])
+        self.age("eosio.token")
+        self.assertEqual(self.requests("eosio.token"), ["get_raw_abi"])
+        self.assertEqual(self.requests("eosio.token"), [])
+
+    def test_check_changed(self):
+        # For example, set by another process.
+        abi.register("eosio.token", TOKEN_ABI, "00", "a0")
+        self.age("eosio.token")
+        self.assertEqual(
+            self.requests("eosio.token"),
+            ["get_raw_abi", "get_raw_abi", "get_abi"])
+        self.assertEqual(abi.get("eosio.token").abi_hash, "a1")
+
+    def test_check_unknown_hash(self):
+        # As read from an ABI file.
+        abi.register("eosio.token", TOKEN_ABI)
+        self.assertFalse(self.fetched("eosio.token"))
+        self.age("eosio.token")
+        self.assertTrue(self.fetched("eosio.token"))
+
+    def test_node(self):
+        abi.register("eosio.token", TOKEN_ABI)
+        setup.set_nodeos_address(self.OTHER_NODE)
+        self.assertTrue(self.fetched("eosio.token"))
+        setup.set_nodeos_address(self.NODE)
+        self.assertFalse(self.fetched("eosio.token"))
+
+    def test_invalidate(self):
+        abi.register("eosio.token", TOKEN_ABI)
+        abi.register("alice", TOKEN_ABI)
+        abi.invalidate("eosio.token")
+        self.assertTrue(self.fetched("eosio.token"))
+        self.assertFalse(self.fetched("alice"))
+
+        abi.invalidate()
+        self.assertTrue(self.fetched("alice"))
+
+    def test_invalidate_node(self):
+        abi.register("eosio.token", TOKEN_ABI)
+        setup.set_nodeos_address(self.OTHER_NODE)
+        abi.invalidate("eosio.token")
+        setup.set_nodeos_address(self.NODE)
+        self.assertFalse(self.fetched("eosio.token"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+'''Node-free tests of the block store files.
+
+Run with *python3 -m unittest unit_tests/test_block_store.py*.
+'''
+import os
+import json
+import shutil
+import tempfile
+import unittest
+
+import eosfactory.core.block_store as block_store
+
+
+NODE = "http://127.0.0.1:8888"
+OTHER_NODE = "http://127.0.0.1:8889"
+CHAIN_ID = "cf" * 32
+
+
+class TestClear(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = os.path.join(tempfile.mkdtemp(), "blocks")
+        block_store.configure(self.directory)
+
+    def tearDown(self):
+        shutil.rmtree(os.path.dirname(self.directory))
+        block_store.configure()
+
+    def test_not_created(self):
+        # For example, reset() clears the store, whether enabled or not.
+        block_store.clear(NODE)
+        block_store.clear()
+        block_store.evict()
+        self.assertFalse(os.path.exists(self.directory))
+
+    def test_per_node(self):
+        for address in [NODE, OTHER_NODE]:
+            os.makedirs(os.path.join(
+                self.directory, block_store.chain_key(address, CHAIN_ID)))
+        block_store.write_chains({NODE: CHAIN_ID, OTHER_NODE: CHAIN_ID})
+
+        block_store.clear(NODE)
+        self.assertEqual(
+            sorted(os.listdir(self.directory)),
+            sorted([
+                block_store.LOCK_FILE, block_store.CHAINS_JSON,
+                block_store.chain_key(OTHER_NODE, CHAIN_ID)]))
+        with open(os.path.join(self.directory, block_store.CHAINS_JSON)) as f:
+            self.assertEqual(json.load(f), {OTHER_NODE: CHAIN_ID})
+
+
+if __name__ == '__main__':
+    unittest.main()
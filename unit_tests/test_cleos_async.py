@@ -0,0 +1,83 @@
+'''Node-free tests of the awaitable *EOSIO cleos* commands, spawning a
+stand-in *cleos*.
+
+Run with *python3 -m unittest unit_tests/test_cleos_async.py*.
+'''
+import os
+import sys
+import stat
+import shutil
+import tempfile
+import unittest
+
+import eosfactory.core.setup as setup
+import eosfactory.core.config as config
+import eosfactory.core.cache as cache
+import eosfactory.core.cleos_async as cleos_async
+
+
+CLEOS = '''#!{}
+import sys, json
+with open(__file__ + ".log", "a") as f:
+    f.write(" ".join(sys.argv[1:]) + "\\n")
+print(json.dumps({{"account_name": sys.argv[-1], "args": sys.argv[1:]}}))
+'''
+
+
+class TestAsyncCleos(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.cleos = os.path.join(self.directory, "cleos")
+        with open(self.cleos, "w") as f:
+            f.write(CLEOS.format(sys.executable))
+        os.chmod(self.cleos, os.stat(self.cleos).st_mode | stat.S_IEXEC)
+
+        self.path = os.environ["PATH"]
+        os.environ["PATH"] = self.directory + os.pathsep + self.path
+        config.clear_cache()
+        setup.set_nodeos_address("http://127.0.0.1:18888")
+
+    def tearDown(self):
+        os.environ["PATH"] = self.path
+        config.clear_cache()
+        cache.enable(False)
+        setup.reboot()
+        shutil.rmtree(self.directory)
+
+    def spawned(self):
+        with open(self.cleos + ".log") as f:
+            return f.read().splitlines()
+
+    def test_wait(self):
+        alice, bob = cleos_async.wait(
+            cleos_async.AsyncCleos(["alice"], "get", "account"),
+            cleos_async.AsyncCleos(["bob"], "get", "account"))
+        self.assertEqual(alice.json["account_name"], "alice")
+        self.assertEqual(bob.json["account_name"], "bob")
+        self.assertEqual(len(self.spawned()), 2)
+
+    def test_wait_again(self):
+        # Each call runs a loop of its own.
+        for _ in range(2):
+            result, = cleos_async.wait(
+                cleos_async.AsyncCleos(["alice"], "get", "account"))
+            self.assertEqual(result.json["account_name"], "alice")
+        self.assertEqual(len(self.spawned()), 2)
+
+    def test_cache(self):
+        cache.enable()
+        first, = cleos_async.wait(
+            cleos_async.AsyncCleos(["alice"], "get", "account"))
+        second, = cleos_async.wait(
+            cleos_async.AsyncCleos(["alice"], "get", "account"))
+        self.assertEqual(second.json, first.json)
+        self.assertEqual(len(self.spawned()), 1)
+
+        cleos_async.wait(cleos_async.AsyncCleos(
+            ["alice"], "get", "account", is_cached=False))
+        self.assertEqual(len(self.spawned()), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
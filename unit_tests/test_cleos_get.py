@@ -0,0 +1,107 @@
+'''Node-free tests of the action history scan, with a history of receipts.
+
+Run with *python3 -m unittest unit_tests/test_cleos_get.py*.
+'''
+import os
+import tempfile
+import unittest
+import unittest.mock
+
+import eosfactory.core.cleos_get as cleos_get
+
+
+TRANSFER = {
+    "account": "eosio.token", "name": "transfer",
+    "data": {
+        "from": "alice", "to": "bob", "quantity": "1.0000 EOS", "memo": ""}}
+
+
+def receipt(seq, trx_id, receiver, ordinal, ancestor, digest="d1", act=None):
+    '''An action of the history of *alice*, as *get_actions* responds it.
+    '''
+    return {
+        "account_action_seq": seq,
+        "action_trace": {
+            "trx_id": trx_id,
+            "action_ordinal": ordinal,
+            "closest_unnotified_ancestor_action_ordinal": ancestor,
+            "receiver": receiver,
+            "act": act or TRANSFER,
+            "receipt": {
+                "receiver": receiver, "act_digest": digest,
+                "global_sequence": 100 + seq}}}
+
+
+# Two identical transfers from alice in a transaction: each executed by the
+# token contract, and notified to alice. Then a transfer in another one.
+HISTORY = [
+    receipt(0, "t1", "eosio.token", 1, 0),
+    receipt(1, "t1", "alice", 3, 1),
+    receipt(2, "t1", "eosio.token", 2, 0),
+    receipt(3, "t1", "alice", 5, 2),
+    receipt(4, "t2", "eosio.token", 1, 0),
+    receipt(5, "t2", "alice", 2, 1),
+]
+
+
+def fetch_actions(account_name, pos, count):
+    return HISTORY[pos:pos + count]
+
+
+class TestIterActions(unittest.TestCase):
+
+    def scan(self, history=HISTORY, **kwargs):
+        with unittest.mock.patch.object(
+                cleos_get, "fetch_actions",
+                lambda account_name, pos, count: history[pos:pos + count]):
+            return [
+                action["account_action_seq"] for action in
+                    cleos_get.iter_actions(
+                        "alice", until_seq=len(history) - 1, workers=1,
+                        **kwargs)]
+
+    def test_notified_transfer(self):
+        self.assertEqual(self.scan(), [0, 2, 4])
+
+    def test_no_dedup(self):
+        self.assertEqual(self.scan(dedup=False), [0, 1, 2, 3, 4, 5])
+
+    def test_pages(self):
+        self.assertEqual(self.scan(page_size=1), [0, 2, 4])
+
+    def test_resume(self):
+        with tempfile.TemporaryDirectory() as directory:
+            file = os.path.join(directory, "cursor.json")
+            cursor = cleos_get.ActionCursor("alice", file=file)
+            with unittest.mock.patch.object(
+                    cleos_get, "fetch_actions", fetch_actions):
+                scan = cleos_get.iter_actions(
+                    "alice", until_seq=5, cursor=cursor, page_size=1,
+                    workers=1)
+                self.assertEqual(next(scan)["account_action_seq"], 0)
+                scan.close()
+
+            # The notification of the first transfer is not repeated.
+            self.assertEqual(
+                self.scan(cursor=cleos_get.ActionCursor("alice", file=file)),
+                [2, 4])
+
+    def test_no_ordinals(self):
+        history = []
+        for action in HISTORY:
+            action = dict(action)
+            action["action_trace"] = {
+                key: value for key, value in action["action_trace"].items()
+                    if not "ordinal" in key}
+            history.append(action)
+        self.assertEqual(self.scan(history), [0, 1, 2, 3, 4, 5])
+
+    def test_action_key(self):
+        self.assertEqual(
+            [cleos_get.action_key(action) for action in HISTORY],
+            [[1, "d1"], [1, "d1"], [2, "d1"], [2, "d1"], [1, "d1"],
+                [1, "d1"]])
+
+
+if __name__ == '__main__':
+    unittest.main()
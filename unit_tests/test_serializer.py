@@ -0,0 +1,163 @@
+'''Node-free tests of the native packing of transactions, with known vectors.
+
+Run with *python3 -m unittest unit_tests/test_serializer.py*.
+'''
+import hashlib
+import unittest
+
+import eosfactory.core.errors as errors
+import eosfactory.core.serializer as serializer
+import eosfactory.core.transaction as transaction
+
+
+PUBLIC_KEY = "EOS6MRyAjQq8ud7hVNYcfnVPJqcVpscN5So8BhtHuGYqET5GDW5CV"
+PUBLIC_KEY_HEX = \
+    "02c0ded2bc1f1305fb0faac5e6c03ee3a1924234985427b6167ca569d13df435cf"
+
+
+def ripemd160(data):
+    return hashlib.new("ripemd160", data).digest()
+
+
+class TestName(unittest.TestCase):
+
+    def test_name_to_int(self):
+        self.assertEqual(serializer.name_to_int("eosio"), 6138663577826885632)
+        self.assertEqual(
+            serializer.name_to_int("eosio.token"), 6138663591592764928)
+        self.assertEqual(serializer.name_to_int(""), 0)
+
+    def test_int_to_name(self):
+        for name in ["eosio", "eosio.token", "alice", "a.b.c", "zzzzzzzzzzzzj"]:
+            self.assertEqual(
+                serializer.int_to_name(serializer.name_to_int(name)), name)
+
+    def test_pack_name(self):
+        self.assertEqual(
+            serializer.pack_name("alice").hex(), "0000000000855c34")
+        self.assertEqual(
+            serializer.pack_name("eosio").hex(), "0000000000ea3055")
+
+    def test_invalid_name(self):
+        with self.assertRaises(errors.Error):
+            serializer.name_to_int("Alice")
+        with self.assertRaises(errors.Error):
+            serializer.name_to_int("abcdefghijklmn")
+
+
+class TestVarint(unittest.TestCase):
+
+    def test_varuint32(self):
+        for value, hex_ in [
+                (0, "00"), (127, "7f"), (128, "8001"), (300, "ac02"),
+                (0xffffffff, "ffffffff0f")]:
+            self.assertEqual(serializer.pack_varuint32(value).hex(), hex_)
+
+    def test_varint32(self):
+        for value, hex_ in [
+                (0, "00"), (-1, "01"), (1, "02"), (-64, "7f"), (64, "8001"),
+                (-2147483648, "ffffffff0f")]:
+            self.assertEqual(serializer.pack_varint32(value).hex(), hex_)
+
+
+class TestKeys(unittest.TestCase):
+
+    def test_public_key(self):
+        self.assertEqual(
+            serializer.pack_public_key(PUBLIC_KEY).hex(),
+            "00" + PUBLIC_KEY_HEX)
+
+    def test_public_key_round_trip(self):
+        key = bytes.fromhex(PUBLIC_KEY_HEX)
+        self.assertEqual(
+            "EOS" + serializer.base58_encode(key + ripemd160(key)[:4]),
+            PUBLIC_KEY)
+
+        key_k1 = "PUB_K1_" + serializer.base58_encode(
+            key + ripemd160(key + b"K1")[:4])
+        self.assertEqual(
+            serializer.pack_public_key(key_k1),
+            serializer.pack_public_key(PUBLIC_KEY))
+
+    def test_signature_round_trip(self):
+        signature = bytes([0x1f]) + bytes(range(64))
+        signature_k1 = "SIG_K1_" + serializer.base58_encode(
+            signature + ripemd160(signature + b"K1")[:4])
+        self.assertEqual(
+            serializer.pack_signature(signature_k1), b"\0" + signature)
+
+    def test_base58_leading_zeros(self):
+        value = b"\0\0\1\2"
+        self.assertEqual(serializer.base58_encode(value), "115T")
+        self.assertEqual(serializer.base58_decode("115T"), value)
+
+    def test_invalid(self):
+        with self.assertRaises(errors.Error):
+            serializer.pack_public_key(PUBLIC_KEY[:-1])
+        with self.assertRaises(errors.Error):
+            serializer.pack_signature("SIG_K1_abc")
+
+
+class TestAsset(unittest.TestCase):
+
+    def test_symbol(self):
+        self.assertEqual(
+            serializer.pack_symbol("4,EOS").hex(), "04454f5300000000")
+        self.assertEqual(
+            serializer.pack_symbol_code("EOS").hex(), "454f530000000000")
+
+    def test_asset(self):
+        self.assertEqual(
+            serializer.pack_asset("1.0000 EOS").hex(),
+            "102700000000000004454f5300000000")
+        self.assertEqual(
+            serializer.pack_asset("-0.01 SYS").hex(),
+            "ffffffffffffffff0253595300000000")
+        self.assertEqual(
+            serializer.pack_asset("5 TOK").hex(),
+            "050000000000000000544f4b00000000")
+
+    def test_invalid(self):
+        with self.assertRaises(errors.Error):
+            serializer.pack_asset("1.0000")
+        with self.assertRaises(errors.Error):
+            serializer.pack_symbol_code("eos")
+
+
+class TestTransfer(unittest.TestCase):
+    '''The data of *eosio.token::transfer*, as *abi_json_to_bin* packs it.
+    '''
+    TRANSFER_HEX = "0000000000855c34" "0000000000000e3d" \
+        "102700000000000004454f5300000000" "026869"
+
+    def test_data(self):
+        data = serializer.pack_name("alice") \
+            + serializer.pack_name("bob") \
+            + serializer.pack_asset("1.0000 EOS") \
+            + serializer.pack_string("hi")
+        self.assertEqual(data.hex(), self.TRANSFER_HEX)
+
+    def test_action(self):
+        action = {
+            "account": "eosio.token",
+            "name": "transfer",
+            "authorization": [{"actor": "alice", "permission": "active"}],
+            "data": self.TRANSFER_HEX
+        }
+        self.assertEqual(
+            serializer.pack_action(action).hex(),
+            "00a6823403ea3055" "000000572d3ccdcd" "01"
+            "0000000000855c34" "00000000a8ed3232"
+            "23" + self.TRANSFER_HEX)
+
+
+class TestTapos(unittest.TestCase):
+
+    def test_tapos_fields(self):
+        block_id = "0001e240" "deadbeef" "78563412" + "00" * 20
+        self.assertEqual(
+            transaction.tapos_fields(block_id), (0xe240, 0x12345678))
+
+
+if __name__ == '__main__':
+    unittest.main()